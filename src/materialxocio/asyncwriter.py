@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+'''
+Background writing of generated files.
+
+AsyncFileWriter writes files on a pool of threads so that the next transform can be generated while the files of
+the previous one are written. It is used by `genOCIODefinitions.py` unless `--writeThreads 0` is given.
+
+Example usage:
+```
+from materialxocio.asyncwriter import AsyncFileWriter
+
+with AsyncFileWriter(generator) as writer:
+    writer.write('mx_srgb_tx_to_lin_rec709_color4.glsl', code)
+```
+'''
+
+import os
+import threading
+
+try:
+    from .lazymodule import LazyModule
+except ImportError:
+    from lazymodule import LazyModule
+
+# MaterialX is only imported to write documents.
+mx = LazyModule('MaterialX')
+
+class AsyncFileWriter():
+    '''
+    Writes files on a pool of background threads so that generation does not wait for file I/O.
+    Each file is written to a temporary file in the same folder which then replaces the file, so readers
+    never see a partially written file. At most maxPending writes are queued at once: further calls to write()
+    block until a queued write completes. Writes to the same file are applied in the order they are queued.
+    '''
+
+    def __init__(self, generator, maxWorkers = 4, maxPending = 64):
+        '''
+        Constructor.
+        @param generator: The OCIOMaterialaxGenerator used to write and instrument files.
+        @param maxWorkers: The number of writer threads. Default is 4.
+        @param maxPending: The maximum number of queued writes. Default is 64.
+        '''
+        from concurrent.futures import ThreadPoolExecutor
+        self.generator = generator
+        self.executor = ThreadPoolExecutor(max_workers=maxWorkers, thread_name_prefix='materialxocio_writer')
+        self.slots = threading.BoundedSemaphore(maxPending)
+        self.lock = threading.Lock()
+        # Most recent pending write for each file name
+        self.pending = {}
+        self.errors = []
+
+    def write(self, filename, content, skipUnchanged = False, callback = None):
+        '''
+        Queue a file to be written, blocking if the queue is full.
+        @param filename: The file path string.
+        @param content: The file content string, bytes for binary files, or a MaterialX document which is
+        written as XML on the writer thread.
+        @param skipUnchanged: Whether to leave the file untouched if its content on disk is the same. Default is False.
+        @param callback: Optional function called on the writer thread with True if the file was written,
+        or False if it was unchanged.
+        @return: A future for the write.
+        '''
+        instrumentation = self.generator.instrumentation
+        if not self.slots.acquire(blocking=False):
+            instrumentation.count('writerQueueFull')
+            with instrumentation.span('writerBackpressure'):
+                self.slots.acquire()
+        with self.lock:
+            previous = self.pending.get(filename)
+        if previous:
+            # Keep writes to the same file in order
+            previous.exception()
+        try:
+            with self.lock:
+                future = self.executor.submit(self.writeNow, filename, content, skipUnchanged, callback)
+                self.pending[filename] = future
+        except Exception:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda f: self.onWritten(filename, f))
+        instrumentation.count('asyncWrites')
+        return future
+
+    def writeNow(self, filename, content, skipUnchanged, callback):
+        '''
+        Write a file on the calling thread.
+        @return: True if the file was written.
+        '''
+        if not isinstance(content, (str, bytes)):
+            content = mx.writeToXmlString(content)
+        written = True
+        if skipUnchanged and os.path.exists(filename):
+            binary = isinstance(content, bytes)
+            with open(filename, 'rb') as f:
+                existing = f.read()
+            written = existing != (content if binary else content.encode('utf-8'))
+        if written:
+            self.generator.writeFile(filename, content)
+        else:
+            self.generator.instrumentation.count('unchangedFiles')
+        if callback:
+            callback(written)
+        return written
+
+    def onWritten(self, filename, future):
+        '''
+        Release the queue slot of a completed write and record any error.
+        '''
+        with self.lock:
+            if self.pending.get(filename) is future:
+                del self.pending[filename]
+            if future.exception():
+                self.errors.append(future.exception())
+        self.slots.release()
+
+    def flush(self):
+        '''
+        Wait for all queued writes to complete.
+        Raises the first error of any write which failed since the last flush.
+        '''
+        while True:
+            with self.lock:
+                futures = list(self.pending.values())
+            if not futures:
+                break
+            for future in futures:
+                future.exception()
+        with self.lock:
+            errors = self.errors
+            self.errors = []
+        if errors:
+            raise errors[0]
+
+    def close(self):
+        '''
+        Wait for all queued writes to complete and stop the writer threads.
+        Raises the first error of any write which failed.
+        '''
+        try:
+            self.flush()
+        finally:
+            self.executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        if excType is None:
+            self.close()
+        else:
+            # Do not mask the original error
+            self.executor.shutdown(wait=True)
+        return False
@@ -0,0 +1,228 @@
+#!/usr/bin/env python
+'''
+Benchmark the stages of the MaterialX OCIO definition generation pipeline.
+
+For every color space in every recommended built-in configuration the following stages are timed:
+- Configuration loading: `getBuiltinConfigs()` and the first parse of each configuration.
+- `generateShaderCode()`, `generateTransformGraph()`, `generateOCIO()` and `createColor3Variant()`.
+  The generator and configuration processor caches are cleared before each stage so that every stage includes
+  creating its OCIO processors.
+- Writing the definition, implementation and source code files.
+
+The results, along with the peak resident set size of the process, are written as JSON so that
+runs can be compared between OCIO and MaterialX releases.
+
+Example usage:
+```
+python benchmark.py --output benchmark.json
+```
+or equivalently `python genOCIODefinitions.py benchmark --output benchmark.json`.
+'''
+
+import os, sys, io, json, time, argparse, platform, tempfile, contextlib
+
+try:
+    from . import core as mxocio
+except ImportError:
+    import core as mxocio
+
+# MaterialX and OCIO are imported on first use, so that --help does not load them.
+mx = mxocio.mx
+OCIO = mxocio.OCIO
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+def getPeakRSS():
+    '''
+    Get the peak resident set size of the current process.
+    @return: The peak RSS in kilobytes, or None if it is not available on this platform.
+    '''
+    if not resource:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, other platforms report kilobytes
+    if sys.platform == 'darwin':
+        peak = peak // 1024
+    return peak
+
+class StageTimer():
+    '''
+    Accumulates wall clock timings for named stages.
+    '''
+
+    def __init__(self):
+        self.timings = {}
+
+    @contextlib.contextmanager
+    def time(self, stage, record = None):
+        '''
+        Context manager which times a stage.
+        @param stage: The stage name.
+        @param record: Optional dictionary to also store the elapsed time in, keyed by stage.
+        '''
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.timings.setdefault(stage, []).append(elapsed)
+            if record is not None:
+                record[stage] = elapsed
+
+    def summary(self):
+        '''
+        Get a summary of all stages.
+        @return: A dictionary of stage name to count, total, mean, min and max times in seconds.
+        '''
+        result = {}
+        for stage, values in self.timings.items():
+            result[stage] = {
+                'count': len(values),
+                'total': sum(values),
+                'mean': sum(values) / len(values),
+                'min': min(values),
+                'max': max(values)
+            }
+        return result
+
+def clearProcessorCaches(generator, config):
+    '''
+    Clear the processors cached by the generator and by the OCIO configuration.
+    @param generator: The OCIOMaterialaxGenerator.
+    @param config: The OCIO configuration.
+    '''
+    generator.clearProcessorCache()
+    config.clearProcessorCache()
+
+def benchmarkTransform(generator, timer, config, sourceColorSpace, targetColorSpace, outputPath):
+    '''
+    Time each generation stage for a single transform.
+    @param generator: The OCIOMaterialaxGenerator to use.
+    @param timer: The StageTimer to accumulate results in.
+    @param config: The OCIO configuration.
+    @param sourceColorSpace: The source color space.
+    @param targetColorSpace: The target color space.
+    @param outputPath: The folder to write files to.
+    @return: A dictionary of per stage timings and results for the transform.
+    '''
+    record = {}
+    language = OCIO.GpuLanguage.GPU_LANGUAGE_GLSL_4_0
+
+    # Each stage starts without cached processors so that no stage benefits from an earlier one
+    clearProcessorCaches(generator, config)
+    with timer.time('generateShaderCode', record):
+        code, textureCount = generator.generateShaderCode(config, sourceColorSpace, targetColorSpace, language)
+    clearProcessorCaches(generator, config)
+    with timer.time('generateTransformGraph', record):
+        generator.generateTransformGraph(config, sourceColorSpace, targetColorSpace)
+
+    definitionDoc = mx.createDocument()
+    implDoc = mx.createDocument()
+    clearProcessorCaches(generator, config)
+    with timer.time('generateOCIO', record):
+        definition, transformName, code, extension, target = generator.generateOCIO(config, definitionDoc, implDoc, sourceColorSpace, targetColorSpace, 'color4')
+
+    result = { 'timings': record, 'textureCount': textureCount, 'generated': bool(definition) }
+    if not definition:
+        return result
+
+    # generateOCIO() already created the color3 variant of the definition, so time creating it again
+    # on a copy of the generated definitions with the variant removed
+    variantDoc = mx.createDocument()
+    variantDoc.copyContentFrom(definitionDoc)
+    variantDoc.removeNodeDef(definition.getName().replace('color4', 'color3'))
+    variantDefinition = variantDoc.getNodeDef(definition.getName())
+    with timer.time('createColor3Variant', record):
+        generator.createColor3Variant(variantDefinition, variantDoc, 'in', False)
+
+    with timer.time('writeFiles', record):
+        mx.writeToXmlFile(definitionDoc, outputPath / mx.FilePath(definition.getName() + '.mtlx'))
+        mx.writeToXmlFile(implDoc, outputPath / mx.FilePath('IM_' + transformName + '.mtlx'))
+        generator.writeShaderCode(outputPath, code, transformName, extension, target)
+
+    return result
+
+def runBenchmark(targetColorSpace, outputPath, repeat = 1):
+    '''
+    Run the benchmark over all color spaces of all recommended built-in configurations.
+    @param targetColorSpace: The target color space.
+    @param outputPath: The folder to write files to.
+    @param repeat: Number of times to run the sweep. Each sweep uses a new generator so caches start cold.
+    @return: A dictionary of benchmark results.
+    '''
+    timer = StageTimer()
+    transforms = []
+    totalStart = time.perf_counter()
+    for run in range(repeat):
+        generator = mxocio.OCIOMaterialaxGenerator()
+        with timer.time('getBuiltinConfigs'):
+            configs, aconfigEntry = generator.getBuiltinConfigs()
+
+        for c in configs:
+            with timer.time('loadConfig'):
+                config = configs[c][0]
+                colorSpaces = configs[c][1]
+            for colorSpace in colorSpaces:
+                sourceColorSpace = colorSpace.getName()
+                if sourceColorSpace == targetColorSpace:
+                    continue
+                start = time.perf_counter()
+                result = benchmarkTransform(generator, timer, config, sourceColorSpace, targetColorSpace, outputPath)
+                result['total'] = time.perf_counter() - start
+                result['config'] = c
+                result['sourceColorSpace'] = sourceColorSpace
+                result['targetColorSpace'] = targetColorSpace
+                result['run'] = run
+                transforms.append(result)
+
+    return {
+        'ocioVersion': OCIO.GetVersion(),
+        'materialxVersion': mx.getVersionString(),
+        'pythonVersion': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'totalTime': time.perf_counter() - totalStart,
+        'peakRSSKB': getPeakRSS(),
+        'stages': timer.summary(),
+        'transforms': transforms
+    }
+
+def main(args = None):
+    '''
+    Run the benchmark and write the results as JSON.
+    @param args: Optional list of command line arguments. Default is to use sys.argv.
+    '''
+    parser = argparse.ArgumentParser(prog=None if args is None else 'genOCIODefinitions.py benchmark',
+                                     description="Benchmark MaterialX definition generation using OCIO.")
+    parser.add_argument('--output', dest='output', help='File to write JSON results to. Default is to print to stdout.')
+    parser.add_argument('--outputPath', dest='outputPath', help='Folder to write generated files to. Default is a temporary folder.')
+    parser.add_argument('--targetColorSpace', dest='targetColorSpace', default='lin_rec709', help='Target color space. Default is lin_rec709.')
+    parser.add_argument('--repeat', dest='repeat', type=int, default=1, help='Number of times to run the sweep. Default is 1.')
+    opts = parser.parse_args(args)
+
+    with tempfile.TemporaryDirectory() as tempPath:
+        outputPath = mx.FilePath(opts.outputPath if opts.outputPath else tempPath)
+        if not os.path.exists(outputPath.asString()):
+            os.makedirs(outputPath.asString())
+
+        # Progress output from the generator is not part of the measurement
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = runBenchmark(opts.targetColorSpace, outputPath, opts.repeat)
+
+    resultString = json.dumps(results, indent=2, sort_keys=True)
+    if opts.output:
+        with open(opts.output, 'w') as f:
+            f.write(resultString + '\n')
+        print('Wrote benchmark results to:', opts.output)
+    else:
+        print(resultString)
+
+    for stage, summary in sorted(results['stages'].items()):
+        print('- %s: %d calls, total %.4fs, mean %.6fs' % (stage, summary['count'], summary['total'], summary['mean']), file=sys.stderr)
+    print('- Peak RSS: %s KB' % results['peakRSSKB'], file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
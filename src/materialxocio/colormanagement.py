@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+'''
+A MaterialX color management system which generates color space transforms using OCIO on demand.
+
+Instead of loading a library of pre-generated definitions, the definition, implementation and source
+code for a color space transform are only generated when shader generation requests the transform.
+Generated transforms are cached for the lifetime of the color management system.
+
+Example usage:
+```
+import MaterialX.PyMaterialXGenGlsl as mx_gen_glsl
+from materialxocio.colormanagement import OCIOColorManagementSystem
+
+shaderGenerator = mx_gen_glsl.GlslShaderGenerator.create()
+cms = OCIOColorManagementSystem(target=shaderGenerator.getTarget())
+cms.loadLibrary(stdlib)
+shaderGenerator.setColorManagementSystem(cms)
+```
+'''
+
+import os, tempfile, threading
+import MaterialX as mx
+import MaterialX.PyMaterialXGenShader as mx_gen_shader
+
+try:
+    from . import core as mxocio
+except ImportError:
+    import core as mxocio
+
+class OCIOColorManagementSystem(mx_gen_shader.ColorManagementSystem):
+    '''
+    A MaterialX color management system which generates the definition, implementation and source code
+    for a color space transform using an OCIOMaterialaxGenerator the first time the transform is requested.
+    '''
+
+    def __init__(self, generator = None, config = None, target = 'genglsl', cachePath = None):
+        '''
+        Constructor.
+        @param generator: The OCIOMaterialaxGenerator to use. A quiet generator is created if not specified.
+        @param config: The OCIO configuration or the name of a built-in configuration. Default is the
+        configuration used by OCIOMaterialaxGenerator.getBuiltinConfigs().
+        @param target: The MaterialX target to generate implementations for. This should match the target of the
+        shader generator the color management system is set on.
+        @param cachePath: The folder to write source code files to. A temporary folder is created if not specified.
+        '''
+        mx_gen_shader.ColorManagementSystem.__init__(self)
+        self.generator = generator if generator else mxocio.OCIOMaterialaxGenerator(verbose=False)
+        self.config = config
+        self.target = target
+        self.cachePath = cachePath
+        # Document containing all generated definitions and implementations. Implementations are only
+        # matched to a target which has a target definition.
+        self.document = mx.createDocument()
+        self.document.addTargetDef(target)
+        # Cache of (source, target) color spaces to color4 definition name, or None if not supported
+        self.transforms = {}
+        self.lock = threading.Lock()
+
+    def getName(self):
+        '''
+        Get the name of the color management system.
+        '''
+        return 'materialxocio'
+
+    def getConfig(self):
+        '''
+        Get the OCIO configuration, loading it on first use.
+        @return: The OCIO configuration.
+        '''
+        if self.config is None:
+            self.config = self.generator.getBuiltinConfigs()[1].getConfig()
+        elif isinstance(self.config, str):
+            self.config = self.generator.getConfig(self.config)
+        return self.config
+
+    def getCachePath(self):
+        '''
+        Get the folder source code files are written to, creating it on first use.
+        @return: The folder path string.
+        '''
+        if not self.cachePath:
+            self.cachePath = tempfile.mkdtemp(prefix='materialxocio_')
+        elif not os.path.exists(self.cachePath):
+            os.makedirs(self.cachePath)
+        return self.cachePath
+
+    def generateTransform(self, sourceColorSpace, targetColorSpace):
+        '''
+        Generate the definitions, implementations and source code for a color space transform.
+        @param sourceColorSpace: The source color space.
+        @param targetColorSpace: The target color space.
+        @return: The name of the color4 definition, or None if the transform could not be generated.
+        '''
+        sources = {}
+        definitionDoc = mx.createDocument()
+        implDoc = mx.createDocument()
+        definition, transformName, code, extension, target = self.generator.generateOCIO(self.getConfig(), definitionDoc, implDoc,
+                                                                                         sourceColorSpace, targetColorSpace, 'color4', 'in',
+                                                                                         None, [self.target], sources)
+        if not definition or self.target not in sources:
+            return None
+
+        # Reference the source code by absolute path so no search path needs to be registered
+        extension, code = sources[self.target]
+        filename = os.path.join(self.getCachePath(), transformName + '.' + extension)
+        self.generator.writeFile(filename, code)
+        for impl in implDoc.getImplementations():
+            impl.setFile(mx.FilePath(filename).asString(mx.FormatPosix))
+
+        self.document.importLibrary(definitionDoc)
+        self.document.importLibrary(implDoc)
+        return definition.getName()
+
+    def getNodeDef(self, transform):
+        '''
+        Get the definition for a color space transform, generating it if required.
+        Called by MaterialX shader generation.
+        @param transform: The MaterialX ColorSpaceTransform.
+        @return: The definition, or None if the transform is not supported.
+        '''
+        key = (transform.sourceSpace, transform.targetSpace)
+        with self.lock:
+            if key not in self.transforms:
+                self.generator.instrumentation.count('colorManagementTransformsGenerated')
+                with self.generator.instrumentation.span('colorManagementTransform', source=key[0], destination=key[1]):
+                    self.transforms[key] = self.generateTransform(key[0], key[1])
+            definitionName = self.transforms[key]
+        if not definitionName:
+            return None
+        nodeDefName = self.generator.createTransformName(key[0], key[1], transform.type.getName()).replace('mx_', 'ND_')
+        return self.document.getNodeDef(nodeDefName)
+
+    def supportsTransform(self, transform):
+        '''
+        Check if a color space transform is supported. The transform is generated if required.
+        @param transform: The MaterialX ColorSpaceTransform.
+        @return: True if the transform is supported.
+        '''
+        return self.getNodeDef(transform) is not None
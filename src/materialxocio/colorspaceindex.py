@@ -0,0 +1,237 @@
+#!/usr/bin/env python
+'''
+A persisted index of the color spaces in the OCIO built-in configurations.
+
+The index maps each color space name and alias to its canonical name, the configuration it belongs to,
+the name used to generate transforms from it, and the names of the generated transform functions, definitions
+and files for each target color space. It is built once per OCIO and MaterialX version (for example by
+`genOCIODefinitions.py`, which writes `materialxocio_index.json` next to its outputs) and can then be
+queried without importing PyOpenColorIO or MaterialX.
+
+Example usage:
+```
+from materialxocio.colorspaceindex import ColorSpaceIndex
+
+index = ColorSpaceIndex.load('data/materialxocio_index.json')
+index.getCanonicalName('srgb_texture')
+index.getTransform('srgb_texture', 'lin_rec709')['definitionFile']
+```
+'''
+
+import json
+
+# Version of the index file format.
+INDEX_VERSION = 1
+
+class ColorSpaceIndex():
+    '''
+    A lookup table of color space names and aliases. Lookups are case-insensitive, matching OCIO.
+    '''
+
+    def __init__(self, data):
+        '''
+        Constructor.
+        @param data: The index dictionary, as returned by buildColorSpaceIndex() or getData().
+        '''
+        self.data = data
+        self.names = data['names']
+        self.colorSpaces = data['colorSpaces']
+
+    @staticmethod
+    def load(filename):
+        '''
+        Load an index from a JSON file.
+        @param filename: The file path string.
+        @return: The ColorSpaceIndex, or None if the file cannot be read or is a different index version.
+        '''
+        try:
+            with open(filename, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get('version') != INDEX_VERSION:
+            return None
+        return ColorSpaceIndex(data)
+
+    def getData(self):
+        '''
+        Get the index dictionary.
+        '''
+        return self.data
+
+    def getJSON(self):
+        '''
+        Get the index as a JSON string. Keys are sorted so that the output is deterministic.
+        @return: The JSON string.
+        '''
+        return json.dumps(self.data, indent=2, sort_keys=True) + '\n'
+
+    def save(self, filename):
+        '''
+        Save the index to a JSON file.
+        @param filename: The file path string.
+        '''
+        with open(filename, 'w') as f:
+            f.write(self.getJSON())
+
+    def isCurrent(self, ocioVersion, materialxVersion, configNames = None, targetColorSpaces = None):
+        '''
+        Check if the index was built for the given versions, configurations and target color spaces.
+        @param ocioVersion: The OCIO version string.
+        @param materialxVersion: The MaterialX version string.
+        @param configNames: Optional list of configuration names which must match the indexed configurations.
+        @param targetColorSpaces: Optional list of target color spaces which must all be indexed.
+        @return: True if the index is current.
+        '''
+        if self.data.get('ocioVersion') != ocioVersion or self.data.get('materialxVersion') != materialxVersion:
+            return False
+        if configNames is not None and list(configNames) != self.data.get('configs'):
+            return False
+        if targetColorSpaces and not set(targetColorSpaces).issubset(self.data.get('targetColorSpaces', [])):
+            return False
+        return True
+
+    def getConfigNames(self):
+        '''
+        Get the names of the indexed configurations.
+        '''
+        return self.data['configs']
+
+    def lookupAll(self, name, config = None):
+        '''
+        Find all color spaces with a given name or alias.
+        @param name: The color space name or alias.
+        @param config: Optional configuration name to restrict the search to.
+        @return: A list of color space records, in configuration order.
+        '''
+        records = [self.colorSpaces[i] for i in self.names.get(name.lower(), [])]
+        if config:
+            records = [record for record in records if record['config'] == config]
+        return records
+
+    def lookup(self, name, config = None):
+        '''
+        Find the color space with a given name or alias. If several configurations contain the color space
+        the first configuration is used.
+        @param name: The color space name or alias.
+        @param config: Optional configuration name to restrict the search to.
+        @return: A dictionary with the 'config', canonical 'name', 'aliases', 'sourceName' used to generate transforms
+        and 'transforms' per target color space, or None if not found.
+        '''
+        records = self.lookupAll(name, config)
+        return records[0] if records else None
+
+    def getCanonicalName(self, name, config = None):
+        '''
+        Get the canonical name of a color space.
+        @param name: The color space name or alias.
+        @param config: Optional configuration name to restrict the search to.
+        @return: The canonical name, or None if not found.
+        '''
+        record = self.lookup(name, config)
+        return record['name'] if record else None
+
+    def getSourceName(self, name, config = None):
+        '''
+        Get the name used to generate transforms from a color space.
+        @param name: The color space name or alias.
+        @param config: Optional configuration name to restrict the search to.
+        @return: The source name, or None if not found.
+        '''
+        record = self.lookup(name, config)
+        return record['sourceName'] if record else None
+
+    def getTransform(self, name, targetColorSpace, config = None):
+        '''
+        Get the names of the generated transform from a color space to a target color space.
+        @param name: The source color space name or alias.
+        @param targetColorSpace: The target color space.
+        @param config: Optional configuration name to restrict the search to.
+        @return: A dictionary with the transform 'function', 'nodeDef', 'definitionFile', 'implementationFile' and
+        'graphFile' names, or None if the color space or target is not indexed, or the source color space
+        is not found in the configuration transforms are generated with.
+        '''
+        record = self.lookup(name, config)
+        if not record:
+            return None
+        return record['transforms'].get(targetColorSpace)
+
+    def getSourceColorSpaces(self):
+        '''
+        Get the names used to generate transforms from each indexed color space.
+        @return: A list of source names in configuration order. Names are repeated if a color space is in several configurations.
+        '''
+        return [record['sourceName'] for record in self.colorSpaces]
+
+    def getMarkdownTable(self):
+        '''
+        Get the indexed color spaces as a markdown table, matching OCIOMaterialaxGenerator.printConfigs().
+        @return: A markdown string.
+        '''
+        lines = ['| Configuration | Color Space | Aliases |', '| --- | --- | --- |']
+        for record in self.colorSpaces:
+            lines.append('| ' + record['config'] + ' | ' + record['name'] + ' | ' + ', '.join(record['aliases']) + ' |')
+        return '\n'.join(lines) + '\n'
+
+def buildColorSpaceIndex(generator, configs, generationConfig, targetColorSpaces):
+    '''
+    Build a color space index from OCIO configurations. This requires PyOpenColorIO and MaterialX.
+    @param generator: The OCIOMaterialaxGenerator used to create transform names.
+    @param configs: Dictionary of configuration name to [config, colorSpaces], as returned by OCIOMaterialaxGenerator.getBuiltinConfigs().
+    @param generationConfig: The OCIO configuration transforms are generated with. Transforms are only indexed for
+    color spaces whose source name is found in this configuration.
+    @param targetColorSpaces: The list of target color spaces to index transforms for.
+    @return: The ColorSpaceIndex.
+    '''
+    import MaterialX as mx
+    import PyOpenColorIO as OCIO
+
+    names = {}
+    colorSpaces = []
+    for c in configs:
+        for colorSpace in configs[c][1]:
+            aliases = list(colorSpace.getAliases())
+            # Use the last alias which does not contain a space, otherwise the color space name
+            sourceName = colorSpace.getName()
+            for alias in aliases:
+                if ' ' not in alias:
+                    sourceName = alias
+
+            transforms = {}
+            if generationConfig.getColorSpace(sourceName):
+                for targetColorSpace in targetColorSpaces:
+                    if sourceName == targetColorSpace:
+                        continue
+                    function = generator.createTransformName(sourceName, targetColorSpace, 'color4')
+                    nodeDef = generator.createTransformName(sourceName, targetColorSpace, 'color4', 'ND_')
+                    transforms[targetColorSpace] = {
+                        'function': function,
+                        'nodeDef': nodeDef,
+                        'definitionFile': nodeDef + '.mtlx',
+                        'implementationFile': 'IM_' + function + '.mtlx',
+                        'graphFile': generator.createTransformName(sourceName, targetColorSpace, 'color3', 'mxgraph_') + '.mtlx'
+                    }
+
+            index = len(colorSpaces)
+            colorSpaces.append({
+                'config': c,
+                'name': colorSpace.getName(),
+                'aliases': aliases,
+                'sourceName': sourceName,
+                'transforms': transforms
+            })
+            for name in [colorSpace.getName()] + aliases:
+                entries = names.setdefault(name.lower(), [])
+                if index not in entries:
+                    entries.append(index)
+
+    return ColorSpaceIndex({
+        'version': INDEX_VERSION,
+        'ocioVersion': OCIO.GetVersion(),
+        'materialxVersion': mx.getVersionString(),
+        'configs': list(configs),
+        'generationConfig': generationConfig.getName(),
+        'targetColorSpaces': list(targetColorSpaces),
+        'colorSpaces': colorSpaces,
+        'names': names
+    })
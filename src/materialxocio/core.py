@@ -6,19 +6,313 @@ The minimum requirement is OCIO version 2.2 which is packaged with
 "ACES Cg Config" and "ACES Studio Config" configurations.
 '''
 
-import PyOpenColorIO as OCIO
-import MaterialX as mx
 import re
+import os
+import io
+import math
+import time
+import json
+import hashlib
+import threading
+import types
+from collections import OrderedDict, namedtuple
+
+try:
+    from .lazymodule import LazyModule
+    from .instrumentation import Instrumentation
+    from .diskcache import DiskCache
+    from .asyncwriter import AsyncFileWriter
+except ImportError:
+    from lazymodule import LazyModule
+    from instrumentation import Instrumentation
+    from diskcache import DiskCache
+    from asyncwriter import AsyncFileWriter
+
+OCIO = LazyModule('PyOpenColorIO')
+mx = LazyModule('MaterialX')
+
+# NumPy is optional. Use np.isAvailable() to check whether it is installed.
+np = LazyModule('numpy')
+
+def createValidName(name, replaceChar = '_'):
+    '''
+    Create a valid MaterialX name from a string, matching MaterialX.createValidName() without importing MaterialX.
+    Characters other than ASCII letters, digits, '_' and ':' are replaced, with one replacement per UTF-8 byte.
+    @param name: The string.
+    @param replaceChar: The replacement character. Default is '_'.
+    @return: The valid name.
+    '''
+    return re.sub(rb'[^0-9A-Za-z_:]', replaceChar.encode('ascii'), name.encode('utf-8')).decode('ascii')
+
+def findNodeGraph(doc, node):
+    '''
+    Find the node graph implementation of a node, such as a transform node in a generated node graph.
+    @param doc: The MaterialX document containing the definitions and node graphs.
+    @param node: The node instance.
+    @return: The node graph or None if not found.
+    '''
+    for nodeDef in doc.getMatchingNodeDefs(node.getCategory()):
+        if nodeDef.getType() != node.getType():
+            continue
+        for nodeGraph in doc.getNodeGraphs():
+            if nodeGraph.getNodeDefString() == nodeDef.getName():
+                return nodeGraph
+    return None
+
+class LazyConfigEntry():
+    '''
+    A built-in configuration registry entry which is only parsed when first accessed.
+    Indexing with 0 and 1 returns the configuration and its color spaces, matching the
+    [config, colorSpaces] pairs used by OCIOMaterialaxGenerator.printConfigs() and main().
+    '''
+
+    def __init__(self, generator, shortName, uiName, isDefault):
+        '''
+        Constructor.
+        @param generator: The OCIOMaterialaxGenerator used to create and memoize the configuration.
+        @param shortName: The URI-style name of the configuration.
+        @param uiName: The name to use in a user interface.
+        @param isDefault: Whether this is the default built-in configuration.
+        '''
+        self.generator = generator
+        self.shortName = shortName
+        self.uiName = uiName
+        self.isDefault = isDefault
+        self._colorSpaces = None
+
+    def getName(self):
+        '''
+        Get the name of the configuration without parsing it. Built-in configurations are named by their short name.
+        '''
+        return self.shortName
+
+    def getConfig(self):
+        '''
+        Get the configuration, parsing it on first access.
+        @return: The OCIO configuration.
+        '''
+        if self.isLoaded():
+            return self.generator.getConfig(self.shortName)
+        config = self.generator.getConfig(self.shortName)
+        self.generator.log('Built-in config:', config.getName())
+        self.generator.log('- Number of color spaces: %d' % len(config.getColorSpaceNames()))
+        return config
+
+    def getColorSpaces(self):
+        '''
+        Get the color spaces of the configuration, parsing it on first access.
+        @return: A list of OCIO color spaces.
+        '''
+        if self._colorSpaces is None:
+            self._colorSpaces = list(self.getConfig().getColorSpaces())
+        return self._colorSpaces
+
+    def isLoaded(self):
+        '''
+        Return whether the configuration has been parsed.
+        '''
+        return self.shortName in self.generator.configCache
+
+    def __getitem__(self, index):
+        if index == 0:
+            return self.getConfig()
+        if index == 1:
+            return self.getColorSpaces()
+        raise IndexError('LazyConfigEntry index out of range: %s' % index)
+
+    def __len__(self):
+        return 2
+
+# An immutable record of a generated color space transform, as yielded by OCIOMaterialaxGenerator.iterateTransforms().
+# - sourceColorSpace, targetColorSpace: The color spaces of the transform.
+# - transformName: The name of the color4 transform function, or of the color3 node graph file for node graphs.
+# - definitionName: The name of the color4 definition, or the color3 definition for node graphs.
+# - definition, implementation: The MaterialX definition and implementation documents as XML strings. For node graphs
+#   the definition contains both the definition and the node graph, and there is no implementation.
+# - sources: A read-only mapping of MaterialX target to (extension, source code).
+# - textures: A read-only mapping of texture file name to serialized .npy bytes.
+# - graph: Whether the implementation is a node graph.
+# - timings: A read-only mapping of stage name ('generate', 'serialize') to elapsed seconds.
+# The definition is None if the transform could not be generated.
+TransformResult = namedtuple('TransformResult', ['sourceColorSpace', 'targetColorSpace', 'transformName', 'definitionName', 'definition',
+                                                 'implementation', 'sources', 'textures', 'graph', 'timings'])
 
 class OCIOMaterialaxGenerator():
     '''
     A class to generate MaterialX color transform definitions using OCIO.
     '''
 
+    def __init__(self, processorCacheSize = 256, instrumentation = None, verbose = True, diskCache = None):
+        '''
+        Constructor.
+        @param processorCacheSize: Maximum number of source / destination processors to keep
+        cached. Least recently used processors are evicted first. Default is 256.
+        @param instrumentation: Optional Instrumentation to record spans and counters with.
+        By default a disabled Instrumentation is used.
+        @param verbose: Whether progress messages are printed. Default is True.
+        @param diskCache: Optional DiskCache, or cache folder path, used to store extracted shader code and
+        transform operations between runs. Cached results are used without creating OCIO processors.
+        A DiskCache created from a path keeps at most processorCacheSize values in memory.
+        '''
+        self.diskCache = DiskCache(diskCache, processorCacheSize) if isinstance(diskCache, str) else diskCache
+        self.instrumentation = instrumentation if instrumentation else Instrumentation(enabled=False)
+        self.verbose = verbose
+        self.processorCacheSize = processorCacheSize
+        self.processorCache = OrderedDict()
+        self.processorCacheHits = 0
+        self.processorCacheMisses = 0
+        self.configCache = {}
+        # The OCIO version is recorded when the index is saved so that OCIO is not loaded by the constructor
+        self.textureIndex = { 'configs': {} }
+        self.builtinConfigNames = None
+
+    def log(self, *args):
+        '''
+        Report a progress message. The message is printed if verbose and sent to instrumentation listeners.
+        @param args: Values to join with spaces, as for print().
+        '''
+        message = ' '.join([str(arg) for arg in args])
+        if self.verbose:
+            print(message)
+        self.instrumentation.log(message)
+
+    def getProcessorEntry(self, config, sourceColorSpace, destColorSpace):
+        '''
+        Get the cached processors for a transform from a source color space to a destination color space.
+        The cache is keyed by the config cache identifier and the source and destination names, so
+        identical configs loaded separately share entries.
+        Raises an OCIO.Exception if the processor cannot be created.
+        @param config: The OCIO configuration.
+        @param sourceColorSpace: The source color space.
+        @param destColorSpace: The destination color space.
+        @return: A dictionary with 'processor', 'optimized' and 'gpu' entries. The optimized and GPU
+        processors are created on first request.
+        '''
+        key = (config.getCacheID(), sourceColorSpace, destColorSpace)
+        entry = self.processorCache.get(key)
+        if entry is not None:
+            self.processorCacheHits += 1
+            self.instrumentation.count('processorCacheHits')
+            self.processorCache.move_to_end(key)
+            return entry
+
+        self.processorCacheMisses += 1
+        self.instrumentation.count('processorCacheMisses')
+        with self.instrumentation.span('processor', source=sourceColorSpace, destination=destColorSpace):
+            processor = config.getProcessor(sourceColorSpace, destColorSpace)
+        entry = { 'processor': processor, 'optimized': None, 'gpu': None, 'cpu': {}, 'transformOps': None }
+        self.processorCache[key] = entry
+        while len(self.processorCache) > self.processorCacheSize:
+            self.processorCache.popitem(last=False)
+        return entry
+
+    def getProcessor(self, config, sourceColorSpace, destColorSpace):
+        '''
+        Get a cached processor for a transform from a source color space to a destination color space.
+        @param config: The OCIO configuration.
+        @param sourceColorSpace: The source color space.
+        @param destColorSpace: The destination color space.
+        @return: The OCIO processor.
+        '''
+        return self.getProcessorEntry(config, sourceColorSpace, destColorSpace)['processor']
+
+    def getOptimizedProcessor(self, config, sourceColorSpace, destColorSpace):
+        '''
+        Get a cached fully optimized processor for a transform from a source color space to a destination color space.
+        @param config: The OCIO configuration.
+        @param sourceColorSpace: The source color space.
+        @param destColorSpace: The destination color space.
+        @return: The optimized OCIO processor.
+        '''
+        entry = self.getProcessorEntry(config, sourceColorSpace, destColorSpace)
+        if not entry['optimized'] and entry['processor']:
+            with self.instrumentation.span('optimizedProcessor', source=sourceColorSpace, destination=destColorSpace):
+                entry['optimized'] = entry['processor'].getOptimizedProcessor(OCIO.OPTIMIZATION_ALL)
+        return entry['optimized']
+
+    def getGPUProcessor(self, config, sourceColorSpace, destColorSpace):
+        '''
+        Get a cached default GPU processor for a transform from a source color space to a destination color space.
+        @param config: The OCIO configuration.
+        @param sourceColorSpace: The source color space.
+        @param destColorSpace: The destination color space.
+        @return: The OCIO GPU processor.
+        '''
+        entry = self.getProcessorEntry(config, sourceColorSpace, destColorSpace)
+        if not entry['gpu'] and entry['processor']:
+            with self.instrumentation.span('gpuProcessor', source=sourceColorSpace, destination=destColorSpace):
+                entry['gpu'] = entry['processor'].getDefaultGPUProcessor()
+        return entry['gpu']
+
+    def getCPUProcessor(self, config, sourceColorSpace, destColorSpace, dtype = 'float32'):
+        '''
+        Get a cached CPU processor for a transform from a source color space to a destination color space.
+        The processor uses the default optimization level, matching the GPU processor used to generate shader code.
+        @param config: The OCIO configuration.
+        @param sourceColorSpace: The source color space.
+        @param destColorSpace: The destination color space.
+        @param dtype: The NumPy type of the pixels, 'float32' or 'float16'. Default is 'float32'.
+        @return: The OCIO CPU processor.
+        '''
+        entry = self.getProcessorEntry(config, sourceColorSpace, destColorSpace)
+        dtype = str(dtype)
+        if dtype not in entry['cpu']:
+            with self.instrumentation.span('cpuProcessor', source=sourceColorSpace, destination=destColorSpace, dtype=dtype):
+                if dtype == 'float16':
+                    entry['cpu'][dtype] = entry['processor'].getOptimizedCPUProcessor(OCIO.BIT_DEPTH_F16, OCIO.BIT_DEPTH_F16,
+                                                                                      OCIO.OPTIMIZATION_DEFAULT)
+                else:
+                    entry['cpu'][dtype] = entry['processor'].getDefaultCPUProcessor()
+        return entry['cpu'][dtype]
+
+    def clearProcessorCache(self):
+        '''
+        Clear all cached processors and reset the cache statistics.
+        '''
+        self.processorCache.clear()
+        self.processorCacheHits = 0
+        self.processorCacheMisses = 0
+
+    def getConfig(self, name):
+        '''
+        Get an OCIO configuration, creating it on first request.
+        Configurations are memoized so that a given built-in configuration is only ever parsed once,
+        whether it is requested by short name or by its "ocio://" URI.
+        @param name: A built-in configuration name, an "ocio://" URI or a configuration file path.
+        @return: The OCIO configuration.
+        '''
+        key = name
+        if key.startswith('ocio://'):
+            key = key[len('ocio://'):]
+        config = self.configCache.get(key)
+        if config:
+            return config
+
+        with self.instrumentation.span('loadConfig', config=name):
+            if key in self.getBuiltinConfigNames():
+                config = OCIO.Config.CreateFromBuiltinConfig(key)
+            else:
+                config = OCIO.Config.CreateFromFile(name)
+        self.configCache[key] = config
+        return config
+
+    def getBuiltinConfigNames(self):
+        '''
+        Get the short names of all configurations in the OCIO built-in registry.
+        @return: A set of built-in configuration names.
+        '''
+        if self.builtinConfigNames is None:
+            registry = OCIO.BuiltinConfigRegistry().getBuiltinConfigs()
+            self.builtinConfigNames = set([item[0] for item in registry])
+        return self.builtinConfigNames
+
     def getBuiltinConfigs(self):
         '''
         Get the OCIO built in configurations.
         Returnes a dictionary of color spaces and the default "ACES Cg Config".
+        Each dictionary value, and the default configuration, is a LazyConfigEntry which only
+        parses the configuration when it is first accessed. Use getConfig() on the default entry
+        to get the OCIO configuration.
         '''
         # Get the OCIO built in configs
         registry = OCIO.BuiltinConfigRegistry().getBuiltinConfigs()
@@ -32,20 +326,12 @@ class OCIOMaterialaxGenerator():
 
             # Don't present built-in configs to users if they are no longer recommended.
             if isRecommended:
-                # Create a config using the Cg config
-                config = OCIO.Config.CreateFromBuiltinConfig(short_name)
-                colorSpaces = None
-                if config:
-                    colorSpaces = config.getColorSpaces()
+                configs[short_name] = LazyConfigEntry(self, short_name, ui_name, isDefault)
 
-                if colorSpaces:
-                    configs[short_name] = [config, colorSpaces]
-
-        acesCgConfigPath = 'ocio://cg-config-v1.0.0_aces-v1.3_ocio-v2.1'
-        builtinCfgC = OCIO.Config.CreateFromFile(acesCgConfigPath)
-        print('Built-in config:', builtinCfgC.getName())
-        csnames = builtinCfgC.getColorSpaceNames()
-        print('- Number of color spaces: %d' % len(csnames))
+        acesCgConfigName = 'cg-config-v1.0.0_aces-v1.3_ocio-v2.1'
+        builtinCfgC = configs.get(acesCgConfigName)
+        if not builtinCfgC:
+            builtinCfgC = LazyConfigEntry(self, acesCgConfigName, acesCgConfigName, False)
 
         return configs, builtinCfgC
 
@@ -55,18 +341,14 @@ class OCIOMaterialaxGenerator():
         @param configs: The OCIO configurations.
         @return: A markdown string.
         '''
-        title = '| Configuration | Color Space | Aliases |\n'
-        title = title + '| --- | --- | --- |\n'
-
-        rows = ''
+        lines = ['| Configuration | Color Space | Aliases |', '| --- | --- | --- |']
         for c in configs:
-            config = configs[c][0]
             colorSpaces = configs[c][1]
             for colorSpace in colorSpaces:
                 aliases = colorSpace.getAliases()
-                rows = rows + '| ' + c + ' | ' + colorSpace.getName() + ' | ' + ', '.join(aliases) + ' |\n'
+                lines.append('| ' + c + ' | ' + colorSpace.getName() + ' | ' + ', '.join(aliases) + ' |')
 
-        return title + rows
+        return '\n'.join(lines) + '\n'
 
     def createTransformName(self, sourceSpace, targetSpace, typeName, prefix = 'mx_'):
         '''
@@ -76,9 +358,24 @@ class OCIOMaterialaxGenerator():
         @param typeName: The type name.
         @param prefix: The prefix for the transform name. Default is 'mx_'.
         '''        
-        transformFunctionName = prefix + mx.createValidName(sourceSpace) + "_to_" + mx.createValidName(targetSpace) + "_" + typeName 
+        transformFunctionName = prefix + createValidName(sourceSpace) + "_to_" + createValidName(targetSpace) + "_" + typeName 
+        # Repeated underscores, for example from 'sRGB - Texture', are not valid in MaterialX function names
+        transformFunctionName = re.sub('_{2,}', '_', transformFunctionName)
         return transformFunctionName
 
+    def createTransformCategory(self, sourceSpace, targetSpace, typeName = None):
+        '''
+        Create the node category of a transform from a source and target color space. The category is a valid
+        MaterialX name for any color space names, so nodes of the transform can be written as XML elements.
+        @param sourceSpace: The source color space.
+        @param targetSpace: The target color space.
+        @param typeName: Optional type name to append.
+        '''
+        category = createValidName(sourceSpace) + '_to_' + createValidName(targetSpace)
+        if typeName:
+            category = category + '_' + typeName
+        return re.sub('_{2,}', '_', category)
+
     def setShaderDescriptionParameters(self, shaderDesc, sourceSpace, targetSpace, typeName):
         '''
         Set parameters on a shader description for a given source and target color space and type name.
@@ -91,7 +388,19 @@ class OCIOMaterialaxGenerator():
         shaderDesc.setFunctionName(transformFunctionName)
         shaderDesc.setResourcePrefix(transformFunctionName)
 
-    def generateShaderCode(self, config, sourceColorSpace, destColorSpace, language):
+    def getShaderFunctionName(self, transformName):
+        '''
+        Get the name of the transform function in the shader code generated by OCIO. OCIO sanitizes the
+        function name set on a shader description, for example by replacing double underscores, so the
+        name can differ from the transform name.
+        @param transformName: The transform name from createTransformName().
+        @return: The function name used in the shader code.
+        '''
+        shaderDesc = OCIO.GpuShaderDesc.CreateShaderDesc()
+        shaderDesc.setFunctionName(transformName)
+        return shaderDesc.getFunctionName()
+
+    def generateShaderCode(self, config, sourceColorSpace, destColorSpace, language, textures = None):
         '''
         Generate shader for a transform from a source color space to a destination color space
         for a given config and shader language.
@@ -100,6 +409,8 @@ class OCIOMaterialaxGenerator():
         @param sourceColorSpace: The source color space.
         @param destColorSpace: The destination color space.
         @param language: The OCIO GPU language.
+        @param textures: Optional list to append the texture resources required by the shader code to.
+        See getTextureResource() for the description of each texture.
         @return: A tuple containing the shader code and the number of texture resources required.
 
         Returns the shader code and the number of texture resources required.
@@ -109,39 +420,172 @@ class OCIOMaterialaxGenerator():
         if not config:
             return shaderCode, textureCount
 
-        # Create a processor for a pair of colorspaces
-        processor = None
+        # Use previously extracted code from the on-disk cache
+        cacheKey = None
+        if self.diskCache:
+            cacheKey = self.diskCache.getKey('shaderCode', OCIO.GetVersion(), config.getCacheID(), sourceColorSpace, destColorSpace, language.name)
+            cached = self.getDiskCacheValue(cacheKey)
+            # Texture values are not cached so the processor is required to return them
+            if cached is not None and (textures is None or not cached['textureCount']):
+                return cached['code'], cached['textureCount']
+
+        # Get the (cached) GPU processor for a pair of colorspaces
+        gpuProcessor = None
         try:
-            processor = config.getProcessor(sourceColorSpace, destColorSpace)
+            gpuProcessor = self.getGPUProcessor(config, sourceColorSpace, destColorSpace)
         except:
-            print('Failed to generated code for transform: %s -> %s' % (sourceColorSpace, destColorSpace))
+            self.log('Failed to generated code for transform: %s -> %s' % (sourceColorSpace, destColorSpace))
             return shaderCode, textureCount
 
-        if processor:
-            gpuProcessor = processor.getDefaultGPUProcessor()
-            if gpuProcessor:
-                shaderDesc = OCIO.GpuShaderDesc.CreateShaderDesc()
-                if shaderDesc:
-                    try:
-                        shaderDesc.setLanguage(language)
-                        if shaderDesc.getLanguage() == language:
-                            self.setShaderDescriptionParameters(shaderDesc, sourceColorSpace, destColorSpace, "color4")
-                            gpuProcessor.extractGpuShaderInfo(shaderDesc)                                                                 
+        if gpuProcessor:
+            shaderDesc = OCIO.GpuShaderDesc.CreateShaderDesc()
+            if shaderDesc:
+                try:
+                    shaderDesc.setLanguage(language)
+                    if shaderDesc.getLanguage() == language:
+                        self.setShaderDescriptionParameters(shaderDesc, sourceColorSpace, destColorSpace, "color4")
+                        with self.instrumentation.span('extractShader', source=sourceColorSpace, destination=destColorSpace):
+                            gpuProcessor.extractGpuShaderInfo(shaderDesc)
                             shaderCode = shaderDesc.getShaderText()
 
-                            for t in shaderDesc.getTextures():
-                                textureCount += 1
-
-                            if shaderCode:
-                                shaderCode = shaderCode.replace(
-                                    "// Declaration of the OCIO shader function\n", 
-                                    "// " + sourceColorSpace + " to " + destColorSpace + " function. Texture count: %d\n" % textureCount)
-
-                    except OCIO.Exception as err:
-                        print(err)
+                        for t in shaderDesc.getTextures():
+                            textureCount += 1
+                            if textures is not None:
+                                textures.append(self.getTextureResource(t))
+                        for t in shaderDesc.get3DTextures():
+                            textureCount += 1
+                            if textures is not None:
+                                textures.append(self.getTextureResource(t, True))
+
+                        if shaderCode:
+                            shaderCode = shaderCode.replace(
+                                "// Declaration of the OCIO shader function\n", 
+                                "// " + sourceColorSpace + " to " + destColorSpace + " function. Texture count: %d\n" % textureCount)
+
+                except OCIO.Exception as err:
+                    self.log(err)
+
+        if cacheKey and shaderCode:
+            self.diskCache.put(cacheKey, { 'code': shaderCode, 'textureCount': textureCount })
         
         return shaderCode, textureCount
     
+    def applyTransform(self, config, sourceColorSpace, destColorSpace, pixels, inPlace = True, tileSize = 262144, threads = None):
+        '''
+        Apply a transform from a source color space to a destination color space to an array of pixels
+        using the OCIO CPU processor. The result matches the shader code generated for the same transform.
+        The pixels are split into tiles which are processed on a pool of threads.
+        @param config: The OCIO configuration.
+        @param sourceColorSpace: The source color space.
+        @param destColorSpace: The destination color space.
+        @param pixels: A float32 or float16 NumPy array whose last dimension is 3 (RGB) or 4 (RGBA) channels,
+        for example an (height, width, 4) image.
+        @param inPlace: Whether to modify the pixels in place. C-contiguous arrays are processed without copying.
+        Other arrays are copied to a contiguous buffer and the result is copied back. Default is True.
+        @param tileSize: The number of pixels in each tile. Default is 262144.
+        @param threads: The number of threads. Default is the number of CPUs.
+        @return: The transformed pixels. This is the pixels array if inPlace is True.
+        '''
+        if not np.isAvailable():
+            raise ImportError('NumPy is required to apply transforms to pixels.')
+        if not isinstance(pixels, np.ndarray):
+            pixels = np.asarray(pixels, dtype=np.float32)
+        if pixels.dtype not in [np.float32, np.float16]:
+            raise ValueError('Unsupported pixel type: %s. Use float32 or float16.' % pixels.dtype)
+        channels = pixels.shape[-1] if pixels.ndim else 0
+        if channels not in [3, 4]:
+            raise ValueError('Pixels must have 3 or 4 channels, not shape: %s' % (pixels.shape,))
+        if inPlace and not pixels.flags.writeable:
+            raise ValueError('Pixels cannot be modified in place as the array is read-only.')
+
+        result = pixels if inPlace else pixels.copy()
+        buffer = result if result.flags.c_contiguous else np.ascontiguousarray(result)
+        flat = buffer.reshape(-1, channels)
+        half = buffer.dtype == np.float16
+        processor = self.getCPUProcessor(config, sourceColorSpace, destColorSpace, buffer.dtype)
+
+        def applyTile(tile):
+            if half:
+                # Each tile is processed as a single row of a packed image
+                pixelBytes = channels * tile.itemsize
+                processor.apply(OCIO.PackedImageDesc(tile, tile.shape[0], 1, channels, OCIO.BIT_DEPTH_F16,
+                                                     tile.itemsize, pixelBytes, pixelBytes * tile.shape[0]))
+            elif channels == 4:
+                processor.applyRGBA(tile)
+            else:
+                processor.applyRGB(tile)
+
+        tiles = [flat[start:start + tileSize] for start in range(0, flat.shape[0], max(1, tileSize))]
+        threads = threads if threads else (os.cpu_count() or 1)
+        with self.instrumentation.span('applyTransform', source=sourceColorSpace, destination=destColorSpace, pixels=flat.shape[0]):
+            if threads > 1 and len(tiles) > 1:
+                from concurrent.futures import ThreadPoolExecutor
+                with ThreadPoolExecutor(max_workers=min(threads, len(tiles))) as executor:
+                    list(executor.map(applyTile, tiles))
+            else:
+                for tile in tiles:
+                    applyTile(tile)
+        self.instrumentation.count('pixelsTransformed', flat.shape[0])
+
+        if buffer is not result:
+            result[...] = buffer
+        return result
+
+    def getTextureResource(self, texture, is3D = False):
+        '''
+        Get the description and values of a texture resource of a shader description.
+        @param texture: The OCIO GpuShaderDesc texture or 3D texture.
+        @param is3D: Whether the texture is a 3D texture.
+        @return: A dictionary with the texture 'name', 'sampler' name, 'dimensions' ('1D', '2D' or '3D'),
+        'width', 'height', 'depth', number of 'channels' (1 or 3), 'interpolation' ('nearest', 'linear', ...)
+        and float32 'values' with the red channel and width varying fastest.
+        '''
+        resource = { 'name': texture.textureName, 'sampler': texture.samplerName,
+                     'interpolation': texture.interpolation.name.replace('INTERP_', '').lower() }
+        if is3D:
+            resource.update({ 'dimensions': '3D', 'width': texture.edgeLen, 'height': texture.edgeLen, 'depth': texture.edgeLen,
+                              'channels': 3 })
+        else:
+            dimensions = '2D' if texture.height > 1 else '1D'
+            # The texture dimensions are only available in newer versions of OCIO
+            if hasattr(texture, 'dimensions'):
+                dimensions = texture.dimensions.name.replace('TEXTURE_', '')
+            resource.update({ 'dimensions': dimensions, 'width': texture.width, 'height': texture.height, 'depth': 1,
+                              'channels': 1 if texture.channel == OCIO.GpuShaderDesc.TEXTURE_RED_CHANNEL else 3 })
+        resource['values'] = texture.getValues()
+        return resource
+
+    def serializeTexture(self, texture):
+        '''
+        Serialize the values of a texture resource as a NumPy .npy file of little-endian float32 values.
+        The file can be memory mapped using numpy.load(filename, mmap_mode='r'). The array shape is
+        (height, width, channels) for 1D and 2D textures and (depth, height, width, channels) for 3D textures.
+        @param texture: A texture resource returned from getTextureResource().
+        @return: The file content bytes.
+        '''
+        if not np.isAvailable():
+            raise ImportError('NumPy is required to serialize texture resources')
+        shape = (texture['height'], texture['width'], texture['channels'])
+        if texture['dimensions'] == '3D':
+            shape = (texture['depth'],) + shape
+        stream = io.BytesIO()
+        np.save(stream, np.ascontiguousarray(texture['values'], dtype='<f4').reshape(shape))
+        return stream.getvalue()
+
+    def addTextureInputs(self, impl, textures):
+        '''
+        Declare the texture resources required by the source code of an implementation. A filename input
+        is added for each texture, named after the texture and referencing its serialized file. The sampler name
+        used in the source code and the texture layout are stored as attributes of the input.
+        @param impl: The MaterialX implementation.
+        @param textures: A list of texture resources returned from getTextureResource().
+        '''
+        for texture in textures:
+            input = impl.addInput(texture['name'], 'filename')
+            input.setValueString(texture['name'] + '.npy')
+            for attribute in ['sampler', 'dimensions', 'width', 'height', 'depth', 'channels', 'interpolation']:
+                input.setAttribute(attribute, str(texture[attribute]))
+
     def generateTransformGraph(self, config, sourceColorSpace, destColorSpace):
         '''
         Generate the group of transforms required to go from a source color space to a destination color space.
@@ -154,25 +598,178 @@ class OCIOMaterialaxGenerator():
         if not config:
             return None
 
-        # Create a processor for a pair of colorspaces (namely to go to linear)
+        # Get the (cached) optimized processor for a pair of colorspaces (namely to go to linear)
         processor = None
         groupTransform = None
         try:
-            processor = config.getProcessor(sourceColorSpace, destColorSpace)
+            processor = self.getOptimizedProcessor(config, sourceColorSpace, destColorSpace)
         except:
             #print('Failed to get processor for: %s -> %s' % (sourceColorSpace, destColorSpace))
             return groupTransform
 
         if processor:
-            processor = processor.getOptimizedProcessor(OCIO.OPTIMIZATION_ALL) 
             groupTransform = processor.createGroupTransform()
         
         return groupTransform    
 
+    def getDiskCacheValue(self, key):
+        '''
+        Get a value from the on-disk cache, counting hits and misses.
+        @param key: The cache key.
+        @return: The value or None if it is not cached.
+        '''
+        value = self.diskCache.get(key)
+        self.instrumentation.count('diskCacheHits' if value is not None else 'diskCacheMisses')
+        return value
+
+    def getTransformOps(self, config, sourceColorSpace, destColorSpace):
+        '''
+        Get a serializable description of the group of transforms returned from generateTransformGraph().
+        The description is stored in the on-disk cache if there is one, in which case later calls do not
+        need to create an OCIO processor.
+        @param config: The OCIO configuration.
+        @param sourceColorSpace: The source color space.
+        @param destColorSpace: The destination color space.
+        @return: A dictionary with the string representation of the group transform ('text') and a list of
+        transform operations ('ops'). Each operation has the OCIO transform 'type' and 'direction' enumeration names
+        and the parameters used for generation: 'matrix' and 'offset' for matrix transforms, 'value' and 'negativeStyle' for exponent
+        transforms, 'gamma', 'offset' and 'negativeStyle' for exponent with linear transforms, 'style' for fixed function transforms, 'style', 'minIn', 'maxIn',
+        'minOut' and 'maxOut' for range transforms (None if not set), and 'length', 'inputHalfDomain' and 'hueAdjust' for LUT1D transforms.
+        None is returned if the processor cannot be created. Failures are also stored in the on-disk cache.
+        '''
+        if not config:
+            return None
+        cacheKey = None
+        if self.diskCache:
+            cacheKey = self.diskCache.getKey('transformOps', OCIO.GetVersion(), config.getCacheID(), sourceColorSpace, destColorSpace)
+            cached = self.getDiskCacheValue(cacheKey)
+            if cached is not None:
+                return cached if cached['ops'] is not None else None
+
+        groupTransform = None
+        try:
+            entry = self.getProcessorEntry(config, sourceColorSpace, destColorSpace)
+            if entry['transformOps'] is None:
+                groupTransform = self.generateTransformGraph(config, sourceColorSpace, destColorSpace)
+        except OCIO.Exception:
+            entry = None
+        if entry is None or (entry['transformOps'] is None and groupTransform is None):
+            if cacheKey:
+                self.diskCache.put(cacheKey, { 'text': 'None', 'ops': None })
+            return None
+        if entry['transformOps'] is None:
+            ops = []
+            for i in range(groupTransform.__len__()):
+                transform = groupTransform.__getitem__(i)
+                transformType = transform.getTransformType()
+                op = { 'type': transformType.name, 'direction': transform.getDirection().name }
+                if transformType == OCIO.TransformType.TRANSFORM_TYPE_MATRIX:
+                    op['matrix'] = list(transform.getMatrix())
+                    op['offset'] = list(transform.getOffset())
+                elif transformType == OCIO.TransformType.TRANSFORM_TYPE_EXPONENT:
+                    op['value'] = list(transform.getValue())
+                    op['negativeStyle'] = transform.getNegativeStyle().name
+                elif transformType == OCIO.TransformType.TRANSFORM_TYPE_EXPONENT_WITH_LINEAR:
+                    op['gamma'] = list(transform.getGamma())
+                    op['offset'] = list(transform.getOffset())
+                    op['negativeStyle'] = transform.getNegativeStyle().name
+                elif transformType == OCIO.TransformType.TRANSFORM_TYPE_FIXED_FUNCTION:
+                    op['style'] = transform.getStyle().name
+                elif transformType == OCIO.TransformType.TRANSFORM_TYPE_RANGE:
+                    op['style'] = transform.getStyle().name
+                    # Unset values are returned as NaN
+                    for name, value in [('minIn', transform.getMinInValue()), ('maxIn', transform.getMaxInValue()),
+                                        ('minOut', transform.getMinOutValue()), ('maxOut', transform.getMaxOutValue())]:
+                        op[name] = None if value != value else value
+                elif transformType == OCIO.TransformType.TRANSFORM_TYPE_LUT1D:
+                    op['length'] = transform.getLength()
+                    op['inputHalfDomain'] = transform.getInputHalfDomain()
+                    op['hueAdjust'] = transform.getHueAdjust().name
+                ops.append(op)
+            entry['transformOps'] = { 'text': f'{groupTransform}', 'ops': ops }
+            if cacheKey:
+                self.diskCache.put(cacheKey, entry['transformOps'])
+        return entry['transformOps']
+
+    def getTextureOpCount(self, config, sourceColorSpace, destColorSpace):
+        '''
+        Count the operations of a transform which OCIO implements using textures on the GPU.
+        The transforms of the optimized processor are inspected, so no shader code needs to be extracted.
+        LUT1D and LUT3D transforms and the ACES 2.0 output transform are implemented using textures.
+        @param config: The OCIO configuration.
+        @param sourceColorSpace: The source color space.
+        @param destColorSpace: The destination color space.
+        @return: The number of texture based operations. 0 is returned if the processor cannot be created.
+        '''
+        transformOps = self.getTransformOps(config, sourceColorSpace, destColorSpace)
+        if not transformOps:
+            return 0
+        textureTypes = [ 'TRANSFORM_TYPE_LUT1D', 'TRANSFORM_TYPE_LUT3D' ]
+        # Fixed functions which use lookup tables. Only available in newer versions of OCIO.
+        textureStyles = [ 'FIXED_FUNCTION_ACES_OUTPUT_TRANSFORM_20' ]
+        count = 0
+        for op in transformOps['ops']:
+            if op['type'] in textureTypes:
+                count += 1
+            elif op['type'] == 'TRANSFORM_TYPE_FIXED_FUNCTION' and op['style'] in textureStyles:
+                count += 1
+        return count
+
+    def getConfigTextureUsage(self, configName, targetColorSpace):
+        '''
+        Get the texture usage of the transforms from each color space in a configuration to a target color space.
+        Results are stored in the texture index so repeated queries, including from a loaded index,
+        do not need to load the configuration.
+        @param configName: The configuration name or URI.
+        @param targetColorSpace: The target color space.
+        @return: A dictionary of color space name to number of texture based operations, in configuration order.
+        '''
+        configIndex = self.textureIndex['configs'].setdefault(configName, {})
+        usage = configIndex.get(targetColorSpace)
+        if usage is None:
+            usage = {}
+            config = self.getConfig(configName)
+            with self.instrumentation.span('textureUsage', config=configName, destination=targetColorSpace):
+                for colorSpaceName in config.getColorSpaceNames():
+                    usage[colorSpaceName] = self.getTextureOpCount(config, colorSpaceName, targetColorSpace)
+            configIndex[targetColorSpace] = usage
+        return usage
+
+    def loadTextureIndex(self, filename):
+        '''
+        Load a texture usage index previously saved with saveTextureIndex().
+        The index is ignored if it was created with a different version of OCIO.
+        @param filename: The file path string.
+        @return: True if the index was loaded.
+        '''
+        if not os.path.exists(filename):
+            return False
+        try:
+            with open(filename, 'r') as f:
+                index = json.load(f)
+        except (OSError, ValueError) as err:
+            self.log('Ignoring unreadable texture index %s: %s' % (filename, err))
+            return False
+        if index.get('ocioVersion') != OCIO.GetVersion():
+            return False
+        self.textureIndex = index
+        return True
+
+    def saveTextureIndex(self, filename):
+        '''
+        Save the texture usage index.
+        @param filename: The file path string.
+        '''
+        self.textureIndex['ocioVersion'] = OCIO.GetVersion()
+        with open(filename, 'w') as f:
+            json.dump(self.textureIndex, f, indent=2, sort_keys=True)
+
     def hasTextureResources(self, configs, targetColorSpace, language):
         '''
         Scan through all the color spaces on the configs to check for texture resource usage.
         Returns a set of color spaces that require texture resources.
+        Texture usage is determined from the optimized processor transforms using getConfigTextureUsage()
+        and does not depend on the shader language.
 
         @param configs: The OCIO configurations.
         @param targetColorSpace: The target color space.
@@ -182,23 +779,198 @@ class OCIOMaterialaxGenerator():
         testedSources = set()
         textureSources = set()
         for c in configs:
-            config = OCIO.Config.CreateFromBuiltinConfig(c)
-            colorSpaces = config.getColorSpaces()
-            for colorSpace in colorSpaces:
-                colorSpaceName = colorSpace.getName()
+            usage = self.getConfigTextureUsage(c, targetColorSpace)
+            for colorSpaceName, textureOpCount in usage.items():
                 # Skip if the colorspace is already tested
                 if colorSpaceName in testedSources:
                     continue
                 testedSources.add(colorSpaceName)
 
-                # Test for texture resource usage
-                code, textureCount = self.generateShaderCode(config, colorSpace.getName(), targetColorSpace, language)
-                if textureCount:
-                    print('- Transform "%s" to "%s" requires %d texture resources' % (colorSpace.getName(), targetColorSpace, textureCount))
+                if textureOpCount:
+                    self.log('- Transform "%s" to "%s" requires texture resources' % (colorSpaceName, targetColorSpace))
                     textureSources.add(colorSpaceName)
         
         return textureSources
 
+    def getTargetLanguages(self, targets = None):
+        '''
+        Get the list of MaterialX targets, source code extensions and OCIO shader languages which
+        code can be generated for. Languages which are not supported by the installed OCIO version are skipped.
+        The "genhlsl" target is OCIO only: there is no MaterialX HLSL code generator, so the HLSL code and implementations
+        are only useful for custom code generators. It is only returned if it is explicitly requested.
+        @param targets: Optional list of MaterialX target names to return. Default is all MaterialX targets.
+        @return: A list of [target, extension, language] lists.
+        '''
+        languageList = [
+            ['genglsl', 'glsl', 'GPU_LANGUAGE_GLSL_4_0'],
+            ['essl', 'essl', 'GPU_LANGUAGE_GLSL_ES_3_0'],
+            ['genmsl', 'metal', 'GPU_LANGUAGE_MSL_2_0'],
+            ['genosl', 'osl', 'LANGUAGE_OSL_1'],
+            ['genhlsl', 'hlsl', 'GPU_LANGUAGE_HLSL_DX11']
+            ]
+        # Targets without a MaterialX code generator
+        ocioOnlyTargets = ['genhlsl']
+
+        result = []
+        for target, extension, languageName in languageList:
+            if targets and target not in targets:
+                continue
+            if not targets and target in ocioOnlyTargets:
+                continue
+            language = getattr(OCIO.GpuLanguage, languageName, None)
+            if language is None:
+                self.log('- Target "%s" is not supported by OCIO version: %s' % (target, OCIO.GetVersion()))
+                continue
+            result.append([target, extension, language])
+        return result
+
+    def splitArguments(self, text, start):
+        '''
+        Split the comma separated arguments of a call in shader code.
+        @param text: The shader code.
+        @param start: The index of the opening parenthesis of the call.
+        @return: A tuple of the list of argument strings and the index after the closing parenthesis,
+        or None if the parentheses are not balanced.
+        '''
+        arguments = []
+        depth = 0
+        argumentStart = start + 1
+        for i in range(start, len(text)):
+            if text[i] == '(':
+                depth += 1
+            elif text[i] == ')':
+                depth -= 1
+                if depth == 0:
+                    arguments.append(text[argumentStart:i].strip())
+                    return arguments, i + 1
+            elif text[i] == ',' and depth == 1:
+                arguments.append(text[argumentStart:i].strip())
+                argumentStart = i + 1
+        return None
+
+    def createColor3Function(self, code, transformName, target, color3TransformName):
+        '''
+        Create a color3 function from the color4 transform function in OCIO shader code, with the alpha
+        channel removed. OCIO processes the alpha channel alongside the color channels, so each four component
+        vector and matrix in the transform function is reduced to three components, and the statements which
+        only compute alpha are removed. The result is the same as calling the color4 function with an alpha of 1.
+        Matrices which add alpha to the color channels are not reduced, so no function is created for them.
+        @param code: The shader code from generateShaderCode().
+        @param transformName: The name of the OCIO transform function in the code. See getShaderFunctionName().
+        @param target: The MaterialX target. Only 'genglsl', 'essl', 'genmsl' and 'genhlsl' are supported.
+        @param color3TransformName: The name of the color3 function.
+        @return: The color3 function following the MaterialX calling convention, or None if the target is not
+        supported, the transform function contains code which cannot be reduced to three components, or the
+        MSL class wrapping the transform function has members.
+        '''
+        # Four and three component vector and matrix types, and the color3 function signature for each target
+        types = {
+            'genglsl': ['vec4', 'vec3', 'mat4', 'mat3', 'void %s(vec3 inPixel, out vec3 outColor)'],
+            'essl': ['vec4', 'vec3', 'mat4', 'mat3', 'void %s(vec3 inPixel, out vec3 outColor)'],
+            'genmsl': ['float4', 'float3', 'float4x4', 'float3x3', 'void %s(float3 inPixel, thread float3& outColor)'],
+            'genhlsl': ['float4', 'float3', 'float4x4', 'float3x3', 'void %s(float3 inPixel, out float3 outColor)']
+        }
+        if target not in types:
+            return None
+        vector4, vector3, matrix4, matrix3, signature = types[target]
+
+        # The body of the transform function, up to the first closing brace at the start of a line
+        match = re.search(r'^%s %s\(%s inPixel\)\n\{\n(.*?)^\}' % (vector4, re.escape(transformName), vector4), code,
+                          flags=re.MULTILINE | re.DOTALL)
+        if not match:
+            return None
+
+        # OCIO wraps the MSL transform function in a class. The body can only be moved out of the class if
+        # the class has no members or helper functions, other than its empty constructor.
+        if target == 'genmsl':
+            wrapper = re.search(r'^struct (\w+)\n\{\n(.*?)^\};', code, flags=re.MULTILINE | re.DOTALL)
+            if wrapper:
+                members = wrapper.group(2).replace(match.group(0), '')
+                members = re.sub(r'\b%s\(\s*\)\s*\{\s*\}' % wrapper.group(1), '', members)
+                if re.sub(r'//.*', '', members).strip():
+                    return None
+
+        lines = []
+        for line in match.group(1).split('\n'):
+            stripped = line.strip()
+            if stripped == '%s outColor = inPixel;' % vector4:
+                line = line.replace(stripped, 'outColor = inPixel;')
+            elif stripped == 'return outColor;' or stripped.startswith('outColor.a = '):
+                continue
+            lines.append(line.replace('outColor.rgb', 'outColor'))
+        body = '\n'.join(lines).rstrip()
+
+        # Reduce 4x4 matrices to their 3x3 color part. The element order is the same for all targets.
+        def reduceMatrix(match):
+            elements = [element.strip() for element in match.group(1).split(',')]
+            if len(elements) != 16 or any(re.sub(r'^-?0*\.?0*f?$', '', elements[i]) for i in [12, 13, 14]):
+                return match.group(0)
+            return '%s(%s)' % (matrix3, ', '.join(elements[i] for i in [0, 1, 2, 4, 5, 6, 8, 9, 10]))
+        body = re.sub(r'\b%s\(([^()]*)\)' % matrix4, reduceMatrix, body)
+
+        # Remove the alpha component of vector constructors
+        pattern = re.compile(r'\b%s\(' % vector4)
+        match = pattern.search(body)
+        while match:
+            split = self.splitArguments(body, match.end() - 1)
+            if not split or len(split[0]) not in [1, 4]:
+                return None
+            arguments, end = split
+            body = body[:match.start()] + '%s(%s)' % (vector3, ', '.join(arguments[0:3])) + body[end:]
+            match = pattern.search(body, match.start() + len(vector3))
+        body = re.sub(r'\b%s\b' % vector4, vector3, body)
+
+        # Any remaining alpha or four component code cannot be converted
+        if re.search(r'\b%s\b|\.a\b|\.w\b|\[3\]|\.rgba\b|\.xyzw\b' % matrix4, body):
+            return None
+        return signature % color3TransformName + '\n{\n' + body + '\n}\n'
+
+    def createMaterialXFunction(self, code, transformName, target, color3TransformName = None, shaderFunctionName = None):
+        '''
+        Add a function to OCIO shader code which follows the MaterialX calling convention for
+        source code implementations: the input pixel is passed in and the result is returned as an
+        output argument. The OCIO transform function returns the result so cannot be called directly.
+        @param code: The shader code from generateShaderCode().
+        @param transformName: The name of the function to add.
+        @param target: The MaterialX target.
+        @param color3TransformName: Optional name of a color3 function to add. The function is created by
+        createColor3Function() so that it does not compute alpha. If this is not possible, for example for OSL,
+        the function calls the transform function with a constant alpha of 1 and only returns the color channels.
+        @param shaderFunctionName: The name of the OCIO transform function in the code. Default is the name
+        returned by getShaderFunctionName() for transformName.
+        @return: The shader code with the additional functions.
+        '''
+        # Color4 function signature, color3 function signature and color3 to color4 conversion for each target
+        signatures = {
+            'genglsl': ['void %s(vec4 inPixel, out vec4 outColor)', 'void %s(vec3 inPixel, out vec3 outColor)', 'vec4(inPixel, 1.0)'],
+            'essl': ['void %s(vec4 inPixel, out vec4 outColor)', 'void %s(vec3 inPixel, out vec3 outColor)', 'vec4(inPixel, 1.0)'],
+            'genmsl': ['void %s(float4 inPixel, thread float4& outColor)', 'void %s(float3 inPixel, thread float3& outColor)', 'float4(inPixel, 1.0)'],
+            'genosl': ['void %s(color4 inPixel, output color4 outColor)', 'void %s(color inPixel, output color outColor)', 'color4(inPixel, 1.0)'],
+            'genhlsl': ['void %s(float4 inPixel, out float4 outColor)', 'void %s(float3 inPixel, out float3 outColor)', 'float4(inPixel, 1.0)']
+        }
+        if not code or target not in signatures:
+            return code
+        if not shaderFunctionName:
+            shaderFunctionName = self.getShaderFunctionName(transformName)
+
+        if target == 'genosl':
+            # OCIO outputs a complete OSL shader. Remove the includes as MaterialX provides its own
+            # color4 and vector4 definitions, and remove the shader wrapper around the transform function.
+            code = re.sub(r'^#include ".*"\n', '', code, flags=re.MULTILINE)
+            code = re.sub(r'^shader OSL_%s\(.*\)\n\{\n' % re.escape(shaderFunctionName), '', code, flags=re.MULTILINE)
+            code = code.replace('outColor = %s(inColor);\n}' % shaderFunctionName, '')
+            code = code.rstrip('\n') + '\n'
+
+        color3Function = self.createColor3Function(code, shaderFunctionName, target, color3TransformName) if color3TransformName else None
+        code += '\n' + signatures[target][0] % transformName + '\n'
+        code += '{\n  outColor = %s(inPixel);\n}\n' % shaderFunctionName
+        if color3Function:
+            code += '\n' + color3Function
+        elif color3TransformName:
+            code += '\n' + signatures[target][1] % color3TransformName + '\n'
+            code += '{\n  outColor = %s(%s).rgb;\n}\n' % (shaderFunctionName, signatures[target][2])
+        return code
+
     def MSL(self, config, sourceColorSpace, targetColorSpace):
         '''
         Generate MSL shader code for a transform from a source color space to a destination color space
@@ -213,6 +985,7 @@ class OCIOMaterialaxGenerator():
         if code:
             code = code.replace("// Declaration of the OCIO shader function\n", "// " + sourceColorSpace + " to " + targetColorSpace + " function\n")
             code = '```c++\n' + code + '\n```\n'
+        return code
 
     def OSL(self, config, sourceColorSpace, targetColorSpace):
         '''
@@ -228,12 +1001,86 @@ class OCIOMaterialaxGenerator():
             code, textureCount = self.generateShaderCode(config, sourceColorSpace, targetColorSpace, language)
             if code:
                 # Bit of ugly patching to make the main function name consistent.
-                transformName = self.createTransformName(sourceColorSpace, targetColorSpace, 'color4')
+                transformName = self.getShaderFunctionName(self.createTransformName(sourceColorSpace, targetColorSpace, 'color4'))
                 code = code.replace('OSL_' + transformName, '__temp_name__')
                 code = code.replace(transformName, transformName + '_impl')
                 code = code.replace('__temp_name__', transformName)
                 code = code.replace("// Declaration of the OCIO shader function\n", "// " + sourceColorSpace + " to " + targetColorSpace + " function\n")
                 code = '```c++\n' + code + '\n```\n'
+            return code
+        return ''
+
+    def getTransformFingerprint(self, config, sourceColorSpace, destColorSpace, sample = True):
+        '''
+        Get fingerprints identifying the numerical result of a transform.
+        The first fingerprint is the OCIO processor cache identifier which is the same for identical
+        transforms, including across configurations. The second is a hash of the result of applying the
+        CPU processor to a fixed set of probe colors which can match transforms whose cache identifiers differ.
+        @param config: The OCIO configuration.
+        @param sourceColorSpace: The source color space.
+        @param destColorSpace: The destination color space.
+        @param sample: Whether to compute the probe fingerprint. Requires NumPy.
+        @return: A tuple of processor cache identifier and probe hash. Either may be None if it could not be computed.
+        '''
+        try:
+            processor = self.getProcessor(config, sourceColorSpace, destColorSpace)
+        except OCIO.Exception:
+            return None, None
+        if not processor:
+            return None, None
+
+        probeHash = None
+        if sample and np.isAvailable():
+            cpuProcessor = processor.getDefaultCPUProcessor()
+            values = self.getProbeColors()
+            cpuProcessor.applyRGB(values)
+            # Quantize to be robust to minor floating point differences between op orderings
+            quantized = np.round(values.astype(np.float64), 5) + 0.0
+            probeHash = hashlib.sha256(quantized.tobytes()).hexdigest()
+
+        return processor.getCacheID(), probeHash
+
+    def getProbeColors(self):
+        '''
+        Get the fixed set of colors used to fingerprint transforms. Requires NumPy.
+        @return: A new (N,3) float32 array.
+        '''
+        steps = np.linspace(-0.125, 1.125, 9, dtype=np.float32)
+        grid = np.stack(np.meshgrid(steps, steps, steps, indexing='ij'), axis=-1).reshape(-1, 3)
+        highlights = np.array([[2.0, 2.0, 2.0], [4.0, 1.0, 0.5], [16.0, 16.0, 16.0], [100.0, 50.0, 10.0]], dtype=np.float32)
+        return np.ascontiguousarray(np.concatenate([grid, highlights]), dtype=np.float32)
+
+    def generateOCIOGraphAlias(self, sourceColorSpace, targetColorSpace, sharedSourceColorSpace, type='color3'):
+        '''
+        Generate a MaterialX nodedef and a nodegraph which instances the node of a numerically identical
+        transform created by generateOCIOGraph().
+        @param sourceColorSpace: The source color space.
+        @param targetColorSpace: The destination color space.
+        @param sharedSourceColorSpace: The source color space of the identical transform.
+        @param type: The type of the transform.
+        Returns a MaterialX document containing the nodedef and nodegraph pair.
+        '''
+        graphDoc = mx.createDocument()
+        outputType = 'color3'
+        xformName = self.createTransformCategory(sourceColorSpace, targetColorSpace, outputType)
+        sharedXformName = self.createTransformCategory(sharedSourceColorSpace, targetColorSpace, outputType)
+        graphName = self.createTransformName(sourceColorSpace, targetColorSpace, outputType, '')
+
+        nd = graphDoc.addNodeDef('ND_' + graphName)
+        nd.setAttribute('node', xformName)
+        ndInput = nd.addInput('in', 'color3')
+        ndInput.setValue([0.0, 0.0, 0.0], 'color3')
+        nd.setDocString(f'Generated color space {sourceColorSpace} to {targetColorSpace} transform. Identical to ND_{self.createTransformName(sharedSourceColorSpace, targetColorSpace, outputType, "")}.')
+
+        ng = graphDoc.addNodeGraph('NG_' + graphName)
+        ng.setAttribute('nodedef', nd.getName())
+        sharedNode = ng.addNode(sharedXformName, 'shared', outputType)
+        sharedInput = sharedNode.addInput('in', 'color3')
+        sharedInput.setInterfaceName('in')
+        out = ng.addOutput('out', outputType)
+        out.setNodeName(sharedNode.getName())
+
+        return graphDoc
 
     def generateMaterialXDefinition(self, doc, sourceColorSpace, targetColorSpace, inputName, type):
         '''
@@ -249,7 +1096,7 @@ class OCIOMaterialaxGenerator():
         comment.setDocString(docString)
 
         definition = doc.addNodeDef(nodeName, 'color4')
-        category = sourceColorSpace + '_to_' + targetColorSpace
+        category = self.createTransformCategory(sourceColorSpace, targetColorSpace)
         definition.setNodeString(category)
         definition.setNodeGroup('colortransform')
         definition.setDocString(docString)
@@ -264,7 +1111,7 @@ class OCIOMaterialaxGenerator():
 
         return definition
 
-    def writeShaderCode(self, outputPath, code, transformName, extension, target):
+    def writeShaderCode(self, outputPath, code, transformName, extension, target, writer = None):
         '''
         Write the shader code to a file.
         @param outputPath: The output file path.
@@ -272,15 +1119,73 @@ class OCIOMaterialaxGenerator():
         @param transformName: The transform name.
         @param extension: The file extension.
         @param target: The target language.
+        @param writer: Optional AsyncFileWriter to write the file in the background.
         '''   
         # Write source code file
         filename = outputPath / mx.FilePath(transformName + '.' + extension)
-        print('Write target[%s] source file %s' % (target,filename.asString()))
-        f = open(filename.asString(), 'w')
-        f.write(code)
-        f.close()
+        self.log('Write target[%s] source file %s' % (target,filename.asString()))
+        if writer:
+            writer.write(filename.asString(), code)
+        else:
+            self.writeFile(filename.asString(), code)
 
-    def createMaterialXImplementation(self, sourceColorSpace, targetColorSpace, doc, definition, transformName, extension, target):
+    def writeFile(self, filename, content):
+        '''
+        Write a string to a file, recording the time taken and the number of bytes written.
+        The content is written to a temporary file which then replaces the file, so readers never see a
+        partially written file.
+        @param filename: The file path string.
+        @param content: The file content string, or bytes for binary files.
+        '''
+        binary = isinstance(content, bytes)
+        with self.instrumentation.span('writeFile', file=filename):
+            tempFileName = '%s.%d.%d.tmp' % (filename, os.getpid(), threading.get_ident())
+            try:
+                with open(tempFileName, 'wb' if binary else 'w') as f:
+                    f.write(content)
+                os.replace(tempFileName, filename)
+            except BaseException:
+                if os.path.exists(tempFileName):
+                    os.remove(tempFileName)
+                raise
+        self.instrumentation.count('filesWritten')
+        self.instrumentation.count('bytesWritten', len(content) if binary else len(content.encode('utf-8')))
+
+    def combineShaderCode(self, codes, guardName, shareDeclarations = True):
+        '''
+        Combine the code from multiple generateShaderCode() calls into a single source.
+        Declarations and helper methods which OCIO emits before each transform function are split into
+        blocks and each distinct block is only emitted once. The result is wrapped in an include guard
+        so that it can be referenced by multiple implementations within the same shader.
+        @param codes: A list of shader code strings.
+        @param guardName: The include guard preprocessor name.
+        @param shareDeclarations: Whether to share declarations between functions. This must be disabled
+        for languages such as MSL where OCIO wraps each function in its own declarations.
+        @return: The combined shader code.
+        '''
+        functionMarker = re.compile(r'^// .* function\. Texture count: \d+$', re.MULTILINE)
+
+        sharedBlocks = []
+        functions = []
+        for code in codes:
+            match = functionMarker.search(code) if shareDeclarations else None
+            helpers = code[:match.start()] if match else ''
+            functions.append(code[match.start():] if match else code)
+            for block in helpers.split('\n\n'):
+                block = block.strip('\n')
+                if block.strip() and block not in sharedBlocks:
+                    sharedBlocks.append(block)
+
+        combined = '#ifndef %s\n#define %s\n\n' % (guardName, guardName)
+        for block in sharedBlocks:
+            combined += block + '\n\n'
+        for function in functions:
+            combined += function.strip('\n') + '\n\n'
+        combined += '#endif // %s\n' % guardName
+        return combined
+
+    def createMaterialXImplementation(self, sourceColorSpace, targetColorSpace, doc, definition, transformName, extension, target,
+                                      functionName = None, sourceName = None):
         '''
         Create a new implementation in a document for a given definition.
         @param sourceColorSpace: The source color space.
@@ -290,15 +1195,23 @@ class OCIOMaterialaxGenerator():
         @param transformName: The transform name.
         @param extension: The file extension.
         @param target: The target language.
+        @param functionName: Optional name of an existing transform function and source file to reference
+        instead of the ones named after transformName. Used for numerically identical transforms.
+        @param sourceName: Optional name of the source file if it differs from the function name.
+        Used for color3 functions which are in the source file of the color4 transform.
         '''
+        if not functionName:
+            functionName = transformName
+        if not sourceName:
+            sourceName = functionName
         implName = transformName + '_' + target
-        filename = transformName + '.' + extension
+        filename = sourceName + '.' + extension
         implName = implName.replace('mx_', 'IM_')
 
         # Check if implementation already exists
         impl = doc.getImplementation(implName)
         if impl:
-            print('Implementation already exists: %s' % implName)
+            self.log('Implementation already exists: %s' % implName)
             return impl
 
         comment = doc.addChildOfCategory('comment')
@@ -306,17 +1219,19 @@ class OCIOMaterialaxGenerator():
                             % (sourceColorSpace, targetColorSpace, target))
         impl = doc.addImplementation(implName)
         impl.setFile(filename)
-        impl.setFunction(transformName)
+        impl.setFunction(functionName)
         impl.setTarget(target)
         impl.setNodeDef(definition)
 
         return impl
 
     def generateOCIO(self, config, definitionDoc, implDoc, sourceColorSpace = 'acescg', targetColorSpace = 'lin_rec709',
-                    type='color4', IN_PIXEL_STRING = 'in'):
+                    type='color4', IN_PIXEL_STRING = 'in', sharedSourceColorSpace = None, targets = None, sources = None,
+                    nativeColor3 = True, textures = None):
         '''
         Generate a MaterialX definition and implementation for a given color space transform.    
         Returns the definition, implementation, source code, extension and target.
+        The GPU processor is created once and the code for each target language is extracted from it.
         @param config: The OCIO configuration.
         @param definitionDoc: The MaterialX document to add the definition to.
         @param implDoc: The MaterialX document to add the implementation to.
@@ -324,199 +1239,955 @@ class OCIOMaterialaxGenerator():
         @param targetColorSpace: The destination color space.
         @param type: The type of the transform.
         @param IN_PIXEL_STRING: The input pixel string.
-        @return: A tuple containing the definition, transform name, source code, extension        
+        @param sharedSourceColorSpace: Optional source color space of a numerically identical transform.
+        If specified the implementation references the function and source file of that transform
+        and the returned source code does not need to be written.
+        @param targets: Optional list of MaterialX targets to generate implementations for. See getTargetLanguages().
+        Default is ['genglsl'].
+        @param sources: Optional dictionary which is filled in with the [extension, source code] for each generated target.
+        @param nativeColor3: Whether the color3 variant uses a color3 function added to the source code. If False a
+        nodegraph which converts to and from color4 is used. Default is True.
+        @param textures: Optional dictionary to add the serialized texture files of the transform to, keyed by file name.
+        If specified, transforms which require texture resources are generated instead of skipped, and their implementations
+        declare the textures using addTextureInputs(). Textures are not supported for MSL and OSL targets.
+        @return: A tuple containing the definition, transform name, source code, extension and target
+        of the first generated target.
         '''
 
         # List of MaterialX target language, source code extensions, and OCIO GPU languages
-        generationList = [
-            ['genglsl', 'glsl', OCIO.GpuLanguage.GPU_LANGUAGE_GLSL_4_0]
-            #, ['genmsl', 'metal', OCIO.GpuLanguage.GPU_LANGUAGE_MSL_2_0]
-            ]
+        generationList = self.getTargetLanguages(targets if targets else ['genglsl'])
 
         definition = None
         transformName = self.createTransformName(sourceColorSpace, targetColorSpace, type)
+        shaderFunctionName = None
+        functionName = None
+        if sharedSourceColorSpace:
+            functionName = self.createTransformName(sharedSourceColorSpace, targetColorSpace, type)
+        color3Definition = None
+        color3TransformName = self.createTransformName(sourceColorSpace, targetColorSpace, 'color3') if nativeColor3 else None
+        color3FunctionName = None
+        if nativeColor3 and sharedSourceColorSpace:
+            color3FunctionName = self.createTransformName(sharedSourceColorSpace, targetColorSpace, 'color3')
+        result = ['', '', '']
+        transformTextures = [] if textures is not None else None
+
+        # The code for each target is extracted from the same cached GPU processor, or read from the on-disk
+        # cache without creating a processor. Texture resources are reported along with the code.
         for gen in generationList:
             target = gen[0]
             extension = gen[1]
             language = gen[2]
 
-            code, textureCount = self.generateShaderCode(config, sourceColorSpace, targetColorSpace, language)
+            # Texture resources are the same for all targets so are only requested once
+            code, textureCount = self.generateShaderCode(config, sourceColorSpace, targetColorSpace, language,
+                                                         transformTextures if not transformTextures else None)
 
             # Skip if there are texture resources
-            if textureCount:
-                print('- Skip generation for transform: "%s" to "%s" which requires %d texture resources' % (sourceColorSpace, targetColorSpace, textureCount))
+            if textureCount and transformTextures is None:
+                self.log('- Skip generation for transform: "%s" to "%s" which requires %d texture resources' % (sourceColorSpace, targetColorSpace, textureCount))
+                self.instrumentation.count('skippedTextureTransforms')
+                break
+            # OCIO passes MSL textures as function arguments and does not support textures for OSL
+            if textureCount and target in ['genmsl', 'genosl']:
+                self.log('- Skip target[%s] for transform: "%s" to "%s" which requires %d texture resources' % (target, sourceColorSpace, targetColorSpace, textureCount))
                 continue
 
             if code:
-                # Create the definition once
-                if not definition:
-                    # Create color4 variant
-                    definition = self.generateMaterialXDefinition(definitionDoc, sourceColorSpace, targetColorSpace, 
-                                                            IN_PIXEL_STRING, type)
-                    # Create color3 variant (nodegraph)
-                    self.createColor3Variant(definition, definitionDoc, IN_PIXEL_STRING)
+                if not shaderFunctionName:
+                    shaderFunctionName = self.getShaderFunctionName(transformName)
+                code = self.createMaterialXFunction(code, transformName, target, color3TransformName, shaderFunctionName)
+                with self.instrumentation.span('buildDocument', source=sourceColorSpace, destination=targetColorSpace, target=target):
+                    # Create the definition once
+                    if not definition:
+                        # Create color4 variant
+                        definition = self.generateMaterialXDefinition(definitionDoc, sourceColorSpace, targetColorSpace, 
+                                                                IN_PIXEL_STRING, type)
+                        # Create color3 variant (nodegraph if not native)
+                        color3Definition = self.createColor3Variant(definition, definitionDoc, IN_PIXEL_STRING, not nativeColor3)
+                        result = [code, extension, target]
                 
-                # Create the implementation
-                self.createMaterialXImplementation(sourceColorSpace, targetColorSpace, implDoc, definition, transformName, extension, target)
+                    # Create the implementation
+                    impls = [self.createMaterialXImplementation(sourceColorSpace, targetColorSpace, implDoc, definition, transformName, extension, target,
+                                                                functionName)]
+                    if nativeColor3:
+                        impls.append(self.createMaterialXImplementation(sourceColorSpace, targetColorSpace, implDoc, color3Definition, color3TransformName,
+                                                                        extension, target, color3FunctionName, functionName or transformName))
+                    if textureCount:
+                        implTextures = transformTextures
+                        if sharedSourceColorSpace:
+                            # OCIO derives the texture names from the sanitized function name, so the names used
+                            # by the shared function are taken from the shared transform
+                            implTextures = []
+                            self.generateShaderCode(config, sharedSourceColorSpace, targetColorSpace, language, implTextures)
+                        for impl in impls:
+                            self.addTextureInputs(impl, implTextures)
+                if sources is not None:
+                    sources[target] = [extension, code]
+
+        # The textures of a shared transform are written with its source code
+        if definition and transformTextures and not sharedSourceColorSpace:
+            with self.instrumentation.span('serializeTextures', source=sourceColorSpace, destination=targetColorSpace):
+                for texture in transformTextures:
+                    textures[texture['name'] + '.npy'] = self.serializeTexture(texture)
+            self.instrumentation.count('bakedTextureTransforms')
+
+        return definition, transformName, result[0], result[1], result[2]
 
-        return definition, transformName, code, extension, target     
-    
     def generateOCIOGraph(self, config, sourceColorSpace = 'acescg', targetColorSpace = 'lin_rec709',
-                          type='color3'):
+                          type='color3', optimize = True, maxLutError = None, maxLutDegree = 6, lutFitError = None,
+                          maxGraphError = 1e-4):
         '''
         Generate a MaterialX nodegraph for a given color space transform.
         @param config: The OCIO configuration.
         @param sourceColorSpace: The source color space.
         @param targetColorSpace: The destination color space.
         @param type: The type of the transform.
+        @param optimize: Whether to simplify the nodegraph using optimizeGraph(). Default is True.
+        @param maxLutError: Optional maximum error to approximate LUT1D transforms with closed-form curves.
+        See fitLut1D(). By default LUT1D transforms are not supported. If any LUT1D transform cannot be approximated,
+        or the whole graph is not within the maximum error of the OCIO CPU processor (see getGraphError()), no graph
+        is returned so that the caller can fall back to source code.
+        @param maxLutDegree: The maximum polynomial degree used to approximate LUT1D transforms. Default is 6.
+        @param lutFitError: The maximum error of each LUT1D approximation. By default the approximations are made
+        successively tighter than maxLutError until the whole graph is within maxLutError.
+        @param maxGraphError: The maximum error of the nodegraph against the OCIO CPU processor when maxLutError is not
+        given. Default is 1e-4. Transforms which cannot be represented, such as unsupported transform types, produce
+        graphs outside of this error and no graph is returned. Use None to skip the check.
         Returns a MaterialX document containing a functional nodegraph and nodedef pair.
         '''
-        groupTransform = self.generateTransformGraph(config, sourceColorSpace, targetColorSpace)
-
-        # To add. Proper testing of unsupported transforms...
-        invalidTransforms = [ OCIO.TransformType.TRANSFORM_TYPE_LUT3D, OCIO.TransformType.TRANSFORM_TYPE_LUT1D, 
-                              OCIO.TransformType.TRANSFORM_TYPE_GRADING_PRIMARY ]
+        transformOps = self.getTransformOps(config, sourceColorSpace, targetColorSpace)
+
+        hasLut1D = transformOps and transformOps['ops'] and \
+            any(op['type'] == 'TRANSFORM_TYPE_LUT1D' for op in transformOps['ops'])
+        if maxLutError is not None and lutFitError is None and hasLut1D:
+            # The error of each approximation is magnified by the transforms after it, so the
+            # approximations are tightened until the whole graph is within the maximum error.
+            lutFitError = maxLutError
+            for attempt in range(4):
+                graphDoc = self.generateOCIOGraph(config, sourceColorSpace, targetColorSpace, type, optimize,
+                                                  maxLutError, maxLutDegree, lutFitError, None)
+                if not graphDoc:
+                    return None
+                error = self.getGraphError(config, sourceColorSpace, targetColorSpace, graphDoc)
+                if error <= maxLutError:
+                    return graphDoc
+                self.log(f'- Graph error {error:g} exceeds {maxLutError:g} using LUT1D approximations within {lutFitError:g}')
+                lutFitError = lutFitError / 10.0
+            self.instrumentation.count('inaccurateGraphs')
+            return None
 
-        # Create a document, a nodedef and a functional graph.
-        graphDoc = mx.createDocument()
-        outputType = 'color3'
-        xformName = sourceColorSpace + '_to_' + targetColorSpace + '_' + outputType
+        with self.instrumentation.span('buildGraph', source=sourceColorSpace, destination=targetColorSpace):
+            # To add. Proper testing of unsupported transforms...
+            invalidTransforms = [ 'TRANSFORM_TYPE_LUT3D', 'TRANSFORM_TYPE_GRADING_PRIMARY' ]
+            if maxLutError is None:
+                invalidTransforms.append('TRANSFORM_TYPE_LUT1D')
+
+            # Create a document, a nodedef and a functional graph.
+            graphDoc = mx.createDocument()
+            outputType = 'color3'
+            xformName = self.createTransformCategory(sourceColorSpace, targetColorSpace, outputType)
+            graphName = self.createTransformName(sourceColorSpace, targetColorSpace, outputType, '')
         
-        nd = graphDoc.addNodeDef('ND_' + xformName )
-        nd.setAttribute('node', xformName)
-        ndInput = nd.addInput('in', 'color3')
-        ndInput.setValue([0.0, 0.0, 0.0], 'color3')
-        docString = f'Generated color space {sourceColorSpace} to {targetColorSpace} transform.'
-        result = f'{groupTransform}'
-        # Replace '<' and '>' with '()' and ')'
-        result = result.replace('<', '(')
-        result = result.replace('>', ')')
-        result = re.sub(r'[\r\n]+', '', result)
-
-        print(result)
-        docString = docString + '. OCIO Transforms: ' + result 
-        nd.setDocString(docString)
-
-        ng = graphDoc.addNodeGraph('NG_' + xformName)
-        ng.setAttribute('nodedef', nd.getName())
-        convertNode = ng.addNode('convert', 'asVec', 'vector3')
-        converInput = convertNode.addInput('in', 'color3')
-        converInput.setInterfaceName('in')
+            nd = graphDoc.addNodeDef('ND_' + graphName)
+            nd.setAttribute('node', xformName)
+            ndInput = nd.addInput('in', 'color3')
+            ndInput.setValue([0.0, 0.0, 0.0], 'color3')
+            docString = f'Generated color space {sourceColorSpace} to {targetColorSpace} transform.'
+            result = transformOps['text'] if transformOps else 'None'
+            # Replace '<' and '>' with '()' and ')'
+            result = result.replace('<', '(')
+            result = result.replace('>', ')')
+            result = re.sub(r'[\r\n]+', '', result)
+
+            self.log(result)
+            docString = docString + '. OCIO Transforms: ' + result 
+            nd.setDocString(docString)
+
+            ng = graphDoc.addNodeGraph('NG_' + graphName)
+            ng.setAttribute('nodedef', nd.getName())
+            convertNode = ng.addNode('convert', 'asVec', 'vector3')
+            converInput = convertNode.addInput('in', 'color3')
+            converInput.setInterfaceName('in')
+
+            #print(f'Transform from: {sourceColorSpace} to {targetColorSpace}')
+            if not transformOps or not transformOps['ops']:
+                #print(f'No group transform found for the color space transform: {sourceColorSpace} to {targetColorSpace}')
+                return None
+            #print(f'Number of transforms: {len(transformOps["ops"])}')
+            previousNode = None
+
+            # Iterate and create appropriate nodes and connections
+            for i, op in enumerate(transformOps['ops']):
+                # Get type of transform
+                transformType = op['type']
+                if transformType in invalidTransforms:
+                    self.log(f'- Transform[{i}]: TransformType.{transformType} contains an unsupported transform type')
+                    continue
+
+                #print(f'- Transform[{i}]: {transformType}')   
+                if transformType == 'TRANSFORM_TYPE_MATRIX':
+                    matrixNode = ng.addNode('transformmatrix', ng.createValidChildName(f'matrixTransform'), 'vector3')
+
+                    # Route output from previous node as input of current node
+                    inInput = matrixNode.addInput('in', 'vector3')
+                    if previousNode:            
+                        inInput.setAttribute('nodename', previousNode)
+                    else:
+                        #if i==0:
+                            inInput.setAttribute('nodename', 'asVec')
+                        #else:
+                        #    inInput.setValue([0.0, 0.0, 0.0], 'vector3')
+
+                    # Set matrix value
+                    matInput = matrixNode.addInput('mat', 'matrix33')
+                    matrixValue = op['matrix']
+                    # Extract 3x3 matrix from 4x4 matrix. OCIO multiplies column vectors while MaterialX
+                    # multiplies row vectors so the matrix is transposed.
+                    matrixValue = [matrixValue[row * 4 + column] for column in range(3) for row in range(3)]
+                    matrixValue = ', '.join([str(x) for x in matrixValue])
+                    #print('  - Matrix:', matrixValue)
+                    matInput.setAttribute('value', matrixValue)        
+
+                    previousNode = matrixNode.getName()
+
+                    # Add offset value
+                    offsetValue = op['offset'][0:3]
+                    if any(offsetValue):
+                        offsetNode = ng.addNode('add', ng.createValidChildName(f'offset'), 'vector3')
+                        offsetInput = offsetNode.addInput('in1', 'vector3')
+                        offsetInput.setNodeName(previousNode)
+                        offsetInput2 = offsetNode.addInput('in2', 'vector3')
+                        offsetInput2.setValue(offsetValue, 'vector3')
+                        previousNode = offsetNode.getName()
+            
+                elif transformType in ['TRANSFORM_TYPE_EXPONENT', 'TRANSFORM_TYPE_EXPONENT_WITH_LINEAR']:
+                    if transformType == 'TRANSFORM_TYPE_EXPONENT':
+                        exponentNode = self.addExponentNodes(ng, previousNode if previousNode else 'asVec', op)
+                    else:
+                        exponentNode = self.addMonCurveNodes(ng, previousNode if previousNode else 'asVec', op)
+                    if not exponentNode:
+                        # Omitting the exponent would produce an incorrect graph
+                        self.log(f'- Transform[{i}]: TransformType.{transformType} is not supported with negative style {op.get("negativeStyle")} and its parameters. No graph is generated.')
+                        return None
+                    previousNode = exponentNode
+
+                elif transformType == 'TRANSFORM_TYPE_RANGE':
+                    previousNode = self.addRangeNodes(ng, previousNode if previousNode else 'asVec', op)
+
+                elif transformType == 'TRANSFORM_TYPE_LUT1D':
+                    fit = self.getLut1DFit(config, sourceColorSpace, targetColorSpace, i,
+                                           lutFitError if lutFitError is not None else maxLutError, maxLutDegree)
+                    if not fit:
+                        # Omitting the LUT would produce an incorrect graph
+                        self.log(f'- Transform[{i}]: TransformType.{transformType} could not be approximated within error {maxLutError}. No graph is generated.')
+                        return None
+                    self.log(f'- Transform[{i}]: TransformType.{transformType} approximated using {fit["form"]} of degree {fit["degree"]} with error {fit["error"]:g}')
+                    previousNode = self.addLut1DFitNodes(ng, previousNode if previousNode else 'asVec', fit)
+
+                else:
+                    self.log(f'- Transform[{i}]: TransformType.{transformType} support has not been implemented yet')
+                    continue
+
+
+            # Create an output for the last node if any
+            convertNode2 = ng.addNode('convert', 'asColor', 'color3')
+            converInput2 = convertNode2.addInput('in', 'vector3')
+            if previousNode:
+                converInput2.setAttribute('nodename', previousNode)
+            else:
+                # Pass-through
+                #print('No transforms applied. Transform is a pass-through.')
+                converInput2.setAttribute('nodename', 'asVec')
+
+            out = ng.addOutput(ng.createValidChildName('out'), 'color3')
+            out.setAttribute('nodename', 'asColor')
 
-        #print(f'Transform from: {sourceColorSpace} to {targetColorSpace}')
-        if not groupTransform:
-            #print(f'No group transform found for the color space transform: {sourceColorSpace} to {targetColorSpace}')
+            if optimize:
+                self.optimizeGraph(ng)
+
+        maxError = maxLutError if maxLutError is not None else maxGraphError
+        if maxError is not None and not self.isGraphAccurate(config, sourceColorSpace, targetColorSpace, graphDoc, maxError):
             return None
-        #print(f'Number of transforms: {groupTransform.__len__()}')
-        previousNode = None
+        return graphDoc
 
-        # Iterate and create appropriate nodes and connections
-        for i in range(groupTransform.__len__()):
-            transform = groupTransform.__getitem__(i)
-            # Get type of transform
-            transformType = transform.getTransformType()
-            if transformType in invalidTransforms:
-                print(f'- Transform[{i}]: {transformType} contains an unsupported transform type')
-                continue
+    def isGraphAccurate(self, config, sourceColorSpace, destColorSpace, graphDoc, maxError):
+        '''
+        Check whether a nodegraph created by generateOCIOGraph() is within a maximum error of the OCIO CPU processor.
+        See getGraphError(). The check requires NumPy. If NumPy is not installed the graph is not checked.
+        @param config: The OCIO configuration.
+        @param sourceColorSpace: The source color space.
+        @param destColorSpace: The destination color space.
+        @param graphDoc: The MaterialX document containing the nodegraph.
+        @param maxError: The maximum error.
+        @return: False if the error of the graph exceeds the maximum error, True otherwise.
+        '''
+        if not np.isAvailable():
+            self.log(f'- Graph for transform: "{sourceColorSpace}" to "{destColorSpace}" is not checked as NumPy is not installed')
+            self.instrumentation.count('uncheckedGraphs')
+            return True
+        error = self.getGraphError(config, sourceColorSpace, destColorSpace, graphDoc)
+        if error > maxError:
+            self.log(f'- Graph error {error:g} exceeds {maxError:g} for transform: "{sourceColorSpace}" to "{destColorSpace}". No graph is generated.')
+            self.instrumentation.count('inaccurateGraphs')
+            return False
+        return True
+
+    def addGraphNode(self, nodeGraph, category, name, inputs, type = 'vector3'):
+        '''
+        Add a node to a nodegraph.
+        @param nodeGraph: The MaterialX nodegraph.
+        @param category: The node category.
+        @param name: The name of the node. A unique name is created from it.
+        @param inputs: A list of (input name, value) pairs. A value is either the name of the upstream node, a tuple of the
+        name of the upstream node and its output, a list of three values or a single value.
+        @param type: The type of the node and its inputs. Default is 'vector3'.
+        @return: The name of the node.
+        '''
+        node = nodeGraph.addNode(category, nodeGraph.createValidChildName(name), type)
+        for inputName, value in inputs:
+            input = node.addInput(inputName, type)
+            if isinstance(value, str):
+                input.setNodeName(value)
+            elif isinstance(value, tuple):
+                input.setNodeName(value[0])
+                input.setOutputString(value[1])
+            elif type == 'float':
+                input.setValueString(str(value))
+            else:
+                input.setValueString(', '.join([str(x) for x in (value if isinstance(value, list) else [value] * 3)]))
+        return node.getName()
 
-            #print(f'- Transform[{i}]: {transformType}')   
-            if transformType == OCIO.TransformType.TRANSFORM_TYPE_MATRIX:
-                matrixNode = ng.addNode('transform', ng.createValidChildName(f'matrixTransform'), 'vector3')
+    def addSelectNodes(self, nodeGraph, inputNode, threshold, aboveNode, belowNode):
+        '''
+        Add the nodes which select per channel between two vector3 nodes, depending on whether each channel of
+        an input is greater than a threshold. MaterialX conditional nodes compare floats, so the channels are
+        separated and combined.
+        @param nodeGraph: The MaterialX nodegraph.
+        @param inputNode: The name of the vector3 node to compare.
+        @param threshold: A list of the threshold of each channel.
+        @param aboveNode: The name of the vector3 node to use for channels greater than the threshold.
+        @param belowNode: The name of the vector3 node to use for other channels.
+        @return: The name of the last node added.
+        '''
+        separated = [nodeGraph.addNode('separate3', nodeGraph.createValidChildName(name), 'multioutput')
+                     for name in ['selectIn', 'selectAbove', 'selectBelow']]
+        for node, upstream in zip(separated, [inputNode, aboveNode, belowNode]):
+            node.addInput('in', 'vector3').setNodeName(upstream)
+        channels = []
+        for channel, output in enumerate(['outx', 'outy', 'outz']):
+            channels.append(self.addGraphNode(nodeGraph, 'ifgreater', 'select', [
+                ('value1', (separated[0].getName(), output)), ('value2', threshold[channel]),
+                ('in1', (separated[1].getName(), output)), ('in2', (separated[2].getName(), output))], 'float'))
+        combineNode = nodeGraph.addNode('combine3', nodeGraph.createValidChildName('select'), 'vector3')
+        for channel, upstream in enumerate(channels):
+            combineNode.addInput('in%d' % (channel + 1), 'float').setNodeName(upstream)
+        return combineNode.getName()
+
+    def addExponentNodes(self, nodeGraph, inputNode, op):
+        '''
+        Add the nodes for an exponent transform to a nodegraph. Negative values are clamped to zero, mirrored
+        or passed through depending on the negative style.
+        @param nodeGraph: The MaterialX nodegraph.
+        @param inputNode: The name of the vector3 node to transform.
+        @param op: The exponent transform operation returned from getTransformOps().
+        @return: The name of the last node added, or None if the negative style is not supported.
+        '''
+        value = op['value'][0:3]
+        if op['direction'] == 'TRANSFORM_DIR_INVERSE':
+            if not all(value):
+                return None
+            value = [1.0 / x for x in value]
+
+        style = op.get('negativeStyle', 'NEGATIVE_CLAMP')
+        if style == 'NEGATIVE_CLAMP':
+            previousNode = self.addGraphNode(nodeGraph, 'max', 'clampLow', [('in1', inputNode), ('in2', 0.0)])
+            return self.addGraphNode(nodeGraph, 'power', 'exponent', [('in1', previousNode), ('in2', value)])
+        if style == 'NEGATIVE_MIRROR':
+            previousNode = self.addGraphNode(nodeGraph, 'absval', 'mirror', [('in', inputNode)])
+            previousNode = self.addGraphNode(nodeGraph, 'power', 'exponent', [('in1', previousNode), ('in2', value)])
+            signNode = self.addGraphNode(nodeGraph, 'sign', 'mirror', [('in', inputNode)])
+            return self.addGraphNode(nodeGraph, 'multiply', 'mirror', [('in1', previousNode), ('in2', signNode)])
+        if style == 'NEGATIVE_PASS_THRU':
+            previousNode = self.addGraphNode(nodeGraph, 'max', 'clampLow', [('in1', inputNode), ('in2', 0.0)])
+            previousNode = self.addGraphNode(nodeGraph, 'power', 'exponent', [('in1', previousNode), ('in2', value)])
+            return self.addSelectNodes(nodeGraph, inputNode, [0.0] * 3, previousNode, inputNode)
+        return None
+
+    def addMonCurveNodes(self, nodeGraph, inputNode, op):
+        '''
+        Add the nodes for an exponent with linear transform to a nodegraph. The transform is a power curve with
+        a linear segment below a break point, which are evaluated separately and selected between using addSelectNodes().
+        The forward direction converts from the encoded to the linear values.
+        @param nodeGraph: The MaterialX nodegraph.
+        @param inputNode: The name of the vector3 node to transform.
+        @param op: The exponent with linear transform operation returned from getTransformOps().
+        @return: The name of the last node added, or None if the parameters or negative style are not supported.
+        '''
+        gamma = op['gamma'][0:3]
+        offset = op['offset'][0:3]
+        style = op.get('negativeStyle', 'NEGATIVE_LINEAR')
+        if style not in ['NEGATIVE_LINEAR', 'NEGATIVE_MIRROR'] or any(g <= 1.0 for g in gamma) or any(o <= 0.0 for o in offset):
+            return None
 
-                # Route output from previous node as input of current node
-                inInput = matrixNode.addInput('in', 'vector3')
-                if previousNode:            
-                    inInput.setAttribute('nodename', previousNode)
-                else:
-                    #if i==0:
-                        inInput.setAttribute('nodename', 'asVec')
-                    #else:
-                    #    inInput.setValue([0.0, 0.0, 0.0], 'vector3')
-
-                # Set matrix value
-                matInput = matrixNode.addInput('mat', 'matrix33')
-                matrixValue = transform.getMatrix()
-                # Extract 3x3 matrix from 4x4 matrix
-                matrixValue = matrixValue[0:3] + matrixValue[4:7] + matrixValue[8:11]
-                matrixValue = ', '.join([str(x) for x in matrixValue])
-                #print('  - Matrix:', matrixValue)
-                matInput.setAttribute('value', matrixValue)        
-
-                # Add offset value - TODO
-                offsetValue = transform.getOffset()
-                offsetValue = ', '.join([str(x) for x in offsetValue])
-                #print('  - Offset:', offsetValue)
-                # Add a add vector3 to graph
-
-                previousNode = matrixNode.getName()
-            
-            # TODO: Handle other transform types
-            elif transformType == OCIO.TransformType.TRANSFORM_TYPE_EXPONENT or transformType == OCIO.TransformType.TRANSFORM_TYPE_EXPONENT_WITH_LINEAR:
+        # The linear segment meets the power curve at the break point with the same slope
+        breakPoint = [o / (g - 1.0) for g, o in zip(gamma, offset)]
+        slope = [((b + o) / (1.0 + o)) ** g / b for b, g, o in zip(breakPoint, gamma, offset)]
+
+        curveInput = inputNode
+        if style == 'NEGATIVE_MIRROR':
+            curveInput = self.addGraphNode(nodeGraph, 'absval', 'mirror', [('in', inputNode)])
+        if op['direction'] == 'TRANSFORM_DIR_INVERSE':
+            previousNode = self.addGraphNode(nodeGraph, 'max', 'clampLow', [('in1', curveInput), ('in2', 0.0)])
+            previousNode = self.addGraphNode(nodeGraph, 'power', 'exponent', [('in1', previousNode), ('in2', [1.0 / g for g in gamma])])
+            previousNode = self.addGraphNode(nodeGraph, 'multiply', 'scale', [('in1', previousNode), ('in2', [1.0 + o for o in offset])])
+            curveNode = self.addGraphNode(nodeGraph, 'subtract', 'offset', [('in1', previousNode), ('in2', offset)])
+            linearNode = self.addGraphNode(nodeGraph, 'multiply', 'linear', [('in1', curveInput), ('in2', [1.0 / x for x in slope])])
+            breakPoint = [b * x for b, x in zip(breakPoint, slope)]
+        else:
+            previousNode = self.addGraphNode(nodeGraph, 'multiply', 'scale', [('in1', curveInput), ('in2', [1.0 / (1.0 + o) for o in offset])])
+            previousNode = self.addGraphNode(nodeGraph, 'add', 'offset', [('in1', previousNode), ('in2', [o / (1.0 + o) for o in offset])])
+            previousNode = self.addGraphNode(nodeGraph, 'max', 'clampLow', [('in1', previousNode), ('in2', 0.0)])
+            curveNode = self.addGraphNode(nodeGraph, 'power', 'exponent', [('in1', previousNode), ('in2', gamma)])
+            linearNode = self.addGraphNode(nodeGraph, 'multiply', 'linear', [('in1', curveInput), ('in2', slope)])
+        previousNode = self.addSelectNodes(nodeGraph, curveInput, breakPoint, curveNode, linearNode)
+
+        if style == 'NEGATIVE_MIRROR':
+            signNode = self.addGraphNode(nodeGraph, 'sign', 'mirror', [('in', inputNode)])
+            previousNode = self.addGraphNode(nodeGraph, 'multiply', 'mirror', [('in1', previousNode), ('in2', signNode)])
+        return previousNode
+
+    def addRangeNodes(self, nodeGraph, inputNode, op):
+        '''
+        Add the nodes for a range transform to a nodegraph. The input is scaled and offset to map the input range
+        to the output range, and clamped to the output range unless the range style does not clamp.
+        @param nodeGraph: The MaterialX nodegraph.
+        @param inputNode: The name of the vector3 node to transform.
+        @param op: The range transform operation returned from getTransformOps().
+        @return: The name of the last node added, or inputNode if no nodes are required.
+        '''
+        scale = 1.0
+        offset = 0.0
+        if op['minIn'] is not None and op['maxIn'] is not None and op['minOut'] is not None and op['maxOut'] is not None:
+            scale = (op['maxOut'] - op['minOut']) / (op['maxIn'] - op['minIn'])
+            offset = op['minOut'] - scale * op['minIn']
+        elif op['minIn'] is not None and op['minOut'] is not None:
+            offset = op['minOut'] - op['minIn']
+        elif op['maxIn'] is not None and op['maxOut'] is not None:
+            offset = op['maxOut'] - op['maxIn']
+
+        stages = []
+        if scale != 1.0:
+            stages.append(['multiply', 'scale', scale])
+        if offset != 0.0:
+            stages.append(['add', 'offset', offset])
+        if op['style'] != 'RANGE_NO_CLAMP':
+            if op['minOut'] is not None:
+                stages.append(['max', 'clampLow', op['minOut']])
+            if op['maxOut'] is not None:
+                stages.append(['min', 'clampHigh', op['maxOut']])
+
+        previousNode = inputNode
+        for category, name, value in stages:
+            node = nodeGraph.addNode(category, nodeGraph.createValidChildName(name), 'vector3')
+            node.addInput('in1', 'vector3').setNodeName(previousNode)
+            node.addInput('in2', 'vector3').setValue([value] * 3, 'vector3')
+            previousNode = node.getName()
+        return previousNode
+
+    def fitLut1D(self, lut, domain, maxError, maxDegree = 6, sampleCount = 65537):
+        '''
+        Approximate a LUT1D transform with a closed-form curve per channel. The following forms are tried with increasing
+        polynomial degree, and the first form within the maximum error is returned:
+        - 'polynomial': y = P(u)
+        - 'exp2': y = 2^P(u)
+        - 'log2': y = P(u) where u is computed from log2(max(x, minimum)) instead of x.
+        The polynomial P is evaluated on u = x * scale + offset, which maps the fitted domain to [-1, 1].
+        The error is measured against the OCIO CPU processor of the LUT on a dense sample of the domain, or on all
+        half float values within the domain for LUTs with a half float input domain. The error of each value is
+        the absolute difference, relative to the expected value if its magnitude is greater than 1.
+        @param lut: The OCIO Lut1DTransform.
+        @param domain: The [minimum, maximum] input values to fit. Input values are clamped to the domain.
+        @param maxError: The maximum allowed error.
+        @param maxDegree: The maximum polynomial degree to try. Default is 6.
+        @param sampleCount: The number of uniformly spaced input values used for LUTs without a half float input domain.
+        Default is 65537.
+        @return: A dictionary with the 'form', 'degree', 'domain', 'minimum' value for the log2 form, 'scale', 'offset',
+        the polynomial 'coefficients' of each channel from the constant term upwards, and the measured 'error'.
+        None is returned if no form is within the maximum error, if NumPy is not available, or if the LUT cannot
+        be approximated per channel.
+        '''
+        if not np.isAvailable():
+            self.log('NumPy is required to approximate LUT1D transforms')
+            return None
+        if lut.getHueAdjust() != OCIO.Lut1DHueAdjust.HUE_NONE or lut.getDirection() != OCIO.TransformDirection.TRANSFORM_DIR_FORWARD:
+            return None
+
+        if lut.getInputHalfDomain():
+            x = np.arange(65536, dtype=np.uint16).view(np.float16).astype(np.float64)
+            x = np.unique(x[np.isfinite(x) & (x >= domain[0]) & (x <= domain[1])])
+        else:
+            x = np.linspace(domain[0], domain[1], sampleCount)
+        if x.size < 2:
+            return None
 
-                hasOffset = (transformType == OCIO.TransformType.TRANSFORM_TYPE_EXPONENT_WITH_LINEAR)
+        # Evaluate the LUT using the CPU processor
+        values = np.ascontiguousarray(np.repeat(x[:, np.newaxis], 3, axis=1), dtype=np.float32)
+        OCIO.Config.CreateRaw().getProcessor(lut).getDefaultCPUProcessor().applyRGB(values)
+        y = values.astype(np.float64)
+        if not np.all(np.isfinite(y)):
+            return None
+        errorScale = np.maximum(np.abs(y), 1.0)
 
-                #print(f'- Transform[{i}]: {transformType} support has not been implemented yet')
-                exponentNode = ng.addNode('power', ng.createValidChildName(f'exponent'), 'vector3')
-                exponentInput = exponentNode.addInput('in1', 'vector3')
-                if previousNode:
-                    exponentInput.setAttribute('nodename', previousNode)
-                else:
-                    if i==0:
-                        exponentInput.setAttribute('nodename', 'asVec')
+        positive = x[x > 0]
+        minimum = float(positive.min()) if positive.size else None
+        t = { 'polynomial': x, 'exp2': x, 'log2': np.log2(np.maximum(x, minimum)) if minimum else None }
+
+        for degree in range(1, maxDegree + 1):
+            for form in ['polynomial', 'exp2', 'log2']:
+                if t[form] is None:
+                    continue
+                coefficients = []
+                result = np.empty_like(y)
+                for channel in range(3):
+                    target = y[:, channel]
+                    if form == 'exp2':
+                        # Fit log2(y), weighting by the derivative of 2^P so the absolute error is minimized
+                        valid = target > 0
+                        if np.count_nonzero(valid) <= degree:
+                            break
+                        weights = np.minimum(target[valid], errorScale[valid, channel])
+                        fit = np.polynomial.Polynomial.fit(t[form][valid], np.log2(target[valid]), degree, w=weights)
                     else:
-                        exponentInput.setValue([0.0, 0.0, 0.0], 'vector3')
+                        fit = np.polynomial.Polynomial.fit(t[form], target, degree, w=1.0 / errorScale[:, channel])
+                    # Use the same mapping to [-1, 1] for all channels
+                    fit = fit.convert(domain=fit.domain if channel == 0 else mapDomain, window=[-1, 1])
+                    mapDomain = fit.domain
+                    coef = np.pad(fit.coef, (0, degree + 1 - len(fit.coef)))
+                    coefficients.append([float(c) for c in coef])
+                    offset, scale = np.polynomial.polyutils.mapparms(mapDomain, [-1, 1])
+                    p = np.polynomial.polynomial.polyval(t[form] * scale + offset, coef)
+                    result[:, channel] = np.exp2(p) if form == 'exp2' else p
+                else:
+                    error = float(np.max(np.abs(result - y) / errorScale))
+                    if error <= maxError:
+                        offset, scale = np.polynomial.polyutils.mapparms(mapDomain, [-1, 1])
+                        return { 'form': form, 'degree': degree, 'domain': [float(domain[0]), float(domain[1])],
+                                 'minimum': minimum if form == 'log2' else None, 'scale': float(scale), 'offset': float(offset),
+                                 'coefficients': coefficients, 'error': error }
+        return None
+
+    def getLut1DFit(self, config, sourceColorSpace, destColorSpace, index, maxError, maxDegree = 6):
+        '''
+        Approximate a LUT1D transform of a color space transform using fitLut1D(). The fitted domain is the output
+        range of a directly preceding range transform if there is one, and [0, 1] otherwise. LUTs with a half float input
+        domain without a preceding range transform are fitted over [-65504, 65504]. The result is stored in the on-disk cache
+        if there is one.
+        @param config: The OCIO configuration.
+        @param sourceColorSpace: The source color space.
+        @param destColorSpace: The destination color space.
+        @param index: The index of the LUT1D transform in the operations returned from getTransformOps().
+        @param maxError: The maximum allowed error.
+        @param maxDegree: The maximum polynomial degree to try. Default is 6.
+        @return: The fit returned from fitLut1D(), or None if the LUT cannot be approximated.
+        '''
+        transformOps = self.getTransformOps(config, sourceColorSpace, destColorSpace)
+        if not transformOps:
+            return None
+        cacheKey = None
+        if self.diskCache:
+            cacheKey = self.diskCache.getKey('lut1DFit', OCIO.GetVersion(), config.getCacheID(), sourceColorSpace, destColorSpace,
+                                             index, maxError, maxDegree)
+            cached = self.getDiskCacheValue(cacheKey)
+            if cached is not None:
+                return cached['fit']
+
+        op = transformOps['ops'][index]
+        domain = [-65504.0, 65504.0] if op['inputHalfDomain'] else [0.0, 1.0]
+        previous = transformOps['ops'][index - 1] if index > 0 else None
+        if previous and previous['type'] == 'TRANSFORM_TYPE_RANGE' and previous['style'] != 'RANGE_NO_CLAMP':
+            if previous['minOut'] is not None:
+                domain[0] = max(domain[0], previous['minOut'])
+            if previous['maxOut'] is not None:
+                domain[1] = min(domain[1], previous['maxOut'])
+
+        with self.instrumentation.span('fitLut1D', source=sourceColorSpace, destination=destColorSpace):
+            groupTransform = self.generateTransformGraph(config, sourceColorSpace, destColorSpace)
+            fit = self.fitLut1D(groupTransform[index], domain, maxError, maxDegree)
+        self.instrumentation.count('fittedLut1DTransforms' if fit else 'unfittedLut1DTransforms')
+        if cacheKey:
+            self.diskCache.put(cacheKey, { 'fit': fit })
+        return fit
+
+    def getGraphCheckValues(self):
+        '''
+        Get the colors used to compare a nodegraph with the OCIO CPU processor: a dense gray ramp over [-0.5, 2]
+        and a 17x17x17 grid of colors over [-0.125, 1.125].
+        @return: An (N,3) float32 NumPy array.
+        '''
+        ramp = np.linspace(-0.5, 2.0, 8193, dtype=np.float32)
+        steps = np.linspace(-0.125, 1.125, 17, dtype=np.float32)
+        grid = np.stack(np.meshgrid(steps, steps, steps, indexing='ij'), axis=-1).reshape(-1, 3)
+        return np.ascontiguousarray(np.concatenate([np.repeat(ramp[:, np.newaxis], 3, axis=1), grid]), dtype=np.float32)
 
-                exponentInput2 = exponentNode.addInput('in2', 'vector3')
-                exponentInput2Value = None
-                if not hasOffset:
-                    exponentInput2Value = transform.getValue()
+    def getGraphError(self, config, sourceColorSpace, destColorSpace, graphDoc, values = None, nodeGraph = None):
+        '''
+        Measure the error of a nodegraph created by generateOCIOGraph() against the OCIO CPU processor of the transform.
+        The error of each value is the absolute difference, relative to the expected value if its magnitude is greater than 1,
+        as in fitLut1D(). Values for which the CPU processor does not return a finite result are ignored.
+        @param config: The OCIO configuration.
+        @param sourceColorSpace: The source color space.
+        @param destColorSpace: The destination color space.
+        @param graphDoc: The MaterialX document containing the nodegraph.
+        @param values: Optional (N,3) float32 NumPy array of colors to compare. Default is getGraphCheckValues().
+        @param nodeGraph: Optional nodegraph in the document to measure. Default is the first nodegraph of the document.
+        @return: The maximum error, or infinity if the graph does not produce a finite result where the CPU processor does.
+        '''
+        try:
+            from . import evaluator as mxevaluator
+        except ImportError:
+            import evaluator as mxevaluator
+
+        values = self.getGraphCheckValues() if values is None else values
+        expected = self.applyTransform(config, sourceColorSpace, destColorSpace, values, inPlace=False, threads=1)
+        with self.instrumentation.span('checkGraph', source=sourceColorSpace, destination=destColorSpace):
+            result = mxevaluator.GraphEvaluator(graphDoc).evaluate(nodeGraph or graphDoc.getNodeGraphs()[0], values)
+        valid = np.all(np.isfinite(expected), axis=1)
+        if not valid.any():
+            return 0.0
+        expected = expected[valid].astype(np.float64)
+        result = np.asarray(result, dtype=np.float64)[valid]
+        if not np.all(np.isfinite(result)):
+            return float('inf')
+        return float(np.max(np.abs(result - expected) / np.maximum(np.abs(expected), 1.0)))
+
+    def addLut1DFitNodes(self, nodeGraph, inputNode, fit):
+        '''
+        Add the nodes which evaluate a LUT1D approximation returned from fitLut1D() to a nodegraph.
+        The polynomial is evaluated using Horner's method.
+        @param nodeGraph: The MaterialX nodegraph.
+        @param inputNode: The name of the vector3 node to transform.
+        @param fit: The LUT1D approximation.
+        @return: The name of the last node added.
+        '''
+        def addNode(category, name, inputs):
+            node = nodeGraph.addNode(category, nodeGraph.createValidChildName(name), 'vector3')
+            for inputName, value in inputs:
+                input = node.addInput(inputName, 'vector3')
+                if isinstance(value, str):
+                    input.setNodeName(value)
                 else:
-                    exponentInput2Value = transform.getGamma()
-                # Only want the first 3 values in the array
-                exponentInput2Value = exponentInput2Value[0:3]
-                exponentInput2.setValue(exponentInput2Value, 'float')
-
-                previousNode = exponentNode.getName()
-
-                if hasOffset:
-                    # Add offset
-                    offsetNode = ng.addNode('add', ng.createValidChildName(f'offset'), 'vector3')
-                    offsetInput2 = offsetNode.addInput('in2', 'vector3')
-                    offsetInput2.setNodeName(exponentNode.getName())
-                    offsetInput = offsetNode.addInput('in1', 'vector3')
-                    offsetValue = transform.getOffset()
-                    # Only want the first 3 values in the array
-                    offsetValue = offsetValue[0:3]
-                    offsetInput.setValue(offsetValue, 'vector3')
-
-                    previousNode = offsetNode.getName()
+                    # Keep full precision as the fit is sensitive to rounding of the coefficients
+                    input.setValueString(', '.join([str(x) for x in (value if isinstance(value, list) else [value] * 3)]))
+            return node.getName()
+
+        # LUTs clamp their input to the domain
+        previousNode = addNode('clamp', 'lutDomain', [('in', inputNode), ('low', fit['domain'][0]), ('high', fit['domain'][1])])
+        scale = fit['scale']
+        if fit['form'] == 'log2':
+            previousNode = addNode('max', 'lutMinimum', [('in1', previousNode), ('in2', fit['minimum'])])
+            previousNode = addNode('ln', 'lutLog', [('in', previousNode)])
+            scale = scale / math.log(2.0)
+        previousNode = addNode('multiply', 'lutScale', [('in1', previousNode), ('in2', scale)])
+        variable = addNode('add', 'lutOffset', [('in1', previousNode), ('in2', fit['offset'])])
+
+        degree = fit['degree']
+        coefficients = fit['coefficients']
+        previousNode = addNode('multiply', 'lutHorner', [('in1', variable), ('in2', [c[degree] for c in coefficients])])
+        for power in range(degree - 1, -1, -1):
+            previousNode = addNode('add', 'lutHorner', [('in1', previousNode), ('in2', [c[power] for c in coefficients])])
+            if power > 0:
+                previousNode = addNode('multiply', 'lutHorner', [('in1', previousNode), ('in2', variable)])
+
+        if fit['form'] == 'exp2':
+            previousNode = addNode('power', 'lutExp', [('in1', 2.0), ('in2', previousNode)])
+        return previousNode
+
+    def getGraphStages(self, nodeGraph):
+        '''
+        Get the chain of operations of a nodegraph created by generateOCIOGraph().
+        @param nodeGraph: The MaterialX nodegraph.
+        @return: A list of [operation, values] stages in evaluation order, where operation is one of
+        'matrix' (a row-major 3x3 matrix applied to row vectors), 'add', 'multiply', 'power', 'max' or 'min'.
+        None is returned if the graph is not a single chain of supported nodes with constant parameters.
+        '''
+        outputs = nodeGraph.getOutputs()
+        if len(outputs) != 1:
+            return None
 
+        # Number of downstream connections per node
+        connections = {}
+        for element in nodeGraph.getNodes() + outputs:
+            for input in element.getInputs() if element.isA(mx.Node) else [element]:
+                if input.getNodeName():
+                    connections[input.getNodeName()] = connections.get(input.getNodeName(), 0) + 1
+
+        stages = []
+        element = outputs[0]
+        while True:
+            if element.isA(mx.Node):
+                if connections.get(element.getName(), 0) != 1:
+                    return None
+                category = element.getCategory()
+                if category in ['convert', 'dot']:
+                    upstream = element.getInput('in')
+                elif category in ['transformmatrix', 'add', 'multiply', 'power', 'max', 'min']:
+                    parameterName = 'mat' if category == 'transformmatrix' else 'in2'
+                    upstream = element.getInput('in' if category == 'transformmatrix' else 'in1')
+                    parameter = element.getInput(parameterName)
+                    if category in ['add', 'multiply', 'max', 'min'] and upstream and parameter and parameter.getNodeName():
+                        # Either operand may be connected upstream
+                        upstream, parameter = parameter, upstream
+                    if not parameter or parameter.getNodeName() or parameter.getInterfaceName() or not parameter.getValueString():
+                        return None
+                    if category == 'transformmatrix' and parameter.getType() != 'matrix33':
+                        return None
+                    values = [float(x) for x in parameter.getValueString().split(',')]
+                    if category != 'transformmatrix':
+                        values = (values * 3)[0:3] if len(values) == 1 else values[0:3]
+                    stages.insert(0, ['matrix' if category == 'transformmatrix' else category, values])
+                else:
+                    return None
             else:
-                print(f'- Transform[{i}]: {transformType} support has not been implemented yet')
-                continue
+                upstream = element
+
+            if not upstream:
+                return None
+            if upstream.getInterfaceName():
+                return stages
+            if not upstream.getNodeName():
+                return None
+            element = nodeGraph.getNode(upstream.getNodeName())
+            if not element:
+                return None
+
+    def optimizeGraphStages(self, stages, tolerance = 1e-10):
+        '''
+        Simplify a chain of graph stages as returned from getGraphStages().
+        Adjacent matrix, scale and offset stages are folded into a single affine transform (a matrix
+        followed by an offset), identity matrices, zero offsets and unit exponents are removed,
+        and diagonal matrices are replaced by a scale. Exponents and clamps ('max' and 'min') are kept in place.
+        @param stages: The list of [operation, values] stages.
+        @param tolerance: The tolerance used to detect identity matrices, zero offsets and unit exponents.
+        @return: The simplified list of stages.
+        '''
+        identity = [1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0]
 
+        def multiplyMatrix(a, b):
+            return [sum(a[row * 3 + k] * b[k * 3 + column] for k in range(3)) for row in range(3) for column in range(3)]
 
-        # Create an output for the last node if any
-        convertNode2 = ng.addNode('convert', 'asColor', 'color3')
-        converInput2 = convertNode2.addInput('in', 'vector3')
-        if previousNode:
-            converInput2.setAttribute('nodename', previousNode)
-        else:
+        def transformVector(v, m):
+            return [sum(v[k] * m[k * 3 + column] for k in range(3)) for column in range(3)]
+
+        def isClose(values, reference):
+            return all(abs(value - expected) <= tolerance for value, expected in zip(values, reference))
+
+        result = []
+        matrix = identity
+        offset = [0.0, 0.0, 0.0]
+
+        def flushAffine():
+            if not isClose(matrix, identity):
+                if isClose([matrix[1], matrix[2], matrix[3], matrix[5], matrix[6], matrix[7]], [0.0] * 6):
+                    result.append(['multiply', [matrix[0], matrix[4], matrix[8]]])
+                else:
+                    result.append(['matrix', matrix])
+            if not isClose(offset, [0.0, 0.0, 0.0]):
+                result.append(['add', offset])
+
+        for operation, values in stages:
+            if operation == 'matrix':
+                matrix = multiplyMatrix(matrix, values)
+                offset = transformVector(offset, values)
+            elif operation == 'multiply':
+                scale = [values[0], 0.0, 0.0, 0.0, values[1], 0.0, 0.0, 0.0, values[2]]
+                matrix = multiplyMatrix(matrix, scale)
+                offset = transformVector(offset, scale)
+            elif operation == 'add':
+                offset = [a + b for a, b in zip(offset, values)]
+            elif operation in ['power', 'max', 'min']:
+                if operation == 'power' and isClose(values, [1.0, 1.0, 1.0]):
+                    continue
+                flushAffine()
+                matrix = identity
+                offset = [0.0, 0.0, 0.0]
+                result.append([operation, values])
+        flushAffine()
+        return result
+
+    def optimizeGraph(self, nodeGraph):
+        '''
+        Optimize a nodegraph created by generateOCIOGraph() in place. The chain of nodes is simplified
+        using optimizeGraphStages(). If no matrix transform remains, the nodes operate directly on the color3
+        input so the vector3 conversion nodes are removed. Graphs which are not a single chain of supported
+        nodes are left unchanged.
+        @param nodeGraph: The MaterialX nodegraph.
+        @return: The number of nodes removed from the graph.
+        '''
+        stages = self.getGraphStages(nodeGraph)
+        if stages is None:
+            return 0
+        stages = self.optimizeGraphStages(stages)
+
+        # Remove all nodes and the output so that the rebuilt graph keeps the output last
+        output = nodeGraph.getOutputs()[0]
+        outputName = output.getName()
+        outputType = output.getType()
+        nodeGraph.removeOutput(outputName)
+        interfaceName = None
+        nodeCount = len(nodeGraph.getNodes())
+        for node in nodeGraph.getNodes():
+            for input in node.getInputs():
+                if input.getInterfaceName():
+                    interfaceName = input.getInterfaceName()
+            nodeGraph.removeNode(node.getName())
+
+        # MaterialX matrix transforms are only defined for vector types
+        useVector = any(operation == 'matrix' for operation, values in stages)
+        nodeType = 'vector3' if useVector else outputType
+        previousNode = None
+        if useVector:
+            convertNode = nodeGraph.addNode('convert', 'asVec', nodeType)
+            convertNode.addInput('in', outputType).setInterfaceName(interfaceName)
+            previousNode = convertNode.getName()
+
+        names = { 'matrix': 'matrixTransform', 'multiply': 'scale', 'add': 'offset', 'power': 'exponent', 'max': 'clampLow', 'min': 'clampHigh' }
+        for operation, values in stages:
+            if operation == 'matrix':
+                node = nodeGraph.addNode('transformmatrix', nodeGraph.createValidChildName(names[operation]), nodeType)
+                input = node.addInput('in', nodeType)
+                parameter = node.addInput('mat', 'matrix33')
+                parameter.setValueString(', '.join([str(x) for x in values]))
+            else:
+                node = nodeGraph.addNode(operation, nodeGraph.createValidChildName(names[operation]), nodeType)
+                input = node.addInput('in1', nodeType)
+                parameter = node.addInput('in2', nodeType)
+                parameter.setValueString(', '.join([str(x) for x in values]))
+            if previousNode:
+                input.setNodeName(previousNode)
+            else:
+                input.setInterfaceName(interfaceName)
+            previousNode = node.getName()
+
+        if useVector:
+            convertNode = nodeGraph.addNode('convert', 'asColor', outputType)
+            convertNode.addInput('in', nodeType).setNodeName(previousNode)
+            previousNode = convertNode.getName()
+        elif not previousNode:
             # Pass-through
-            #print('No transforms applied. Transform is a pass-through.')
-            converInput2.setAttribute('nodename', 'asVec')
+            node = nodeGraph.addNode('dot', 'passthrough', outputType)
+            node.addInput('in', outputType).setInterfaceName(interfaceName)
+            previousNode = node.getName()
+        output = nodeGraph.addOutput(outputName, outputType)
+        output.setNodeName(previousNode)
 
-        out = ng.addOutput(ng.createValidChildName('out'), 'color3')
-        out.setAttribute('nodename', 'asColor')
+        self.instrumentation.count('graphNodesRemoved', nodeCount - len(nodeGraph.getNodes()))
+        return nodeCount - len(nodeGraph.getNodes())
 
-        return graphDoc
+    def getMatrixTransform(self, config, sourceColorSpace, destColorSpace):
+        '''
+        Get the matrix of a color space transform if the optimized OCIO processor reduces it to a single matrix.
+        @param config: The OCIO configuration.
+        @param sourceColorSpace: The source color space.
+        @param destColorSpace: The destination color space.
+        @return: A tuple of the 4x4 matrix and 4 channel offset following OCIO conventions (row-major and applied to
+        column vectors). An identity transform returns the identity matrix. None is returned if the transform is not
+        a single matrix.
+        '''
+        transformOps = self.getTransformOps(config, sourceColorSpace, destColorSpace)
+        if transformOps is None:
+            return None
+        ops = transformOps['ops']
+        if len(ops) == 0:
+            return [1.0 if row == column else 0.0 for row in range(4) for column in range(4)], [0.0] * 4
+        if len(ops) != 1:
+            return None
+        if ops[0]['type'] != 'TRANSFORM_TYPE_MATRIX' or ops[0]['direction'] != 'TRANSFORM_DIR_FORWARD':
+            return None
+        return list(ops[0]['matrix']), list(ops[0]['offset'])
 
-    def createColor3Variant(self, definition, definitionDoc, IN_PIXEL_STRING = 'in'):
+    def generateComposedDefinition(self, config, doc, sourceColorSpace, referenceColorSpace, targetColorSpace, IN_PIXEL_STRING = 'in'):
+        '''
+        Create color4 and color3 definitions for a color space transform which is composed of a transform from the
+        source color space to a reference color space followed by a transform from the reference color space to
+        the target color space. The definitions of the two transforms must have been created using generateOCIO().
+        Each definition is implemented by a nodegraph which instances the two transform nodes. If the OCIO
+        optimizer reduces the transform to a single matrix, the nodegraph applies the matrix instead.
+        @param config: The OCIO configuration.
+        @param doc: The MaterialX document to add the definitions and nodegraphs to.
+        @param sourceColorSpace: The source color space.
+        @param referenceColorSpace: The reference color space.
+        @param targetColorSpace: The destination color space.
+        @param IN_PIXEL_STRING: The input pixel string.
+        @return: The color4 definition.
+        '''
+        matrixTransform = self.getMatrixTransform(config, sourceColorSpace, targetColorSpace)
+        if matrixTransform:
+            self.instrumentation.count('fusedComposedTransforms')
+
+        definition = self.generateMaterialXDefinition(doc, sourceColorSpace, targetColorSpace, IN_PIXEL_STRING, 'color4')
+        color3Definition = self.createColor3Variant(definition, doc, IN_PIXEL_STRING, False)
+        for nodeDef in [definition, color3Definition]:
+            outputType = nodeDef.getType()
+            ng = doc.addNodeGraph(nodeDef.getName().replace('ND_', 'NG_'))
+            ng.setNodeDef(nodeDef)
+            previousNode = None
+
+            if matrixTransform:
+                matrixValue, offsetValue = matrixTransform
+                size = 4 if outputType == 'color4' else 3
+                # OCIO multiplies column vectors while MaterialX multiplies row vectors so the matrix is transposed.
+                matrixValue = [matrixValue[row * 4 + column] for column in range(size) for row in range(size)]
+                identity = [1.0 if row == column else 0.0 for row in range(size) for column in range(size)]
+                vectorType = 'vector%d' % size
+                if matrixValue != identity or any(offsetValue[0:size]):
+                    convertNode = ng.addNode('convert', 'asVec', vectorType)
+                    convertNode.addInput('in', outputType).setInterfaceName(IN_PIXEL_STRING)
+                    previousNode = convertNode.getName()
+                    if matrixValue != identity:
+                        matrixNode = ng.addNode('transformmatrix', 'matrixTransform', vectorType)
+                        matrixNode.addInput('in', vectorType).setNodeName(previousNode)
+                        matInput = matrixNode.addInput('mat', 'matrix%d%d' % (size, size))
+                        matInput.setValueString(', '.join([str(x) for x in matrixValue]))
+                        previousNode = matrixNode.getName()
+                    if any(offsetValue[0:size]):
+                        offsetNode = ng.addNode('add', 'offset', vectorType)
+                        offsetNode.addInput('in1', vectorType).setNodeName(previousNode)
+                        offsetNode.addInput('in2', vectorType).setValueString(', '.join([str(x) for x in offsetValue[0:size]]))
+                        previousNode = offsetNode.getName()
+                    convertNode = ng.addNode('convert', 'asColor', outputType)
+                    convertNode.addInput('in', vectorType).setNodeName(previousNode)
+                    previousNode = convertNode.getName()
+                else:
+                    # Pass-through
+                    node = ng.addNode('dot', 'passthrough', outputType)
+                    node.addInput('in', outputType).setInterfaceName(IN_PIXEL_STRING)
+                    previousNode = node.getName()
+            else:
+                for source, target in [[sourceColorSpace, referenceColorSpace], [referenceColorSpace, targetColorSpace]]:
+                    category = self.createTransformCategory(source, target)
+                    node = ng.addNode(category, ng.createValidChildName(category), outputType)
+                    node.setNodeDefString(self.createTransformName(source, target, outputType).replace('mx_', 'ND_'))
+                    input = node.addInput(IN_PIXEL_STRING, outputType)
+                    if previousNode:
+                        input.setNodeName(previousNode)
+                    else:
+                        input.setInterfaceName(IN_PIXEL_STRING)
+                    previousNode = node.getName()
+
+            ngout = ng.addOutput('out', outputType)
+            ngout.setNodeName(previousNode)
+
+        return definition
+
+    def createColor3Variant(self, definition, definitionDoc, IN_PIXEL_STRING = 'in', createNodeGraph = True):
         '''
         Create a color3 variant of a color4 definition.
         @param definition: The color4 definition.
         @param definitionDoc: The MaterialX document.
         @param IN_PIXEL_STRING: The input pixel string.        
+        @param createNodeGraph: Whether to implement the variant using a nodegraph which converts to and from color4
+        and calls the color4 definition. Set to False if the variant has its own implementations.
+        @return: The color3 definition.
         '''
         color4Name = definition.getName()
         color3Name = color4Name.replace('color4', 'color3')
@@ -525,6 +2196,8 @@ class OCIOMaterialaxGenerator():
         c3input = color3Def.getInput(IN_PIXEL_STRING)
         c3input.setType('color3')
         c3input.setValue([0.0, 0.0, 0.0], 'color3')
+        if not createNodeGraph:
+            return color3Def
             
         ngName = color3Def.getName().replace('ND_', 'NG_')
         ng = definitionDoc.addNodeGraph(ngName)
@@ -542,4 +2215,90 @@ class OCIOMaterialaxGenerator():
         c4instanceIn.setNodeName(c3to4.getName())
         c4to3Input.setNodeName(c4instance.getName())
         ngout.setNodeName(c4to3.getName())
-        c3to4Input.setInterfaceName(IN_PIXEL_STRING)
\ No newline at end of file
+        c3to4Input.setInterfaceName(IN_PIXEL_STRING)
+
+        return color3Def
+
+    def generateTransformResult(self, config, sourceColorSpace, targetColorSpace, targets = None, graph = False, IN_PIXEL_STRING = 'in',
+                                sharedSourceColorSpace = None, bakeTextures = False, maxLutError = None):
+        '''
+        Generate a color space transform in memory.
+        @param config: The OCIO configuration.
+        @param sourceColorSpace: The source color space.
+        @param targetColorSpace: The target color space.
+        @param targets: Optional list of MaterialX targets to generate source code for. Default is ['genglsl'].
+        @param graph: Generate a color3 node graph instead of source code. Default is False.
+        @param IN_PIXEL_STRING: The input pixel string.
+        @param sharedSourceColorSpace: Optional source color space of a numerically identical transform to reference
+        instead of generating new source code or a new node graph.
+        @param bakeTextures: Generate source code for transforms which require texture resources. Only used for source code.
+        @param maxLutError: Optional maximum error to approximate LUT1D transforms with. Only used for node graphs.
+        @return: A TransformResult.
+        '''
+        timings = {}
+        start = time.perf_counter()
+        definitionName = None
+        definition = None
+        implementation = None
+        sources = {}
+        textures = {}
+        if not graph:
+            definitionDoc = mx.createDocument()
+            implDoc = mx.createDocument()
+            nodeDef, transformName, code, extension, target = self.generateOCIO(config, definitionDoc, implDoc, sourceColorSpace, targetColorSpace,
+                                                                                'color4', IN_PIXEL_STRING, sharedSourceColorSpace, targets, sources,
+                                                                                True, textures if bakeTextures else None)
+            timings['generate'] = time.perf_counter() - start
+            if nodeDef:
+                start = time.perf_counter()
+                definitionName = nodeDef.getName()
+                definition = mx.writeToXmlString(definitionDoc)
+                implementation = mx.writeToXmlString(implDoc)
+                timings['serialize'] = time.perf_counter() - start
+            if not nodeDef or sharedSourceColorSpace:
+                sources = {}
+                textures = {}
+        else:
+            outputType = 'color3'
+            transformName = self.createTransformName(sourceColorSpace, targetColorSpace, outputType, 'mxgraph_')
+            if sharedSourceColorSpace:
+                # Only reference the shared graph if it could be generated
+                graphDoc = None
+                if self.generateTransformGraph(config, sourceColorSpace, targetColorSpace):
+                    graphDoc = self.generateOCIOGraphAlias(sourceColorSpace, targetColorSpace, sharedSourceColorSpace, outputType)
+            else:
+                graphDoc = self.generateOCIOGraph(config, sourceColorSpace, targetColorSpace, outputType, True, maxLutError)
+            timings['generate'] = time.perf_counter() - start
+            if graphDoc:
+                start = time.perf_counter()
+                definitionName = graphDoc.getNodeDefs()[0].getName()
+                definition = mx.writeToXmlString(graphDoc)
+                timings['serialize'] = time.perf_counter() - start
+
+        return TransformResult(sourceColorSpace, targetColorSpace, transformName, definitionName, definition, implementation,
+                               types.MappingProxyType(dict((target, tuple(value)) for target, value in sources.items())),
+                               types.MappingProxyType(textures), graph, types.MappingProxyType(timings))
+
+    def iterateTransforms(self, config, transforms = None, targetColorSpace = 'lin_rec709', targets = None, graph = False,
+                          IN_PIXEL_STRING = 'in', bakeTextures = False, maxLutError = None):
+        '''
+        Generate color space transforms in memory, yielding one result at a time. Nothing is written to disk and
+        only the current transform is held in memory, so results can be streamed to other stores.
+        @param config: The OCIO configuration.
+        @param transforms: Optional iterable of (source, target) color space pairs. Default is every color space
+        of the configuration to targetColorSpace.
+        @param targetColorSpace: The target color space used if transforms is not specified. Default is 'lin_rec709'.
+        @param targets: Optional list of MaterialX targets to generate source code for. Default is ['genglsl'].
+        @param graph: Generate color3 node graphs instead of source code. Default is False.
+        @param IN_PIXEL_STRING: The input pixel string.
+        @param bakeTextures: Generate source code for transforms which require texture resources. Only used for source code.
+        @param maxLutError: Optional maximum error to approximate LUT1D transforms with. Only used for node graphs.
+        @return: A generator of TransformResult, one per transform including those which could not be generated.
+        '''
+        if transforms is None:
+            transforms = ((name, targetColorSpace) for name in config.getColorSpaceNames() if name != targetColorSpace)
+        for sourceColorSpace, transformTarget in transforms:
+            with self.instrumentation.span('generateTransformResult', source=sourceColorSpace, destination=transformTarget):
+                result = self.generateTransformResult(config, sourceColorSpace, transformTarget, targets, graph, IN_PIXEL_STRING,
+                                                      None, bakeTextures, maxLutError)
+            yield result
\ No newline at end of file
@@ -0,0 +1,384 @@
+#!/usr/bin/env python
+'''
+Utilities to statically estimate the per pixel cost of generated color transforms.
+
+Both source code implementations (`mx_*.glsl` and other languages) and functional node graphs
+(`mxgraph_*.mtlx`) are analyzed. For each transform the number of arithmetic operations, transcendental
+operations (`pow`, `log`, `exp`, ...), texture fetches and branches is counted, along with a weighted cost.
+Vector operations are counted once, so a `vec3` multiply in source code and a `vector3` multiply node
+have the same cost.
+
+For source code the cost of the transform function is computed from the function itself plus the cost of
+each call it makes to other functions in the file. For node graphs each node is counted once, and nodes
+which are themselves implemented by node graphs add the cost of that graph.
+
+Node graphs are not always exact. If the folder contains the color space index written by `genOCIODefinitions.py`,
+the error of each node graph against the OCIO CPU processor is measured (this requires NumPy). A node graph is only
+selected over the source code if its error is known and within the tolerance.
+
+Example usage to write a cost table for all transforms in a folder, and to pick the cheaper of the source code
+and node graph implementation of each transform:
+```
+python costestimator.py --inputPath ./data/ --output costs.md --select
+```
+'''
+
+import os, re, json, argparse
+import MaterialX as mx
+
+try:
+    from . import core as mxocio
+    from . import colorspaceindex
+except ImportError:
+    import core as mxocio
+    import colorspaceindex
+
+# Name of the color space index file written by genOCIODefinitions.py.
+INDEX_FILE = 'materialxocio_index.json'
+
+class CostEstimator():
+    '''
+    A class to estimate the cost of source code and node graph implementations of color transforms.
+    '''
+
+    # Operation counts returned for each implementation
+    COUNTERS = ['arithmetic', 'transcendental', 'texture', 'branch']
+
+    # Default relative cost of each type of operation
+    WEIGHTS = { 'arithmetic': 1, 'transcendental': 4, 'texture': 8, 'branch': 2 }
+
+    # Default maximum error of a node graph which can be selected
+    TOLERANCE = 1e-4
+
+    # Source code patterns for each type of operation
+    SOURCE_PATTERNS = {
+        'transcendental': r'\b(?:pow|exp|exp2|log|log2|log10|sqrt|rsqrt|inversesqrt|sin|cos|tan|asin|acos|atan|atan2|sinh|cosh|tanh)\s*\(',
+        'texture': r'\b(?:texture|texture1D|texture2D|texture3D|textureLod|texelFetch)\s*\(|\.\s*(?:Sample|SampleLevel|sample)\s*\(',
+        'branch': r'\b(?:if|for|while|switch)\s*\(|\?',
+        'arithmetic': r'(?<=[\w\)\]\s])(?:[-+*/]=?)(?=[\s\w\(\.])|\b(?:min|max|clamp|abs|sign|floor|ceil|fract|mod|fmod|mix|lerp|dot|step|smoothstep|saturate)\s*\('
+    }
+
+    # Node categories for each type of operation. Other categories are counted as arithmetic.
+    NODE_CATEGORIES = {
+        'transcendental': ['power', 'ln', 'exp', 'sqrt', 'sin', 'cos', 'tan', 'asin', 'acos', 'atan2'],
+        'texture': ['image', 'tiledimage', 'triplanarprojection', 'hextiledimage'],
+        'branch': ['ifgreater', 'ifgreatereq', 'ifequal', 'switch'],
+        'free': ['convert', 'dot', 'constant', 'extract', 'combine2', 'combine3', 'combine4', 'separate2', 'separate3', 'separate4']
+    }
+
+    def __init__(self, weights = None):
+        '''
+        Constructor.
+        @param weights: Optional dictionary of operation type to relative cost, overriding the default WEIGHTS.
+        '''
+        self.weights = dict(CostEstimator.WEIGHTS)
+        if weights:
+            self.weights.update(weights)
+
+    def createCost(self):
+        '''
+        Create an empty set of operation counts.
+        @return: A dictionary of operation type to count.
+        '''
+        return dict.fromkeys(CostEstimator.COUNTERS, 0)
+
+    def addCost(self, cost, other, count = 1):
+        '''
+        Add operation counts to a set of counts.
+        @param cost: The counts to add to.
+        @param other: The counts to add.
+        @param count: The number of times to add the counts. Default is 1.
+        '''
+        for name in CostEstimator.COUNTERS:
+            cost[name] += other[name] * count
+
+    def getTotal(self, cost):
+        '''
+        Get the weighted total of a set of operation counts.
+        @param cost: The operation counts.
+        @return: The weighted cost.
+        '''
+        return sum(cost[name] * self.weights[name] for name in CostEstimator.COUNTERS)
+
+    def stripSource(self, code):
+        '''
+        Remove comments, preprocessor directives and numeric literals from source code so that they are not counted.
+        @param code: The source code.
+        @return: The stripped source code.
+        '''
+        code = re.sub(r'/\*.*?\*/', ' ', code, flags=re.DOTALL)
+        code = re.sub(r'//[^\n]*', ' ', code)
+        code = re.sub(r'^\s*#[^\n]*', ' ', code, flags=re.MULTILINE)
+        # Replace literals such as 1.5e-05 or 2.f by a single token so exponent signs are not counted
+        code = re.sub(r'(?<![\w.])(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?[fFhH]?\b', 'N', code)
+        return code
+
+    def countSource(self, code):
+        '''
+        Count the operations in stripped source code.
+        @param code: The stripped source code.
+        @return: A dictionary of operation type to count.
+        '''
+        cost = self.createCost()
+        for name, pattern in CostEstimator.SOURCE_PATTERNS.items():
+            cost[name] = len(re.findall(pattern, code))
+        return cost
+
+    def getSourceFunctions(self, code):
+        '''
+        Get the functions defined in stripped source code.
+        @param code: The stripped source code.
+        @return: A dictionary of function name to a list of function bodies. Overloaded functions have more than one body.
+        '''
+        functions = {}
+        declaration = re.compile(r'^[ \t]*(?:[\w<>:]+[ \t]+)+(\w+)\s*\([^;{}]*\)\s*\{', re.MULTILINE)
+        for match in declaration.finditer(code):
+            name = match.group(1)
+            if name in ['if', 'for', 'while', 'switch']:
+                continue
+            depth = 1
+            position = match.end()
+            while depth and position < len(code):
+                if code[position] == '{':
+                    depth += 1
+                elif code[position] == '}':
+                    depth -= 1
+                position += 1
+            functions.setdefault(name, []).append(code[match.end():position - 1])
+        return functions
+
+    def estimateSource(self, code, functionName = None):
+        '''
+        Estimate the cost of a source code implementation.
+        @param code: The source code.
+        @param functionName: The name of the transform function. The cost of the function includes the cost of each
+        call it makes to other functions in the code. If not specified, or not found, all of the code is counted once.
+        @return: A dictionary of operation type to count.
+        '''
+        code = self.stripSource(code)
+        functions = self.getSourceFunctions(code)
+        if not functionName or functionName not in functions:
+            return self.countSource(code)
+
+        costs = {}
+        def getFunctionCost(name, visiting):
+            if name in costs:
+                return costs[name]
+            cost = self.createCost()
+            # Overloads are combined. Calls between overloads of the same name are not followed.
+            for body in functions[name]:
+                self.addCost(cost, self.countSource(body))
+                for callee in functions:
+                    if callee == name or callee in visiting:
+                        continue
+                    calls = len(re.findall(r'\b%s\s*\(' % re.escape(callee), body))
+                    if calls:
+                        self.addCost(cost, getFunctionCost(callee, visiting | { name }), calls)
+            costs[name] = cost
+            return cost
+
+        return getFunctionCost(functionName, set())
+
+    def getNodeCategoryType(self, category):
+        '''
+        Get the type of operation a node category is counted as.
+        @param category: The node category.
+        @return: The operation type, or None if the node is free.
+        '''
+        for name, categories in CostEstimator.NODE_CATEGORIES.items():
+            if category in categories:
+                return None if name == 'free' else name
+        return 'arithmetic'
+
+    def estimateGraph(self, nodeGraph, doc = None, visiting = None):
+        '''
+        Estimate the cost of a node graph implementation.
+        @param nodeGraph: The MaterialX node graph.
+        @param doc: Optional document containing definitions and node graph implementations for the nodes in the graph.
+        Nodes with a node graph implementation add the cost of that graph. Defaults to the document of the node graph.
+        @param visiting: Node graphs being estimated, used to prevent infinite recursion.
+        @return: A dictionary of operation type to count.
+        '''
+        if doc is None:
+            doc = nodeGraph.getDocument()
+        visiting = (visiting or set()) | { nodeGraph.getName() }
+        cost = self.createCost()
+        for node in nodeGraph.getNodes():
+            subGraph = mxocio.findNodeGraph(doc, node)
+            if subGraph and subGraph.getName() not in visiting:
+                self.addCost(cost, self.estimateGraph(subGraph, doc, visiting))
+                continue
+            name = self.getNodeCategoryType(node.getCategory())
+            if name:
+                cost[name] += 1
+        return cost
+
+    def getGraphTransforms(self, inputPath):
+        '''
+        Get the color spaces of each node graph file in a folder from the color space index written by genOCIODefinitions.py.
+        @param inputPath: The folder containing the generated files.
+        @return: The name of the configuration the transforms were generated with, and a dictionary of node graph
+        file name to the source and target color space names. None and an empty dictionary are returned if there is no index.
+        '''
+        index = colorspaceindex.ColorSpaceIndex.load(os.path.join(inputPath, INDEX_FILE))
+        if not index:
+            return None, {}
+        transforms = {}
+        for colorSpace in index.getData()['colorSpaces']:
+            for targetColorSpace, transform in colorSpace['transforms'].items():
+                if transform.get('graphFile'):
+                    transforms[transform['graphFile']] = (colorSpace['sourceName'], targetColorSpace)
+        return index.getData().get('generationConfig'), transforms
+
+    def measureGraphErrors(self, inputPath, results, graphDoc, generator = None):
+        '''
+        Measure the error of each node graph against the OCIO CPU processor of its transform. See
+        OCIOMaterialaxGenerator.getGraphError(). The color spaces of each node graph are read from the color space index.
+        @param inputPath: The folder containing the generated files.
+        @param results: The results returned from estimateFolder(). The 'error' of each node graph result is set,
+        or left as None if it cannot be measured.
+        @param graphDoc: The document containing all node graphs in the folder.
+        @param generator: Optional OCIOMaterialaxGenerator to use.
+        '''
+        configName, transforms = self.getGraphTransforms(inputPath)
+        if not configName or not mxocio.np.isAvailable():
+            return
+        generator = generator or mxocio.OCIOMaterialaxGenerator(verbose=False)
+        config = generator.getConfig(configName)
+        for result in results:
+            if result['implementation'] != 'graph' or result['file'] not in transforms:
+                continue
+            sourceColorSpace, targetColorSpace = transforms[result['file']]
+            nodeGraph = graphDoc.getNodeGraph(result['nodeGraph'])
+            result['error'] = generator.getGraphError(config, sourceColorSpace, targetColorSpace, graphDoc, nodeGraph=nodeGraph)
+
+    def estimateFolder(self, inputPath, measureErrors = True, generator = None):
+        '''
+        Estimate the cost of all transforms in a folder. Source code files named `mx_<transform>_color4.<extension>`
+        and node graph files named `mxgraph_<transform>_color3.mtlx` are analyzed.
+        @param inputPath: The folder containing the generated files.
+        @param measureErrors: Whether to measure the error of each node graph using measureGraphErrors(). Default is True.
+        @param generator: Optional OCIOMaterialaxGenerator used to measure errors.
+        @return: A list of dictionaries with the 'transform' name, 'implementation' ('source' or 'graph'), 'file',
+        the operation counts and the weighted 'cost', sorted by transform and implementation. Node graph results
+        also have the 'nodeGraph' name and the 'error' against the OCIO CPU processor, which is None if it is not measured.
+        '''
+        results = []
+        # All node graphs are loaded into one document, as alias graphs use the definitions in other files
+        graphDoc = mx.createDocument()
+        graphFiles = [filename for filename in sorted(os.listdir(inputPath))
+                      if filename.startswith('mxgraph_') and filename.endswith('.mtlx')]
+        for filename in graphFiles:
+            doc = mx.createDocument()
+            mx.readFromXmlFile(doc, os.path.join(inputPath, filename))
+            graphDoc.importLibrary(doc)
+            for nodeGraph in doc.getNodeGraphs():
+                result = self.estimateGraph(graphDoc.getNodeGraph(nodeGraph.getName()), graphDoc)
+                transform = re.sub(r'_color3$', '', nodeGraph.getName()[len('NG_'):])
+                results.append(dict(result, transform=transform, implementation='graph', file=filename,
+                                    nodeGraph=nodeGraph.getName(), error=None, cost=self.getTotal(result)))
+
+        for filename in sorted(os.listdir(inputPath)):
+            path = os.path.join(inputPath, filename)
+            stem, extension = os.path.splitext(filename)
+            if filename.startswith('mx_') and stem.endswith('_color4') and extension not in ['.mtlx', '.npy']:
+                with open(path, 'r') as f:
+                    code = f.read()
+                result = self.estimateSource(code, stem)
+                transform = stem[len('mx_'):-len('_color4')]
+                results.append(dict(result, transform=transform, implementation='source', file=filename, cost=self.getTotal(result)))
+        if measureErrors and results:
+            self.measureGraphErrors(inputPath, results, graphDoc, generator)
+        results.sort(key=lambda result: (result['transform'], result['implementation'], result['file']))
+        return results
+
+    def isAccurate(self, result, tolerance = None):
+        '''
+        Return whether an implementation matches the OCIO transform. Source code is exact. Node graphs are only
+        accurate if their error has been measured and is within the tolerance.
+        @param result: A result returned from estimateFolder().
+        @param tolerance: The maximum error of a node graph. Default is TOLERANCE.
+        '''
+        if result['implementation'] != 'graph':
+            return True
+        tolerance = CostEstimator.TOLERANCE if tolerance is None else tolerance
+        return result['error'] is not None and result['error'] <= tolerance
+
+    def selectImplementations(self, results, tolerance = None):
+        '''
+        Pick the cheapest accurate implementation of each transform. See isAccurate().
+        @param results: The results returned from estimateFolder().
+        @param tolerance: The maximum error of a node graph. Default is TOLERANCE.
+        @return: A dictionary of transform name to the cheapest accurate result.
+        '''
+        selection = {}
+        for result in results:
+            if not self.isAccurate(result, tolerance):
+                continue
+            current = selection.get(result['transform'])
+            if not current or result['cost'] < current['cost']:
+                selection[result['transform']] = result
+        return selection
+
+    def getMarkdownTable(self, results, selection = None):
+        '''
+        Format cost results as a markdown table.
+        @param results: The results returned from estimateFolder().
+        @param selection: Optional selection returned from selectImplementations(). If specified a column
+        shows which implementation is preferred.
+        @return: The markdown string.
+        '''
+        header = ['Transform', 'Implementation', 'File', 'Arithmetic', 'Transcendental', 'Texture', 'Branch', 'Cost', 'Error']
+        if selection is not None:
+            header.append('Preferred')
+        md = '| ' + ' | '.join(header) + ' |\n'
+        md += '| ' + ' | '.join(['---'] * len(header)) + ' |\n'
+        for result in results:
+            row = [result['transform'], result['implementation'], result['file']] + \
+                  [str(result[name]) for name in CostEstimator.COUNTERS] + [str(result['cost'])]
+            if result['implementation'] != 'graph':
+                row.append('')
+            else:
+                row.append('unknown' if result['error'] is None else '%.3g' % result['error'])
+            if selection is not None:
+                row.append('yes' if selection.get(result['transform']) is result else '')
+            md += '| ' + ' | '.join(row) + ' |\n'
+        return md
+
+def main():
+    '''
+    Estimate the cost of all transforms in a folder and write a cost table.
+    '''
+    parser = argparse.ArgumentParser(description="Estimate the per pixel cost of MaterialX OCIO source code and node graph implementations.")
+    parser.add_argument('--inputPath', dest='inputPath', default='./data/', help='Folder containing generated mx_*.glsl and mxgraph_*.mtlx files. Default is ./data/')
+    parser.add_argument('--output', dest='output', help='File to write a markdown cost table to. Default is to print to stdout.')
+    parser.add_argument('--json', dest='json', help='File to write the cost results to as JSON.')
+    parser.add_argument('--select', dest='select', action='store_true', help='Pick the cheaper of the source code and node graph implementation of each transform. '
+                        'Node graphs are only picked if their error is within the tolerance.')
+    parser.add_argument('--tolerance', dest='tolerance', type=float, default=CostEstimator.TOLERANCE,
+                        help='Maximum error of a node graph against the OCIO CPU processor for it to be picked. Default is %g.' % CostEstimator.TOLERANCE)
+    opts = parser.parse_args()
+
+    estimator = CostEstimator()
+    results = estimator.estimateFolder(opts.inputPath)
+    selection = estimator.selectImplementations(results, opts.tolerance) if opts.select else None
+
+    md = estimator.getMarkdownTable(results, selection)
+    if opts.output:
+        with open(opts.output, 'w') as f:
+            f.write(md)
+        print('Wrote cost table to:', opts.output)
+    else:
+        print(md)
+
+    if opts.json:
+        data = { 'weights': estimator.weights, 'transforms': results }
+        if selection is not None:
+            data['selection'] = { transform: result['implementation'] for transform, result in sorted(selection.items()) }
+        with open(opts.json, 'w') as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print('Wrote cost results to:', opts.json)
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +0,0 @@
-
-// Raw to lin_rec709 function. Texture count: 0
-
-vec4 mx_Raw_to_lin_rec709_color4(vec4 inPixel)
-{
-  vec4 outColor = inPixel;
-
-  return outColor;
-}
@@ -7,3 +7,13 @@ vec4 mx_lin_srgb_to_lin_rec709_color4(vec4 inPixel)
 
   return outColor;
 }
+
+void mx_lin_srgb_to_lin_rec709_color4(vec4 inPixel, out vec4 outColor)
+{
+  outColor = mx_lin_srgb_to_lin_rec709_color4(inPixel);
+}
+
+void mx_lin_srgb_to_lin_rec709_color3(vec3 inPixel, out vec3 outColor)
+{
+  outColor = inPixel;
+}
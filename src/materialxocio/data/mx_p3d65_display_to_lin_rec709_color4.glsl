@@ -26,3 +26,30 @@ vec4 mx_p3d65_display_to_lin_rec709_color4(vec4 inPixel)
 
   return outColor;
 }
+
+void mx_p3d65_display_to_lin_rec709_color4(vec4 inPixel, out vec4 outColor)
+{
+  outColor = mx_p3d65_display_to_lin_rec709_color4(inPixel);
+}
+
+void mx_p3d65_display_to_lin_rec709_color3(vec3 inPixel, out vec3 outColor)
+{
+  outColor = inPixel;
+  
+  // Add Gamma 'basicFwd' processing
+  
+  {
+    vec3 gamma = vec3(2.6000000000000001, 2.6000000000000001, 2.6000000000000001);
+    vec3 res = pow( max( vec3(0., 0., 0.), outColor ), gamma );
+    outColor = vec3(res.x, res.y, res.z);
+  }
+  
+  // Add Matrix processing
+  
+  {
+    vec3 res = vec3(outColor.r, outColor.g, outColor.b);
+    vec3 tmp = res;
+    res = mat3(1.2249401762805601, -0.042056954709688135, -0.019637554590334505, -0.22494017628055812, 1.0420569547096905, -0.07863604555063225, -0., 0., 1.0982736001409614) * tmp;
+    outColor = vec3(res.x, res.y, res.z);
+  }
+}
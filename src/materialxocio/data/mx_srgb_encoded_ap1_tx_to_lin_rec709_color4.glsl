@@ -26,10 +26,44 @@ vec4 mx_srgb_encoded_ap1_tx_to_lin_rec709_color4(vec4 inPixel)
   {
     vec4 res = vec4(outColor.rgb.r, outColor.rgb.g, outColor.rgb.b, outColor.a);
     vec4 tmp = res;
-    res = mat4(1.7050509926579756, -0.13025641750704287, -0.02400335680461799, 0., -0.62179212065700873, 1.1408047365754082, -0.12896897606497126, 0., -0.083258872000981712, -0.010548319068357213, 1.152972332869586, 0., 0., 0., 0., 1.) * tmp;
+    res = mat4(1.7050509926579756, -0.13025641750704287, -0.02400335680461799, 0., -0.62179212065700873, 1.1408047365754079, -0.12896897606497126, 0., -0.083258872000981698, -0.010548319068357195, 1.152972332869586, 0., 0., 0., 0., 1.) * tmp;
     outColor.rgb = vec3(res.x, res.y, res.z);
     outColor.a = res.w;
   }
 
   return outColor;
 }
+
+void mx_srgb_encoded_ap1_tx_to_lin_rec709_color4(vec4 inPixel, out vec4 outColor)
+{
+  outColor = mx_srgb_encoded_ap1_tx_to_lin_rec709_color4(inPixel);
+}
+
+void mx_srgb_encoded_ap1_tx_to_lin_rec709_color3(vec3 inPixel, out vec3 outColor)
+{
+  outColor = inPixel;
+  
+  // Add Gamma 'monCurveFwd' processing
+  
+  {
+    vec3 breakPnt = vec3(0.0392857157, 0.0392857157, 0.0392857157);
+    vec3 slope = vec3(0.077380158, 0.077380158, 0.077380158);
+    vec3 scale = vec3(0.947867274, 0.947867274, 0.947867274);
+    vec3 offset = vec3(0.0521326996, 0.0521326996, 0.0521326996);
+    vec3 gamma = vec3(2.4000001, 2.4000001, 2.4000001);
+    vec3 isAboveBreak = vec3(greaterThan( outColor, breakPnt));
+    vec3 linSeg = outColor * slope;
+    vec3 powSeg = pow( max( vec3(0., 0., 0.), scale * outColor + offset), gamma);
+    vec3 res = isAboveBreak * powSeg + ( vec3(1., 1., 1.) - isAboveBreak ) * linSeg;
+    outColor = vec3(res.x, res.y, res.z);
+  }
+  
+  // Add Matrix processing
+  
+  {
+    vec3 res = vec3(outColor.r, outColor.g, outColor.b);
+    vec3 tmp = res;
+    res = mat3(1.7050509926579756, -0.13025641750704287, -0.02400335680461799, -0.62179212065700873, 1.1408047365754079, -0.12896897606497126, -0.083258872000981698, -0.010548319068357195, 1.152972332869586) * tmp;
+    outColor = vec3(res.x, res.y, res.z);
+  }
+}
@@ -23,3 +23,28 @@ vec4 mx_srgb_tx_to_lin_rec709_color4(vec4 inPixel)
 
   return outColor;
 }
+
+void mx_srgb_tx_to_lin_rec709_color4(vec4 inPixel, out vec4 outColor)
+{
+  outColor = mx_srgb_tx_to_lin_rec709_color4(inPixel);
+}
+
+void mx_srgb_tx_to_lin_rec709_color3(vec3 inPixel, out vec3 outColor)
+{
+  outColor = inPixel;
+  
+  // Add Gamma 'monCurveFwd' processing
+  
+  {
+    vec3 breakPnt = vec3(0.0392857157, 0.0392857157, 0.0392857157);
+    vec3 slope = vec3(0.077380158, 0.077380158, 0.077380158);
+    vec3 scale = vec3(0.947867274, 0.947867274, 0.947867274);
+    vec3 offset = vec3(0.0521326996, 0.0521326996, 0.0521326996);
+    vec3 gamma = vec3(2.4000001, 2.4000001, 2.4000001);
+    vec3 isAboveBreak = vec3(greaterThan( outColor, breakPnt));
+    vec3 linSeg = outColor * slope;
+    vec3 powSeg = pow( max( vec3(0., 0., 0.), scale * outColor + offset), gamma);
+    vec3 res = isAboveBreak * powSeg + ( vec3(1., 1., 1.) - isAboveBreak ) * linSeg;
+    outColor = vec3(res.x, res.y, res.z);
+  }
+}
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+'''
+A persistent on-disk cache of extracted shader code and transform operations.
+
+OCIOMaterialaxGenerator stores the results of creating OCIO processors in the cache, keyed by the OCIO version,
+config cache identifier, color spaces and shader language, so that later runs and other processes can reuse them.
+
+Example usage:
+```
+from materialxocio.diskcache import DiskCache
+
+cache = DiskCache('ocio_cache')
+key = cache.getKey('shaderCode', 'srgb_tx', 'lin_rec709')
+if cache.get(key) is None:
+    cache.put(key, { 'code': code })
+```
+'''
+
+import os
+import json
+import hashlib
+import threading
+import contextlib
+from collections import OrderedDict
+
+# File locking for the on-disk cache. fcntl is available on Unix platforms and msvcrt on Windows.
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+class DiskCache():
+    '''
+    A content addressed on-disk cache of JSON values which can be shared between runs and processes.
+    Values are stored in files named by the hash of their key. Writers hold an exclusive lock on a
+    per-entry lock file and replace the value file atomically, so readers never see a partially
+    written value and concurrent writers do not interfere with each other.
+    '''
+
+    # Version of the cache contents. Included in every key so that changes to the stored values
+    # do not return stale entries.
+    VERSION = 3
+
+    def __init__(self, path, maxSize = 256):
+        '''
+        Constructor.
+        @param path: The cache folder. It is created if it does not exist.
+        @param maxSize: Maximum number of values read or written by this process to keep in memory.
+        Least recently used values are evicted first. Default is 256.
+        '''
+        self.path = path
+        if not os.path.exists(path):
+            os.makedirs(path, exist_ok=True)
+        # Values read or written by this process
+        self.maxSize = maxSize
+        self.values = OrderedDict()
+        self.valuesLock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def getKey(self, *parts):
+        '''
+        Create a cache key from a list of JSON serializable parts.
+        @param parts: The key parts, for example the OCIO version, config cache identifier and color space names.
+        @return: The key string.
+        '''
+        return hashlib.sha256(json.dumps([DiskCache.VERSION] + list(parts)).encode('utf-8')).hexdigest()
+
+    def getFileName(self, key):
+        '''
+        Get the file a value is stored in. Files are split into sub folders by the first two characters of the key.
+        @param key: The cache key.
+        @return: The file path string.
+        '''
+        return os.path.join(self.path, key[0:2], key + '.json')
+
+    @contextlib.contextmanager
+    def lock(self, key):
+        '''
+        Context manager which holds an exclusive lock on a cache entry.
+        @param key: The cache key.
+        '''
+        lockFileName = self.getFileName(key)[:-len('.json')] + '.lock'
+        os.makedirs(os.path.dirname(lockFileName), exist_ok=True)
+        with open(lockFileName, 'a+') as lockFile:
+            if fcntl:
+                fcntl.flock(lockFile.fileno(), fcntl.LOCK_EX)
+            elif msvcrt:
+                lockFile.seek(0)
+                msvcrt.locking(lockFile.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lockFile.fileno(), fcntl.LOCK_UN)
+                elif msvcrt:
+                    lockFile.seek(0)
+                    msvcrt.locking(lockFile.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def get(self, key):
+        '''
+        Get a value from the cache.
+        @param key: The cache key.
+        @return: The value, or None if the key is not cached or the entry cannot be read.
+        '''
+        with self.valuesLock:
+            value = self.values.get(key)
+            if value is not None:
+                self.values.move_to_end(key)
+                self.hits += 1
+                return value
+        try:
+            with open(self.getFileName(key), 'r') as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.addValue(key, value)
+        self.hits += 1
+        return value
+
+    def addValue(self, key, value):
+        '''
+        Keep a value in memory, evicting the least recently used values if there are more than maxSize.
+        @param key: The cache key.
+        @param value: The value.
+        '''
+        with self.valuesLock:
+            self.values[key] = value
+            self.values.move_to_end(key)
+            while len(self.values) > self.maxSize:
+                self.values.popitem(last=False)
+
+    def put(self, key, value):
+        '''
+        Store a value in the cache.
+        @param key: The cache key.
+        @param value: A JSON serializable value.
+        '''
+        self.addValue(key, value)
+        filename = self.getFileName(key)
+        with self.lock(key):
+            tempFileName = '%s.%d.%d.tmp' % (filename, os.getpid(), threading.get_ident())
+            with open(tempFileName, 'w') as f:
+                json.dump(value, f)
+            os.replace(tempFileName, filename)
@@ -0,0 +1,256 @@
+#!/usr/bin/env python
+'''
+Utilities to evaluate MaterialX color transform node graphs on the CPU using NumPy.
+
+The evaluator interprets the functional node graphs produced by `OCIOMaterialaxGenerator.generateOCIOGraph()`
+(`mxgraph_*.mtlx` files) on arrays of colors, so that the graph implementations can be compared
+against the OCIO CPU processor without requiring a GPU.
+
+Example usage to compare all graphs in a folder against OCIO:
+```
+python evaluator.py --inputPath ./data/
+```
+'''
+
+import os, argparse
+
+try:
+    from . import core as mxocio
+except ImportError:
+    import core as mxocio
+
+# NumPy and MaterialX are imported on first use, so that importing the evaluator does not load them.
+np = mxocio.np
+mx = mxocio.mx
+
+class GraphEvaluator():
+    '''
+    A class to evaluate MaterialX color transform node graphs on (N,3) float32 NumPy arrays.
+    All nodes are evaluated on the entire array at once.
+    '''
+
+    def __init__(self, doc):
+        '''
+        Constructor.
+        @param doc: The MaterialX document containing the node graphs and the definitions of any
+        nodes they instance.
+        '''
+        self.doc = doc
+        self.operators = {
+            'convert': self.evaluateConvert,
+            'dot': self.evaluateConvert,
+            'constant': lambda node, inputs, count: inputs['value'],
+            'add': lambda node, inputs, count: inputs['in1'] + inputs['in2'],
+            'subtract': lambda node, inputs, count: inputs['in1'] - inputs['in2'],
+            'multiply': lambda node, inputs, count: inputs['in1'] * inputs['in2'],
+            'divide': lambda node, inputs, count: inputs['in1'] / inputs['in2'],
+            'power': lambda node, inputs, count: np.power(inputs['in1'], inputs['in2']),
+            'max': lambda node, inputs, count: np.maximum(inputs['in1'], inputs['in2']),
+            'min': lambda node, inputs, count: np.minimum(inputs['in1'], inputs['in2']),
+            'clamp': lambda node, inputs, count: np.clip(inputs['in'], inputs.get('low', 0.0), inputs.get('high', 1.0)),
+            'ln': lambda node, inputs, count: np.log(inputs['in']),
+            'exp': lambda node, inputs, count: np.exp(inputs['in']),
+            'absval': lambda node, inputs, count: np.abs(inputs['in']),
+            'sign': lambda node, inputs, count: np.sign(inputs['in']),
+            'ifgreater': lambda node, inputs, count: np.where(inputs.get('value1', 1.0) > inputs.get('value2', 0.0), inputs['in1'], inputs['in2']),
+            'separate3': lambda node, inputs, count: inputs['in'],
+            'combine3': lambda node, inputs, count: np.stack(np.broadcast_arrays(inputs['in1'], inputs['in2'], inputs['in3']), axis=-1),
+            'transform': self.evaluateTransformMatrix,
+            'transformmatrix': self.evaluateTransformMatrix
+        }
+        self.channelOutputs = { 'outx': 0, 'outy': 1, 'outz': 2, 'outw': 3, 'outr': 0, 'outg': 1, 'outb': 2, 'outa': 3 }
+
+    def addOperator(self, category, function):
+        '''
+        Add or replace the function used to evaluate nodes of a given category.
+        @param category: The node category.
+        @param function: A function taking the node, a dictionary of evaluated inputs and the number of colors.
+        '''
+        self.operators[category] = function
+
+    def parseValue(self, valueString):
+        '''
+        Parse a MaterialX value string into a NumPy array.
+        @param valueString: A comma separated list of numbers.
+        @return: A float32 array. Scalars are returned as 0-d arrays.
+        '''
+        values = [float(x) for x in valueString.split(',')]
+        if len(values) == 1:
+            return np.float32(values[0])
+        return np.array(values, dtype=np.float32)
+
+    def evaluateConvert(self, node, inputs, count):
+        '''
+        Evaluate a convert node. Conversions between 3 and 4 channel types add or remove an alpha of 1.
+        '''
+        value = inputs['in']
+        outputType = node.getType()
+        outCount = 4 if outputType in ['color4', 'vector4'] else 3
+        if np.ndim(value) == 0:
+            return np.full((count, outCount), value, dtype=np.float32)
+        inCount = value.shape[-1]
+        if inCount == outCount:
+            return value
+        if inCount > outCount:
+            return value[..., :outCount]
+        alpha = np.ones(value.shape[:-1] + (outCount - inCount,), dtype=np.float32)
+        return np.concatenate([value, alpha], axis=-1)
+
+    def evaluateTransformMatrix(self, node, inputs, count):
+        '''
+        Evaluate a matrix transform node. Following MaterialX conventions matrices are stored in row-major
+        order and vectors are treated as row vectors, so the result is in * mat.
+        '''
+        value = inputs['in']
+        matrix = np.asarray(inputs['mat'], dtype=np.float32)
+        size = int(round(np.sqrt(matrix.size)))
+        matrix = matrix.reshape(size, size)
+        if value.shape[-1] < size:
+            # vector3 by matrix44 transforms a homogeneous point
+            value = np.concatenate([value, np.ones(value.shape[:-1] + (1,), dtype=np.float32)], axis=-1)
+            return (value @ matrix)[..., :size - 1]
+        return value @ matrix
+
+    def evaluate(self, nodeGraph, values, inputName = 'in'):
+        '''
+        Evaluate a node graph on an array of colors.
+        @param nodeGraph: The MaterialX node graph or its name.
+        @param values: An (N,3) or (N,4) float32 NumPy array bound to the graph interface input.
+        @param inputName: The name of the interface input. Default is 'in'.
+        @return: An (N,C) float32 NumPy array for the first graph output.
+        '''
+        if isinstance(nodeGraph, str):
+            name = nodeGraph
+            nodeGraph = self.doc.getNodeGraph(name)
+            if not nodeGraph:
+                raise ValueError('Node graph not found: %s' % name)
+        values = np.asarray(values, dtype=np.float32)
+        outputs = nodeGraph.getOutputs()
+        if not outputs:
+            raise ValueError('Node graph has no outputs: %s' % nodeGraph.getName())
+
+        interface = { inputName: values }
+        cache = {}
+        return self.evaluateInput(nodeGraph, outputs[0], interface, cache, values.shape[0]).astype(np.float32)
+
+    def evaluateNode(self, nodeGraph, node, interface, cache, count):
+        '''
+        Evaluate a node within a node graph, evaluating upstream nodes first.
+        @param nodeGraph: The parent node graph.
+        @param node: The node to evaluate.
+        @param interface: A dictionary of graph interface input names to values.
+        @param cache: A dictionary of already evaluated node names to values.
+        @param count: The number of colors being evaluated.
+        @return: The value of the node output.
+        '''
+        name = node.getName()
+        if name in cache:
+            return cache[name]
+
+        inputs = {}
+        for input in node.getInputs():
+            inputs[input.getName()] = self.evaluateInput(nodeGraph, input, interface, cache, count)
+
+        category = node.getCategory()
+        operator = self.operators.get(category)
+        if operator:
+            result = operator(node, inputs, count)
+        else:
+            # Evaluate nodes which are themselves implemented as node graphs, for example those
+            # created by generateOCIOGraphAlias()
+            subGraph = mxocio.findNodeGraph(self.doc, node)
+            if not subGraph:
+                raise ValueError('Unsupported node category "%s" for node: %s' % (category, node.getNamePath()))
+            result = self.evaluateInput(subGraph, subGraph.getOutputs()[0], inputs, {}, count)
+
+        cache[name] = result
+        return result
+
+    def evaluateInput(self, nodeGraph, input, interface, cache, count):
+        '''
+        Evaluate the value of an input or output port.
+        @return: The connected node, interface or constant value.
+        '''
+        interfaceName = input.getInterfaceName()
+        if interfaceName:
+            if interfaceName in interface:
+                return interface[interfaceName]
+        nodeName = input.getNodeName()
+        if nodeName:
+            upstream = nodeGraph.getNode(nodeName)
+            if not upstream:
+                raise ValueError('Node "%s" not found in graph: %s' % (nodeName, nodeGraph.getName()))
+            value = self.evaluateNode(nodeGraph, upstream, interface, cache, count)
+            # Outputs of nodes with multiple outputs, such as separate3, are channels of the node value
+            outputName = input.getOutputString()
+            if outputName in self.channelOutputs:
+                value = value[..., self.channelOutputs[outputName]]
+            return value
+        valueString = input.getValueString()
+        if valueString:
+            return self.parseValue(valueString)
+        return np.float32(0.0)
+
+def compareGraphWithProcessor(evaluator, nodeGraph, cpuProcessor, values):
+    '''
+    Compare the result of evaluating a node graph with the result of an OCIO CPU processor.
+    @param evaluator: The GraphEvaluator to use.
+    @param nodeGraph: The MaterialX node graph or its name.
+    @param cpuProcessor: The OCIO CPU processor.
+    @param values: An (N,3) float32 NumPy array of colors to test.
+    @return: The maximum absolute difference over all values and channels.
+    '''
+    graphResult = evaluator.evaluate(nodeGraph, values)
+    expected = np.ascontiguousarray(values, dtype=np.float32).copy()
+    cpuProcessor.applyRGB(expected)
+    return float(np.nanmax(np.abs(graphResult - expected))) if expected.size else 0.0
+
+def main():
+    '''
+    Compare all graphs in a folder against the OCIO CPU processor.
+    '''
+    parser = argparse.ArgumentParser(description="Evaluate MaterialX OCIO node graphs using NumPy and compare them against OCIO.")
+    parser.add_argument('--inputPath', dest='inputPath', default='./data/', help='Folder containing mxgraph_*.mtlx files. Default is ./data/')
+    parser.add_argument('--targetColorSpace', dest='targetColorSpace', default='lin_rec709', help='Target color space of the graphs. Default is lin_rec709.')
+    parser.add_argument('--samples', dest='samples', type=int, default=1000000, help='Number of random colors to test. Default is 1000000.')
+    parser.add_argument('--tolerance', dest='tolerance', type=float, default=1e-4, help='Maximum allowed absolute error. Default is 1e-4.')
+    opts = parser.parse_args()
+
+    generator = mxocio.OCIOMaterialaxGenerator()
+    aconfig = generator.getBuiltinConfigs()[1].getConfig()
+
+    rng = np.random.default_rng(0)
+    values = rng.random((opts.samples, 3), dtype=np.float32)
+
+    failures = 0
+    suffix = '_to_%s_color3' % opts.targetColorSpace
+    for filename in sorted(os.listdir(opts.inputPath)):
+        if not filename.startswith('mxgraph_') or not filename.endswith('.mtlx'):
+            continue
+        doc = mx.createDocument()
+        mx.readFromXmlFile(doc, os.path.join(opts.inputPath, filename))
+        evaluator = GraphEvaluator(doc)
+        for nodeDef in doc.getNodeDefs():
+            nodeString = nodeDef.getNodeString()
+            if not nodeString.endswith(suffix):
+                continue
+            sourceColorSpace = nodeString[:-len(suffix)]
+            nodeGraphs = [ng for ng in doc.getNodeGraphs() if ng.getNodeDefString() == nodeDef.getName()]
+            if not nodeGraphs:
+                continue
+            try:
+                cpuProcessor = generator.getProcessor(aconfig, sourceColorSpace, opts.targetColorSpace).getDefaultCPUProcessor()
+                error = compareGraphWithProcessor(evaluator, nodeGraphs[0], cpuProcessor, values)
+            except Exception as err:
+                print('- %s: could not be evaluated: %s' % (filename, err))
+                failures += 1
+                continue
+            status = 'OK' if error <= opts.tolerance else 'FAILED'
+            if status != 'OK':
+                failures += 1
+            print('- %s: max error %g [%s]' % (filename, error, status))
+
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
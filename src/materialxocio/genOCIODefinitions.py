@@ -5,34 +5,421 @@ The script will generate MaterialX definitions for all color spaces found in the
 ACES Cg Config` and `ACES Studio Config` configurations. 
 
 For source code generation 
-- The definitions will be generated for the following MaterialX targets:
-    - GLSL
+- The definitions will be generated for the MaterialX targets given by `--targets`:
+    - GLSL (`genglsl`). This is the default.
+    - ESSL (`essl`), MSL (`genmsl`), OSL (`genosl`) and HLSL (`genhlsl`). HLSL is OCIO only: there is no MaterialX
+      HLSL code generator, so it is only generated when requested, for use by custom code generators.
+- The GPU processor is created once per transform and the code for each target is extracted from it.
+  All implementations are written to the same implementation document.
 - The resulting output is:
     - A color4 implementation file containing the source code generated by OCIO.
-    - A color3 node graph implementation which uses the color4 implementation (nodegraph)  
+    - A color3 function in the same file with the alpha channel computations removed. For OSL, the color3 function
+      calls the color4 function with an alpha of 1 and returns the color channels.
     - A file with both color3 and color4 MaterialX definitions (nodedef).
     - A MaterialX file containing implementation declarations for color3 and color4 variants.
 
 For functional node graph generation:
 - The definition will generate a `nodegraph` and `nodedef`pair based on the
 transforms returned from the OCIO processor. 
+- LUT1D transforms are approximated with closed-form curves if `--maxLutError` is given.
 - Currently only a `color3 variant is generated.
 
 Additonaly, the script will generate a markdown file with information about the built-in configurations.
+
+Transforms can be generated in parallel using `--jobs N`. Each worker process rebuilds the
+configuration from its `ocio://` URI and returns the generated content in memory. Files are written
+by the main process in the same order as a serial run so the output is identical.
+
+A manifest (`materialxocio_manifest.json`) is written next to the outputs recording the OCIO and MaterialX
+versions, and for each transform the config cache identifier and a hash of each file written.
+Transforms whose manifest entry is still current are skipped, and files whose content has not
+changed are not rewritten. Use `--force` to regenerate all transforms.
+
+Files are written on `--writeThreads` background threads (default 4) while the next transform is generated.
+Each file is written to a temporary file which then replaces it, so a partially written file is never seen.
+When the write queue is full, generation waits for queued writes to complete. Use `--writeThreads 0` to write synchronously.
+
+A color space index (`materialxocio_index.json`) is also written, mapping each color space name and alias to its
+canonical name, configuration and generated transform names. It is reused while the OCIO and MaterialX versions,
+configurations and target color spaces are unchanged, so later runs do not need to parse the configurations.
+The index can be queried using `colorspaceindex.ColorSpaceIndex` without importing PyOpenColorIO.
+
+Use `--trace FILE` to write a Chrome trace event JSON file with timings of processor creation, shader extraction,
+document building and file writes, along with counters such as processor cache hits and bytes written.
+Use `--quiet` to suppress progress messages. With `--jobs`, only work done in the main process is traced.
+
+Transforms which require texture resources (such as LUTs) are skipped by default. Use `--bakeTextures` to generate them,
+writing the data of each texture as a little-endian float32 NumPy `.npy` file which can be memory mapped. The implementations
+declare each texture as a `filename` input with the sampler name and texture layout as attributes. MSL and OSL targets are
+not generated for these transforms.
+
+Use `--cache FOLDER` to store the extracted shader code and transform operations in an on-disk cache. Entries are keyed
+by the OCIO version, config cache identifier, color spaces and shader language, so later runs (including runs with `--force`
+or to a different output folder) reuse them without creating OCIO processors. The cache can be shared by concurrent runs.
+
+With `--dedupe`, transforms which are numerically identical to an earlier transform (for example
+aliases such as `srgb_texture` and `srgb_tx`) are detected using the OCIO processor cache identifier,
+or by sampling the CPU processor when NumPy is available. Only transforms generated in the run are compared.
+Only the first transform's source code is written. The others get their own definitions, with implementations
+(or node graphs) referencing the shared transform. If the shared transform is not generated, for example because it
+requires texture resources, the next identical transform is generated in full and shared instead.
+
+With `--library NAME` all transforms are written to a single definitions document (`NAME_defs.mtlx`),
+a single implementation document (`NAME_impl.mtlx`) and a single source file per target language (e.g. `NAME.glsl`)
+instead of separate files per transform. Declarations shared between transforms are only emitted once
+in the combined source.
+
+Transforms are generated to each of the color spaces given by `--targetColorSpaces` (default `lin_rec709`).
+With `--reference NAME`, transforms are only generated from each source color space to the reference color space
+and from the reference color space to each target color space. Definitions for all other source and target pairs are
+composed from these as node graphs which instance the two transform nodes. If OCIO reduces the composed transform to
+a single matrix, the node graph applies the matrix instead.
+
+Use `genOCIODefinitions.py benchmark` to time each generation stage instead of generating files.
+The remaining arguments are passed to `benchmark.py`, e.g. `python genOCIODefinitions.py benchmark --output benchmark.json`.
 '''
 
-import os, argparse
-import MaterialX as mx
-import PyOpenColorIO as OCIO
+import os, sys, argparse, json, hashlib
 import core as mxocio
+import colorspaceindex
+
+# MaterialX and OCIO are imported on first use, so that --help does not load them.
+mx = mxocio.mx
+OCIO = mxocio.OCIO
+
+# Per process generator used by parallel workers.
+_workerGenerator = None
+
+# Name of the manifest file written to the output folder.
+MANIFEST_FILE = 'materialxocio_manifest.json'
+
+# Name of the color space index file written to the output folder.
+INDEX_FILE = 'materialxocio_index.json'
+
+def hashContent(content):
+    '''
+    Compute a content hash for a generated artifact.
+    @param content: The file content string, or bytes for binary files.
+    @return: The SHA-256 hex digest of the UTF-8 encoded content.
+    '''
+    if isinstance(content, bytes):
+        return hashlib.sha256(content).hexdigest()
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+def hashFile(filename):
+    '''
+    Compute the content hash of a file on disk.
+    @param filename: The file path string.
+    @return: The SHA-256 hex digest, or None if the file does not exist.
+    '''
+    if not os.path.exists(filename):
+        return None
+    with open(filename, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def writeFileIfChanged(filename, content, generator = None):
+    '''
+    Write a file only if its content differs from what is on disk, so unchanged files keep their modification time.
+    @param filename: The file path string.
+    @param content: The file content string, or bytes for binary files.
+    @param generator: Optional OCIOMaterialaxGenerator used to write and instrument the file.
+    @return: True if the file was written.
+    '''
+    if hashFile(filename) == hashContent(content):
+        if generator:
+            generator.instrumentation.count('unchangedFiles')
+        return False
+    if generator:
+        generator.writeFile(filename, content)
+    else:
+        f = open(filename, 'wb' if isinstance(content, bytes) else 'w')
+        f.write(content)
+        f.close()
+    return True
+
+def loadManifest(outputPath, ocioVersion, materialxVersion):
+    '''
+    Load the generation manifest from an output folder.
+    An empty manifest is returned if there is no manifest or if it was written with different OCIO or MaterialX versions.
+    @param outputPath: The output folder.
+    @param ocioVersion: The current OCIO version string.
+    @param materialxVersion: The current MaterialX version string.
+    @return: The manifest dictionary.
+    '''
+    manifest = { 'ocioVersion': ocioVersion, 'materialxVersion': materialxVersion, 'transforms': {} }
+    manifestFile = outputPath / mx.FilePath(MANIFEST_FILE)
+    if not os.path.exists(manifestFile.asString()):
+        return manifest
+    try:
+        with open(manifestFile.asString(), 'r') as f:
+            existing = json.load(f)
+    except (OSError, ValueError) as err:
+        print('Ignoring unreadable manifest %s: %s' % (manifestFile.asString(), err))
+        return manifest
+    if existing.get('ocioVersion') == ocioVersion and existing.get('materialxVersion') == materialxVersion:
+        manifest['transforms'] = existing.get('transforms', {})
+    return manifest
+
+def saveManifest(outputPath, manifest, generator = None):
+    '''
+    Save the generation manifest to an output folder. Keys are sorted so that the output is deterministic.
+    @param outputPath: The output folder.
+    @param manifest: The manifest dictionary.
+    @param generator: Optional OCIOMaterialaxGenerator used to write and instrument the file.
+    '''
+    manifestFile = outputPath / mx.FilePath(MANIFEST_FILE)
+    writeFileIfChanged(manifestFile.asString(), json.dumps(manifest, indent=2, sort_keys=True) + '\n', generator)
+
+def isTransformCurrent(manifest, outputPath, transformName, configCacheID, sharedSourceColorSpace = None, targets = None,
+                       bakeTextures = False, maxLutError = None, dedupe = False):
+    '''
+    Check if a transform recorded in the manifest is up to date, in which case it does not need to be regenerated.
+    All files recorded for the transform must exist with the recorded hash.
+    @param manifest: The manifest dictionary.
+    @param outputPath: The output folder.
+    @param transformName: The transform name.
+    @param configCacheID: The cache identifier of the config the transform is generated from.
+    @param sharedSourceColorSpace: The source color space of the identical transform referenced, if any.
+    @param targets: The list of MaterialX targets generated for the transform, if any.
+    @param bakeTextures: Whether transforms which require texture resources are generated.
+    @param maxLutError: The maximum error LUT1D transforms are approximated with in node graphs, if any.
+    @param dedupe: Whether numerically identical transforms reference a shared transform.
+    @return: True if the transform is current.
+    '''
+    entry = manifest['transforms'].get(transformName)
+    if not entry or entry.get('configCacheID') != configCacheID:
+        return False
+    if entry.get('sharedSourceColorSpace') != sharedSourceColorSpace:
+        return False
+    if entry.get('targets') != targets:
+        return False
+    if entry.get('bakeTextures', False) != bakeTextures:
+        return False
+    if entry.get('maxLutError') != maxLutError:
+        return False
+    if entry.get('dedupe', False) != dedupe:
+        return False
+    for name, fileHash in entry.get('files', {}).items():
+        filename = outputPath / mx.FilePath(name)
+        if hashFile(filename.asString()) != fileHash:
+            return False
+    return True
+
+def getTransformFileName(generator, sourceColorSpace, targetColorSpace, graph):
+    '''
+    Get the transform name used to identify the files of a transform.
+    @param generator: The OCIOMaterialaxGenerator to use.
+    @param sourceColorSpace: The source color space.
+    @param targetColorSpace: The target color space.
+    @param graph: Whether a node graph is generated instead of source code.
+    @return: The transform name.
+    '''
+    if graph:
+        return generator.createTransformName(sourceColorSpace, targetColorSpace, 'color3', 'mxgraph_')
+    return generator.createTransformName(sourceColorSpace, targetColorSpace, 'color4')
+
+def generateTransformFiles(generator, config, sourceColorSpace, targetColorSpace, graph, IN_PIXEL_STRING = 'in',
+                           sharedSourceColorSpace = None, targets = None, bakeTextures = False, maxLutError = None):
+    '''
+    Generate the content for all files of a color space transform without writing them.
+    @param generator: The OCIOMaterialaxGenerator to use.
+    @param config: The OCIO configuration.
+    @param sourceColorSpace: The source color space.
+    @param targetColorSpace: The target color space.
+    @param graph: Generate a node graph instead of source code.
+    @param IN_PIXEL_STRING: The input pixel string.
+    @param sharedSourceColorSpace: Optional source color space of a numerically identical transform to reference
+    instead of generating new source code or a new node graph.
+    @param targets: Optional list of MaterialX targets to generate source code for. Default is ['genglsl'].
+    @param bakeTextures: Generate source code for transforms which require texture resources, and return the
+    texture data as binary files. Only used for source code generation.
+    @param maxLutError: Optional maximum error to approximate LUT1D transforms with in node graphs. Only used for node graph generation.
+    @return: A list of [kind, name, content, target] entries in write order. Kind is one of
+    'definition', 'implementation', 'source', 'texture' or 'graph'. Texture content is bytes.
+    '''
+    result = generator.generateTransformResult(config, sourceColorSpace, targetColorSpace, targets, graph, IN_PIXEL_STRING,
+                                               sharedSourceColorSpace, bakeTextures, maxLutError)
+    return getTransformResultFiles(result)
+
+def getTransformResultFiles(result):
+    '''
+    Get the files to write for a transform generated with OCIOMaterialaxGenerator.generateTransformResult().
+    @param result: The TransformResult.
+    @return: A list of [kind, name, content, target] entries in write order, as returned from generateTransformFiles().
+    '''
+    files = []
+    if not result.definition:
+        return files
+    if result.graph:
+        files.append(['graph', result.transformName + '.' + 'mtlx', result.definition, None])
+        return files
+    files.append(['definition', result.definitionName + '.' + 'mtlx', result.definition, None])
+    files.append(['implementation', 'IM_' + result.transformName + '.' + 'mtlx', result.implementation, None])
+    for target, (extension, code) in result.sources.items():
+        files.append(['source', result.transformName + '.' + extension, code, target])
+    for name, data in result.textures.items():
+        files.append(['texture', name, data, None])
+    return files
+
+def generateComposedFiles(generator, config, sourceColorSpace, referenceColorSpace, targetColorSpace, IN_PIXEL_STRING = 'in'):
+    '''
+    Generate the definitions file for a color space transform which is composed of the transforms from the source
+    color space to a reference color space and from the reference color space to the target color space.
+    @param generator: The OCIOMaterialaxGenerator to use.
+    @param config: The OCIO configuration.
+    @param sourceColorSpace: The source color space.
+    @param referenceColorSpace: The reference color space.
+    @param targetColorSpace: The target color space.
+    @param IN_PIXEL_STRING: The input pixel string.
+    @return: A list of [kind, name, content, target] entries as returned from generateTransformFiles().
+    '''
+    definitionDoc = mx.createDocument()
+    definition = generator.generateComposedDefinition(config, definitionDoc, sourceColorSpace, referenceColorSpace, targetColorSpace, IN_PIXEL_STRING)
+    return [['definition', definition.getName() + '.' + 'mtlx', mx.writeToXmlString(definitionDoc), None]]
+
+def writeTransformFiles(outputPath, files, generator = None, writer = None):
+    '''
+    Write out the files returned from generateTransformFiles().
+    Files whose content is unchanged on disk are not rewritten.
+    @param outputPath: The output folder.
+    @param files: The list of [kind, name, content, target] entries.
+    @param generator: Optional OCIOMaterialaxGenerator used to report progress and to write and instrument files.
+    @param writer: Optional AsyncFileWriter to write the files in the background. Progress is reported once each file is written.
+    @return: A dictionary of file name to content hash.
+    '''
+    labels = {
+        'definition': 'Write MaterialX definition file:',
+        'implementation': 'Write MaterialX implementation file:',
+        'graph': 'Write MaterialX node graph definition file:',
+        'texture': 'Write texture file:'
+    }
+    log = generator.log if generator else print
+    hashes = {}
+    for kind, name, content, target in files:
+        filename = outputPath / mx.FilePath(name)
+        hashes[name] = hashContent(content)
+        if kind == 'source':
+            message = 'Write target[%s] source file %s' % (target, filename.asString())
+        else:
+            message = labels[kind] + ' ' + filename.asString()
+        if writer:
+            writer.write(filename.asString(), content, True,
+                         lambda written, message=message, filename=filename.asString(): log(message if written else 'Unchanged file: ' + filename))
+        elif writeFileIfChanged(filename.asString(), content, generator):
+            log(message)
+        else:
+            log('Unchanged file:', filename.asString())
+    return hashes
+
+def combineTransformFiles(generator, results, libraryName):
+    '''
+    Combine the files generated for all transforms into a single library.
+    @param generator: The OCIOMaterialaxGenerator to use.
+    @param results: A list of file lists returned from generateTransformFiles().
+    @param libraryName: The name of the library. Used as the prefix for all file names.
+    @return: A list of [kind, name, content, target] entries for the library files.
+    '''
+    readOptions = mx.XmlReadOptions()
+    readOptions.readComments = True
+
+    definitionDoc = mx.createDocument()
+    implDoc = mx.createDocument()
+    sourceCodes = {}
+    sourceTargets = {}
+    textureFiles = []
+    for files in results:
+        for kind, name, content, target in files:
+            # Textures are referenced by name so are written as is
+            if kind == 'texture':
+                textureFiles.append([kind, name, content, target])
+                continue
+            if kind == 'source':
+                extension = os.path.splitext(name)[1][1:]
+                sourceCodes.setdefault(extension, []).append(content)
+                sourceTargets[extension] = target
+                continue
+            doc = mx.createDocument()
+            mx.readFromXmlString(doc, content, '', readOptions)
+            libraryDoc = implDoc if kind == 'implementation' else definitionDoc
+            for child in doc.getChildren():
+                childName = child.getName()
+                if child.getCategory() == 'comment':
+                    childName = libraryDoc.createValidChildName('comment')
+                libraryChild = libraryDoc.addChildOfCategory(child.getCategory(), childName)
+                libraryChild.copyContentFrom(child)
+
+    # Point all implementations at the combined source files
+    for impl in implDoc.getImplementations():
+        extension = os.path.splitext(impl.getFile())[1][1:]
+        impl.setFile(libraryName + '.' + extension)
+
+    libraryFiles = []
+    if definitionDoc.getChildren():
+        libraryFiles.append(['definition', libraryName + '_defs.mtlx', mx.writeToXmlString(definitionDoc), None])
+    if implDoc.getChildren():
+        libraryFiles.append(['implementation', libraryName + '_impl.mtlx', mx.writeToXmlString(implDoc), None])
+    for extension in sorted(sourceCodes):
+        guardName = mx.createValidName(libraryName + '_' + extension).upper()
+        # OCIO wraps each MSL function in its own class so declarations cannot be shared
+        code = generator.combineShaderCode(sourceCodes[extension], guardName, sourceTargets[extension] != 'genmsl')
+        libraryFiles.append(['source', libraryName + '.' + extension, code, sourceTargets[extension]])
+    return libraryFiles + textureFiles
+
+def _initWorker(verbose = True, cachePath = None):
+    '''
+    Create the generator for a worker process.
+    @param verbose: Whether the generator prints progress messages.
+    @param cachePath: Optional folder of the on-disk cache shared with other processes.
+    '''
+    global _workerGenerator
+    _workerGenerator = mxocio.OCIOMaterialaxGenerator(verbose=verbose, diskCache=cachePath)
+
+def _generateTransformWorker(task):
+    '''
+    Process pool entry point. OCIO objects cannot be pickled so the configuration is rebuilt
+    (once per process) from its URI.
+    @param task: A tuple of configuration URI, source color space, target color space, graph flag, shared source color space,
+    list of targets, texture baking flag and maximum LUT approximation error.
+    @return: The list of files returned from generateTransformFiles().
+    '''
+    configUri, sourceColorSpace, targetColorSpace, graph, sharedSourceColorSpace, targets, bakeTextures, maxLutError = task
+    config = _workerGenerator.getConfig(configUri)
+    return generateTransformFiles(_workerGenerator, config, sourceColorSpace, targetColorSpace, graph, 'in', sharedSourceColorSpace, targets,
+                                  bakeTextures, maxLutError)
 
 def main():
     """
     Main entry point for generating MaterialX definitions using OCIO.
     """
+    if len(sys.argv) > 1 and sys.argv[1] == 'benchmark':
+        import benchmark
+        benchmark.main(sys.argv[2:])
+        return
+
     parser = argparse.ArgumentParser(description="Create Materialx definitions using OCIO.")
     parser.add_argument('--graph', dest='graph', help='Generate a node graph implementations instead of source code.', action='store_true')
     parser.add_argument('--outputPath', dest='outputPath', help='File path to output material files to.')
+    parser.add_argument('--force', dest='force', help='Regenerate all transforms even if the manifest shows they are up to date.', action='store_true')
+    parser.add_argument('--dedupe', dest='dedupe', help='Reference the first of any numerically identical transforms instead of generating duplicates.', action='store_true')
+    parser.add_argument('--library', dest='library', help='Write all transforms into a single library with the given name instead of separate files per transform.')
+    parser.add_argument('--quiet', dest='quiet', help='Do not print progress messages.', action='store_true')
+    parser.add_argument('--trace', dest='trace', help='Write a Chrome trace event JSON file with timings of each generation stage.')
+    parser.add_argument('--targets', dest='targets', nargs='+', default=['genglsl'], choices=['genglsl', 'essl', 'genmsl', 'genosl', 'genhlsl'],
+                        help='MaterialX targets to generate source code implementations for. Default is genglsl. '
+                        'genhlsl is OCIO only as there is no MaterialX HLSL code generator.')
+    parser.add_argument('--targetColorSpaces', dest='targetColorSpaces', nargs='+', default=['lin_rec709'],
+                        help='Target color spaces to generate transforms to. Default is lin_rec709.')
+    parser.add_argument('--reference', dest='reference',
+                        help='Reference color space. Transforms are only generated from each source color space to the reference '
+                        'and from the reference to each target color space. Definitions for other transforms are composed from these.')
+    parser.add_argument('--jobs', dest='jobs', type=int, default=1, help='Number of worker processes to generate transforms with. Default is 1 (serial).')
+    parser.add_argument('--bakeTextures', dest='bakeTextures', action='store_true',
+                        help='Generate transforms which require texture resources, writing the texture data as .npy files, instead of skipping them.')
+    parser.add_argument('--maxLutError', dest='maxLutError', type=float,
+                        help='Approximate LUT1D transforms in node graphs with closed-form curves within this maximum error. Requires NumPy.')
+    parser.add_argument('--writeThreads', dest='writeThreads', type=int, default=4,
+                        help='Number of background threads to write files with. Use 0 to write files before generating the next transform. Default is 4.')
+    parser.add_argument('--cache', dest='cache', help='Folder of an on-disk cache of extracted shader code and transform operations which is reused between runs.')
 
     opts = parser.parse_args()
     outputPath = mx.FilePath("./data/")
@@ -49,24 +436,46 @@ def main():
         print('OCIO version 2.2 or greater is required.')
         return
     
-    print('OCIO version:', ver)
-    print('MaterialX version:', mx.getVersionString())
-
     # Get the OCIO built in configs and write out the configuration information
     # to a markdown file.
-    generator = mxocio.OCIOMaterialaxGenerator()
-    configs, aconfig = generator.getBuiltinConfigs()
-    md = generator.printConfigs(configs)
-    # Save configuration information as markdown
+    instrumentation = mxocio.Instrumentation(enabled=bool(opts.trace))
+    generator = mxocio.OCIOMaterialaxGenerator(instrumentation=instrumentation, verbose=not opts.quiet, diskCache=opts.cache)
+    log = generator.log
+    log('OCIO version:', ver)
+    log('MaterialX version:', mx.getVersionString())
+
+    configs, aconfigEntry = generator.getBuiltinConfigs()
     if not os.path.exists(outputPath.asString()):
         os.makedirs(outputPath.asString())    
+
+    # Reuse the color space index if it is current, so the configurations do not need to be parsed
+    targetColorSpaces = opts.targetColorSpaces
+    indexFile = outputPath / mx.FilePath(INDEX_FILE)
+    index = None if opts.force else colorspaceindex.ColorSpaceIndex.load(indexFile.asString())
+    if not index or not index.isCurrent(ver, mx.getVersionString(), list(configs), targetColorSpaces) or \
+       index.getData().get('generationConfig') != aconfigEntry.getName():
+        with instrumentation.span('buildColorSpaceIndex'):
+            index = colorspaceindex.buildColorSpaceIndex(generator, configs, aconfigEntry.getConfig(), targetColorSpaces)
+        log('Write out color space index to: ' + indexFile.asString())
+        writeFileIfChanged(indexFile.asString(), index.getJSON(), generator)
+    else:
+        instrumentation.count('colorSpaceIndexHits')
+
+    # Save configuration information as markdown
+    md = index.getMarkdownTable()
     configInfoFile = outputPath / mx.FilePath('OCIO_configurations.md')
-    print('Write out OCIO configurations to: ' + configInfoFile.asString())
-    f = open(configInfoFile.asString(), 'w')
-    f.write(md)
+    log('Write out OCIO configurations to: ' + configInfoFile.asString())
+    writeFileIfChanged(configInfoFile.asString(), md, generator)
 
-    sourceColorSpace = "acescg"
-    targetColorSpace = 'lin_rec709'
+    aconfig = aconfigEntry.getConfig()
+    referenceColorSpace = opts.reference
+    if referenceColorSpace and opts.graph:
+        print('A reference color space cannot be used when generating node graphs.')
+        return
+    for colorSpaceName in targetColorSpaces + ([referenceColorSpace] if referenceColorSpace else []):
+        if not aconfig.getColorSpace(colorSpaceName):
+            print('Color space not found in configuration: %s' % colorSpaceName)
+            return
 
     # All code has the same input name
     # It is possible to use a different name than the name used in the generated function ('inPixel')
@@ -74,58 +483,213 @@ def main():
 
     # Generate MaterialX definitions and implementations for all color spaces
     # found in the ACES Cg Config and ACES Studio Config configurations.
-    for c in configs:
-        config = configs[c][0]
-        for colorSpace in config.getColorSpaces():
-            aliases = colorSpace.getAliases()
-            trySource = ''
-            for alias in aliases:
-                # Get alias if it does not contain a space
-                if ' ' not in alias:
-                    trySource = alias
-            if not trySource:
-                trySource = colorSpace.getName()
-            if trySource:
-                sourceColorSpace = trySource
-
-                # Skip if the source and target are the same
-                if sourceColorSpace == targetColorSpace:
+    sourceColorSpaces = index.getSourceColorSpaces()
+
+    # List of [source, target] transforms to generate. With a reference color space only the transforms from each
+    # source to the reference and from the reference to each target are generated. Other transforms are composed.
+    transforms = []
+    if referenceColorSpace:
+        candidates = [[sourceColorSpace, referenceColorSpace] for sourceColorSpace in sourceColorSpaces] + \
+                     [[referenceColorSpace, targetColorSpace] for targetColorSpace in targetColorSpaces]
+    else:
+        candidates = [[sourceColorSpace, targetColorSpace] for targetColorSpace in targetColorSpaces for sourceColorSpace in sourceColorSpaces]
+    for sourceColorSpace, targetColorSpace in candidates:
+        # Skip if the source and target are the same
+        if sourceColorSpace != targetColorSpace:
+            transforms.append([sourceColorSpace, targetColorSpace])
+
+    # Skip transforms which are up to date with respect to the manifest
+    manifest = loadManifest(outputPath, ver, mx.getVersionString())
+    configCacheID = aconfig.getCacheID()
+    # Node graphs do not depend on the target
+    targets = None if opts.graph else opts.targets
+    bakeTextures = opts.bakeTextures and not opts.graph
+    maxLutError = opts.maxLutError if opts.graph else None
+    pendingTransforms = []
+    # Transforms which have definitions, used to compose transforms via the reference color space
+    # and to check that a shared transform exists before it is referenced
+    availableTransforms = set()
+    if opts.library:
+        # The library is regenerated as a whole if any of its inputs change
+        entry = manifest['transforms'].get(opts.library, {})
+        libraryCurrent = isTransformCurrent(manifest, outputPath, opts.library, configCacheID, None, targets, bakeTextures,
+                                            maxLutError, opts.dedupe) and \
+            entry.get('graph') == opts.graph and entry.get('transforms') == transforms and \
+            entry.get('referenceColorSpace') == referenceColorSpace
+        if not opts.force and libraryCurrent:
+            log('--- Skip up to date library:', opts.library, '---')
+        else:
+            for transform in transforms:
+                if transform not in pendingTransforms:
+                    pendingTransforms.append(transform)
+    else:
+        for sourceColorSpace, targetColorSpace in transforms:
+            transformName = getTransformFileName(generator, sourceColorSpace, targetColorSpace, opts.graph)
+            entry = manifest['transforms'].get(transformName, {})
+            # A transform which references a shared transform is only current if the shared transform is too
+            sharedSource = entry.get('sharedSourceColorSpace')
+            if not opts.force and (not sharedSource or (sharedSource, targetColorSpace) in availableTransforms) and \
+               isTransformCurrent(manifest, outputPath, transformName, configCacheID, sharedSource, targets, bakeTextures,
+                                  maxLutError, opts.dedupe):
+                instrumentation.count('skippedUpToDateTransforms')
+                log('--- Skip up to date transform:', sourceColorSpace, 'to', targetColorSpace, '---')
+                if entry['files']:
+                    availableTransforms.add((sourceColorSpace, targetColorSpace))
+                continue
+            # Only generate a transform once per run
+            if [sourceColorSpace, targetColorSpace] not in pendingTransforms:
+                pendingTransforms.append([sourceColorSpace, targetColorSpace])
+
+    # Find transforms generated in this run which are numerically identical to an earlier one to the same target.
+    # Stored as target color space to source color space to shared source color space.
+    sharedSources = {}
+    if opts.dedupe:
+        for targetColorSpace in dict.fromkeys(transform[1] for transform in pendingTransforms):
+            fingerprints = {}
+            targetSharedSources = sharedSources.setdefault(targetColorSpace, {})
+            for sourceColorSpace, transformTarget in pendingTransforms:
+                if transformTarget != targetColorSpace or sourceColorSpace in targetSharedSources:
                     continue
+                cacheID, probeHash = generator.getTransformFingerprint(aconfig, sourceColorSpace, targetColorSpace)
+                sharedSource = fingerprints.get(cacheID) or fingerprints.get(probeHash)
+                if sharedSource and sharedSource != sourceColorSpace:
+                    log('- Transform "%s" to "%s" is identical to "%s" to "%s"' % (sourceColorSpace, targetColorSpace, sharedSource, targetColorSpace))
+                    targetSharedSources[sourceColorSpace] = sharedSource
+                else:
+                    targetSharedSources[sourceColorSpace] = None
+                    for fingerprint in [cacheID, probeHash]:
+                        if fingerprint:
+                            fingerprints.setdefault(fingerprint, sourceColorSpace)
 
-                print('--- Generate transform for source color space:', trySource, '---')
+    def getSharedSource(sourceColorSpace, targetColorSpace):
+        return sharedSources.get(targetColorSpace, {}).get(sourceColorSpace)
 
-                # Generate source code
-                if not opts.graph:
-                    definitionDoc = mx.createDocument()
-                    implDoc = mx.createDocument()
+    def resolveSharedSource(sourceColorSpace, targetColorSpace):
+        # Only reference a shared transform whose files were generated, for example it may require textures.
+        # Otherwise this transform is generated in full, and is shared with the remaining transforms instead.
+        targetSharedSources = sharedSources.get(targetColorSpace, {})
+        sharedSource = targetSharedSources.get(sourceColorSpace)
+        if sharedSource and (sharedSource, targetColorSpace) not in availableTransforms:
+            log('- Shared transform "%s" to "%s" was not generated' % (sharedSource, targetColorSpace))
+            for otherSource, otherSharedSource in targetSharedSources.items():
+                if otherSharedSource == sharedSource:
+                    targetSharedSources[otherSource] = sourceColorSpace
+            targetSharedSources[sourceColorSpace] = None
+            sharedSource = None
+        return sharedSource
 
-                    definition, transformName, code, extension, target = generator.generateOCIO(aconfig, definitionDoc, implDoc, sourceColorSpace, targetColorSpace, 'color4')
+    def recordTransform(sourceColorSpace, targetColorSpace, hashes):
+        transformName = getTransformFileName(generator, sourceColorSpace, targetColorSpace, opts.graph)
+        manifest['transforms'][transformName] = {
+            'configCacheID': configCacheID,
+            'sourceColorSpace': sourceColorSpace,
+            'targetColorSpace': targetColorSpace,
+            'sharedSourceColorSpace': getSharedSource(sourceColorSpace, targetColorSpace),
+            'targets': targets,
+            'bakeTextures': bakeTextures,
+            'maxLutError': maxLutError,
+            'dedupe': opts.dedupe,
+            'files': hashes
+        }
 
-                    # Write the definition, implementation and source code files 
-                    if definition:
+    def generateAll():
+        if opts.jobs > 1:
+            # Generate in parallel and return results in the serial order.
+            from concurrent.futures import ProcessPoolExecutor
+            configUri = 'ocio://' + aconfig.getName()
+            tasks = [(configUri, sourceColorSpace, targetColorSpace, opts.graph, getSharedSource(sourceColorSpace, targetColorSpace), targets,
+                      bakeTextures, maxLutError) for sourceColorSpace, targetColorSpace in pendingTransforms]
+            with ProcessPoolExecutor(max_workers=opts.jobs, initializer=_initWorker, initargs=(not opts.quiet, opts.cache)) as executor:
+                results = executor.map(_generateTransformWorker, tasks)
+                for task, files in zip(tasks, results):
+                    sourceColorSpace, targetColorSpace = task[1], task[2]
+                    sharedSource = resolveSharedSource(sourceColorSpace, targetColorSpace)
+                    if sharedSource != task[4]:
+                        # The shared transform was not generated, so generate this transform in full
+                        files = generateTransformFiles(generator, aconfig, sourceColorSpace, targetColorSpace, opts.graph, IN_PIXEL_STRING,
+                                                       sharedSource, targets, bakeTextures, maxLutError)
+                    log('--- Write transform:', sourceColorSpace, 'to', targetColorSpace, '---')
+                    yield sourceColorSpace, targetColorSpace, files
+        else:
+            for sourceColorSpace, targetColorSpace in pendingTransforms:
+                log('--- Generate transform:', sourceColorSpace, 'to', targetColorSpace, '---')
+                with instrumentation.span('generateTransform', source=sourceColorSpace, destination=targetColorSpace):
+                    files = generateTransformFiles(generator, aconfig, sourceColorSpace, targetColorSpace, opts.graph, IN_PIXEL_STRING,
+                                                   resolveSharedSource(sourceColorSpace, targetColorSpace), targets, bakeTextures,
+                                                   maxLutError)
+                yield sourceColorSpace, targetColorSpace, files
 
-                        filename = outputPath / mx.FilePath(definition.getName() + '.' + 'mtlx')
-                        print('Write MaterialX definition file:', filename.asString())
-                        mx.writeToXmlFile(definitionDoc, filename)
+    def composeAll():
+        # Compose the transforms between all other source and target pairs via the reference color space
+        if not referenceColorSpace:
+            return
+        for targetColorSpace in targetColorSpaces:
+            for sourceColorSpace in dict.fromkeys(sourceColorSpaces):
+                if referenceColorSpace in [sourceColorSpace, targetColorSpace] or sourceColorSpace == targetColorSpace:
+                    continue
+                if (sourceColorSpace, referenceColorSpace) not in availableTransforms or \
+                   (referenceColorSpace, targetColorSpace) not in availableTransforms:
+                    continue
+                # A library is combined from all transforms, otherwise up to date composed transforms are skipped
+                transformName = getTransformFileName(generator, sourceColorSpace, targetColorSpace, opts.graph)
+                if not opts.library and not opts.force and \
+                   manifest['transforms'].get(transformName, {}).get('referenceColorSpace') == referenceColorSpace and \
+                   isTransformCurrent(manifest, outputPath, transformName, configCacheID, None, targets, bakeTextures,
+                                      maxLutError, opts.dedupe):
+                    instrumentation.count('skippedUpToDateTransforms')
+                    log('--- Skip up to date transform:', sourceColorSpace, 'to', targetColorSpace, '---')
+                    continue
+                with instrumentation.span('composeTransform', source=sourceColorSpace, destination=targetColorSpace):
+                    files = generateComposedFiles(generator, aconfig, sourceColorSpace, referenceColorSpace, targetColorSpace, IN_PIXEL_STRING)
+                yield sourceColorSpace, targetColorSpace, files
 
-                        # Write the implementation document
-                        implFileName = outputPath / mx.FilePath('IM_' + transformName + '.' + 'mtlx')
-                        print('Write MaterialX implementation file:', implFileName.asString())
-                        result = mx.writeToXmlFile(implDoc, implFileName)
+    # Files are written in the background while the next transform is generated
+    writer = mxocio.AsyncFileWriter(generator, opts.writeThreads) if opts.writeThreads > 0 else None
 
-                        generator.writeShaderCode(outputPath, code, transformName, extension, target)
-                else:
-                    # Generate node graph
-                    outputType = 'color3'
-                    graphDoc = generator.generateOCIOGraph(aconfig, sourceColorSpace, targetColorSpace, outputType)
-                    if graphDoc:
-                        transformName = generator.createTransformName(sourceColorSpace, targetColorSpace, outputType, 'mxgraph_')
-                        filename = outputPath / mx.FilePath(transformName + '.' + 'mtlx')
-                        print('Write MaterialX node graph definition file:', filename.asString())
-                        mx.writeToXmlFile(graphDoc, filename)
-
-            else:
-                print('Could not find suitable color space name to use: ', colorSpace.getName())
+    if opts.library:
+        if pendingTransforms:
+            results = []
+            for sourceColorSpace, targetColorSpace, files in generateAll():
+                results.append(files)
+                if files:
+                    availableTransforms.add((sourceColorSpace, targetColorSpace))
+            results.extend([files for sourceColorSpace, targetColorSpace, files in composeAll()])
+            with instrumentation.span('combineLibrary', library=opts.library):
+                libraryFiles = combineTransformFiles(generator, results, opts.library)
+            manifest['transforms'][opts.library] = {
+                'configCacheID': configCacheID,
+                'graph': opts.graph,
+                'transforms': transforms,
+                'referenceColorSpace': referenceColorSpace,
+                'dedupe': opts.dedupe,
+                'sharedSourceColorSpaces': sharedSources,
+                'targets': targets,
+                'bakeTextures': bakeTextures,
+                'maxLutError': maxLutError,
+                'files': writeTransformFiles(outputPath, libraryFiles, generator, writer)
+            }
+    else:
+        for sourceColorSpace, targetColorSpace, files in generateAll():
+            recordTransform(sourceColorSpace, targetColorSpace, writeTransformFiles(outputPath, files, generator, writer))
+            if files:
+                availableTransforms.add((sourceColorSpace, targetColorSpace))
+        for sourceColorSpace, targetColorSpace, files in composeAll():
+            recordTransform(sourceColorSpace, targetColorSpace, writeTransformFiles(outputPath, files, generator, writer))
+            manifest['transforms'][getTransformFileName(generator, sourceColorSpace, targetColorSpace, opts.graph)]['referenceColorSpace'] = referenceColorSpace
+
+    # The manifest is only saved once all files have been written
+    if writer:
+        with instrumentation.span('flushWriter'):
+            writer.close()
+    saveManifest(outputPath, manifest, generator)
+
+    if opts.trace:
+        instrumentation.writeChromeTrace(opts.trace)
+        print('Wrote trace to:', opts.trace)
+        for name, summary in sorted(instrumentation.getSpanSummary().items()):
+            print('- %s: %d spans, total %.4fs' % (name, summary['count'], summary['total']))
+        for name in sorted(instrumentation.counters):
+            print('- %s: %d' % (name, instrumentation.counters[name]))
 
 
 if __name__ == '__main__':
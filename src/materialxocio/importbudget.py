@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+'''
+Check the import time of the MaterialX OCIO modules against a budget.
+
+Each module is imported in a new Python process using `-X importtime`, and the cumulative import time
+of the module is compared with the budget. The check also fails if importing a module loads PyOpenColorIO,
+MaterialX or NumPy, which should only be imported on first use. The first import of each module is not
+measured so that the byte code cache is warm, and the fastest of the remaining imports is used.
+
+Example usage:
+```
+python importbudget.py --budget 75
+```
+'''
+
+import os, sys, json, argparse, subprocess
+
+# Modules checked by default. These are imported by the command line utilities and short lived processes.
+MODULES = ['core', 'colorspaceindex', 'genOCIODefinitions']
+
+# Modules which must not be loaded by importing a checked module.
+HEAVY_MODULES = ['PyOpenColorIO', 'MaterialX', 'numpy']
+
+def measureImport(module, path):
+    '''
+    Import a module in a new Python process and measure its import time.
+    @param module: The module name.
+    @param path: The folder to import the module from.
+    @return: A tuple of the cumulative import time in milliseconds and the list of heavy modules which were loaded.
+    '''
+    code = 'import %s; import sys; print(\',\'.join([m for m in %r if m in sys.modules]))' % (module, HEAVY_MODULES)
+    # Allow byte code to be written so that only the first import pays for compilation
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=path, env=env,
+                            capture_output=True, text=True, check=True)
+
+    # Lines are of the form "import time: self [us] | cumulative | imported package"
+    importTime = None
+    for line in result.stderr.splitlines():
+        fields = line.split('|')
+        if len(fields) == 3 and fields[2].strip() == module and not fields[2].startswith('  '):
+            importTime = int(fields[1]) / 1000.0
+    loaded = result.stdout.strip().splitlines()[-1] if result.stdout.strip() else ''
+    return importTime, [name for name in loaded.split(',') if name]
+
+def checkImportBudget(modules, path, budget, repeat = 5):
+    '''
+    Check the import time of modules against a budget.
+    @param modules: The list of module names.
+    @param path: The folder to import the modules from.
+    @param budget: The maximum import time of each module in milliseconds.
+    @param repeat: The number of measured imports of each module. Default is 5.
+    @return: A dictionary of module name to a dictionary with the fastest import 'time' in milliseconds, the
+    'heavyModules' loaded and whether the module is 'withinBudget'.
+    '''
+    results = {}
+    for module in modules:
+        measureImport(module, path)
+        times = []
+        heavyModules = []
+        for run in range(repeat):
+            importTime, loaded = measureImport(module, path)
+            times.append(importTime)
+            heavyModules = sorted(set(heavyModules) | set(loaded))
+        fastest = min(times)
+        results[module] = {
+            'time': fastest,
+            'heavyModules': heavyModules,
+            'withinBudget': fastest <= budget and not heavyModules
+        }
+    return results
+
+def main():
+    '''
+    Check the import time of the modules and return a non-zero exit code if any exceeds the budget.
+    '''
+    parser = argparse.ArgumentParser(description="Check the import time of MaterialX OCIO modules against a budget.")
+    parser.add_argument('--modules', dest='modules', nargs='+', default=MODULES, help='Modules to check. Default is %s.' % ' '.join(MODULES))
+    parser.add_argument('--budget', dest='budget', type=float, default=75.0, help='Maximum import time of each module in milliseconds. Default is 75.')
+    parser.add_argument('--repeat', dest='repeat', type=int, default=5, help='Number of measured imports of each module. Default is 5.')
+    parser.add_argument('--output', dest='output', help='File to write JSON results to.')
+    opts = parser.parse_args()
+
+    path = os.path.dirname(os.path.abspath(__file__))
+    results = checkImportBudget(opts.modules, path, opts.budget, opts.repeat)
+
+    failures = 0
+    for module, result in results.items():
+        status = 'OK' if result['withinBudget'] else 'FAILED'
+        if status != 'OK':
+            failures += 1
+        message = '- %s: %.1f ms (budget %.1f ms)' % (module, result['time'], opts.budget)
+        if result['heavyModules']:
+            message += ', loads ' + ', '.join(result['heavyModules'])
+        print('%s [%s]' % (message, status))
+
+    if opts.output:
+        with open(opts.output, 'w') as f:
+            f.write(json.dumps({ 'budget': opts.budget, 'modules': results }, indent=2, sort_keys=True) + '\n')
+        print('Wrote import times to:', opts.output)
+
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
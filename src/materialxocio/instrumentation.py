@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+'''
+Structured instrumentation for the MaterialX OCIO generation pipeline.
+
+Timed spans and counters are recorded by OCIOMaterialaxGenerator and the command line utilities, and can be
+exported as Chrome trace event JSON.
+
+Example usage:
+```
+from materialxocio.instrumentation import Instrumentation
+
+instrumentation = Instrumentation()
+with instrumentation.span('generate', source='srgb_tx'):
+    ...
+instrumentation.writeChromeTrace('trace.json')
+```
+'''
+
+import os
+import time
+import json
+import threading
+import contextlib
+
+class Instrumentation():
+    '''
+    Structured instrumentation for the generation pipeline.
+    Records timed spans and counters, forwards them to any registered listeners, and can
+    export the recorded spans as Chrome trace event JSON (viewable in chrome://tracing or Perfetto).
+    When disabled, spans and counters have negligible overhead.
+    '''
+
+    def __init__(self, enabled = True, record = True):
+        '''
+        Constructor.
+        @param enabled: Whether spans and counters are processed at all. Default is True.
+        @param record: Whether spans are kept in memory for export. Listeners are called either way. Default is True.
+        '''
+        self.enabled = enabled
+        self.record = record
+        self.listeners = []
+        self.counters = {}
+        self.events = []
+        self.startTime = time.perf_counter()
+        self.lock = threading.Lock()
+
+    def addListener(self, listener):
+        '''
+        Add a listener which is called for every event.
+        @param listener: A function taking the event kind ('span', 'counter' or 'log'), the event name
+        and a dictionary of event data.
+        '''
+        self.listeners.append(listener)
+
+    def removeListener(self, listener):
+        '''
+        Remove a previously added listener.
+        @param listener: The listener to remove.
+        '''
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def notify(self, kind, name, data):
+        '''
+        Notify all listeners of an event.
+        '''
+        for listener in self.listeners:
+            listener(kind, name, data)
+
+    def span(self, name, **args):
+        '''
+        Get a context manager which times a span of work.
+        @param name: The span name, for example 'processor' or 'extractShader'.
+        @param args: Additional values to record with the span.
+        @return: A context manager.
+        '''
+        if not self.enabled:
+            return contextlib.nullcontext()
+        return self._span(name, args)
+
+    @contextlib.contextmanager
+    def _span(self, name, args):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            data = { 'start': start - self.startTime, 'duration': duration, 'args': args,
+                     'thread': threading.get_ident() }
+            if self.record:
+                with self.lock:
+                    self.events.append((name, data))
+            self.notify('span', name, data)
+
+    def count(self, name, value = 1):
+        '''
+        Increment a counter.
+        @param name: The counter name, for example 'processorCacheHits' or 'bytesWritten'.
+        @param value: The amount to increment by. Default is 1.
+        '''
+        if not self.enabled:
+            return
+        with self.lock:
+            total = self.counters.get(name, 0) + value
+            self.counters[name] = total
+        self.notify('counter', name, { 'value': value, 'total': total })
+
+    def log(self, message):
+        '''
+        Send a progress message to listeners.
+        @param message: The message string.
+        '''
+        if self.enabled:
+            self.notify('log', message, {})
+
+    def getSpanSummary(self):
+        '''
+        Get a summary of the recorded spans.
+        @return: A dictionary of span name to count and total duration in seconds.
+        '''
+        summary = {}
+        with self.lock:
+            for name, data in self.events:
+                entry = summary.setdefault(name, { 'count': 0, 'total': 0.0 })
+                entry['count'] += 1
+                entry['total'] += data['duration']
+        return summary
+
+    def getChromeTrace(self):
+        '''
+        Get the recorded spans and counters in Chrome trace event format.
+        @return: A dictionary which can be serialized to JSON.
+        '''
+        pid = os.getpid()
+        traceEvents = []
+        with self.lock:
+            for name, data in self.events:
+                traceEvents.append({ 'name': name, 'cat': 'materialxocio', 'ph': 'X', 'pid': pid, 'tid': data['thread'],
+                                     'ts': data['start'] * 1e6, 'dur': data['duration'] * 1e6, 'args': data['args'] })
+            end = time.perf_counter() - self.startTime
+            for name in sorted(self.counters):
+                traceEvents.append({ 'name': name, 'cat': 'materialxocio', 'ph': 'C', 'pid': pid, 'tid': 0,
+                                     'ts': end * 1e6, 'args': { name: self.counters[name] } })
+        return { 'traceEvents': traceEvents, 'displayTimeUnit': 'ms' }
+
+    def writeChromeTrace(self, filename):
+        '''
+        Write the recorded spans and counters as a Chrome trace event JSON file.
+        @param filename: The file path string.
+        '''
+        with open(filename, 'w') as f:
+            json.dump(self.getChromeTrace(), f)
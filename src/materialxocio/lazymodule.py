@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+'''
+Lazily imported modules.
+
+PyOpenColorIO, MaterialX and NumPy take much longer to import than the MaterialX OCIO modules themselves,
+so they are bound to LazyModule proxies which only import the module when it is first used.
+
+Example usage:
+```
+from materialxocio.lazymodule import LazyModule
+
+np = LazyModule('numpy')
+if np.isAvailable():
+    values = np.zeros(3)
+```
+'''
+
+import importlib
+import importlib.util
+
+class LazyModule():
+    '''
+    A module which is only imported when one of its attributes is first accessed, so that importing a module
+    which uses it does not pay the cost of loading PyOpenColorIO, MaterialX or NumPy until they are required.
+    '''
+
+    def __init__(self, name):
+        '''
+        Constructor.
+        @param name: The name of the module to import.
+        '''
+        self._name = name
+        self._module = None
+        self._available = None
+
+    def load(self):
+        '''
+        Import the module if it has not been imported yet.
+        @return: The module.
+        '''
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def isLoaded(self):
+        '''
+        Return whether the module has been imported.
+        '''
+        return self._module is not None
+
+    def isAvailable(self):
+        '''
+        Return whether the module is installed, without importing it.
+        '''
+        if self._available is None:
+            self._available = self._module is not None or importlib.util.find_spec(self._name) is not None
+        return self._available
+
+    def __getattr__(self, name):
+        return getattr(self.load(), name)
+
+    def __repr__(self):
+        return '<lazy module %s%s>' % (self._name, '' if self._module is None else ' (loaded)')
@@ -0,0 +1,402 @@
+#!/usr/bin/env python
+'''
+A local HTTP service which generates MaterialX color transforms on request.
+
+The service keeps a single OCIOMaterialaxGenerator alive, so configurations, processors and extracted
+shader code stay warm between requests, and each generated response is kept in memory so that repeated
+requests are answered without generating anything. The service listens on a localhost TCP port,
+or on a Unix domain socket with `--socket`.
+
+Endpoints:
+- `GET /transform?source=X&target=Y&language=genglsl&type=color4`: Returns the transform as JSON with the
+  definition and implementation documents, the source code, and the function and definition names for the
+  requested type (`color3` or `color4`). Add `graph=1` to return a color3 node graph instead of source code, and
+  `textures=1` to generate transforms which require textures, returning the texture data as base64 `.npy` files.
+  An optional `config` selects a built-in configuration by name or "ocio://" URI. The default is the configuration the
+  service was started with, which is the ACES Cg Config used by `genOCIODefinitions.py` unless `--config` is given.
+  Configuration files can only be selected with `--config`.
+- `GET /colorspaces?config=NAME`: Returns the names of the color spaces of a configuration.
+- `GET /metrics`: Returns request counts, response cache hits and misses, generator cache statistics and latencies.
+
+Example usage:
+```
+python service.py --port 8765 --preload
+curl "http://127.0.0.1:8765/transform?source=srgb_tx&target=lin_rec709&language=genglsl&type=color3"
+```
+'''
+
+import os, sys, json, time, base64, argparse, threading, socket, socketserver
+from collections import OrderedDict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+try:
+    from . import core as mxocio
+except ImportError:
+    import core as mxocio
+
+class TransformService():
+    '''
+    Generates color transforms on request using a long lived OCIOMaterialaxGenerator and caches the encoded responses.
+    '''
+
+    def __init__(self, generator = None, config = None, responseCacheSize = 4096, latencySamples = 10000):
+        '''
+        Constructor.
+        @param generator: The OCIOMaterialaxGenerator to use. A quiet generator with instrumentation is created if not specified.
+        @param config: The default OCIO configuration or the name of a built-in configuration. Default is the
+        configuration returned by OCIOMaterialaxGenerator.getBuiltinConfigs().
+        @param responseCacheSize: Maximum number of encoded responses to keep. Least recently used responses are evicted first. Default is 4096.
+        @param latencySamples: Number of most recent request latencies used for the latency metrics. Default is 10000.
+        '''
+        self.generator = generator if generator else mxocio.OCIOMaterialaxGenerator(verbose=False, instrumentation=mxocio.Instrumentation(record=False))
+        self.configName = config if isinstance(config, str) else None
+        if config is None:
+            config = self.generator.getBuiltinConfigs()[1].getConfig()
+        elif isinstance(config, str):
+            config = self.generator.getConfig(config)
+        self.config = config
+        self.responseCacheSize = responseCacheSize
+        self.responses = OrderedDict()
+        self.responseCacheHits = 0
+        self.responseCacheMisses = 0
+        # Generation is serialized. Cached responses only need the cache lock.
+        self.generateLock = threading.Lock()
+        self.cacheLock = threading.Lock()
+        self.metricsLock = threading.Lock()
+        self.requests = {}
+        self.errors = 0
+        self.latencies = deque(maxlen=latencySamples)
+        self.generateTimes = deque(maxlen=latencySamples)
+        self.startTime = time.time()
+
+    def isConfigAllowed(self, name):
+        '''
+        Check if requests may select a configuration. Requests may only select built-in configurations and the
+        configuration the service was started with, so that they cannot read arbitrary files.
+        @param name: The configuration name from the request.
+        @return: True if the configuration may be used.
+        '''
+        if not name or name == self.configName or name.startswith('ocio://'):
+            return True
+        return name in self.generator.getBuiltinConfigNames()
+
+    def getConfig(self, name = None):
+        '''
+        Get a configuration by name.
+        @param name: The name of a built-in configuration or an "ocio://" URI. Default is the service configuration.
+        @return: The OCIO configuration.
+        '''
+        if not name or name == self.configName:
+            return self.config
+        if not self.isConfigAllowed(name):
+            raise ValueError('Unsupported config: %s' % name)
+        with self.generateLock:
+            return self.generator.getConfig(name)
+
+    def getTransform(self, source, target, language = 'genglsl', type = 'color4', graph = False, textures = False, config = None):
+        '''
+        Get a transform, generating it on the first request. The responses for both types are created from one generation.
+        @param source: The source color space.
+        @param target: The target color space.
+        @param language: The MaterialX target to generate source code for. Default is 'genglsl'.
+        @param type: The type of the transform, 'color3' or 'color4'. Default is 'color4'.
+        @param graph: Return a color3 node graph instead of source code. Default is False.
+        @param textures: Generate transforms which require texture resources. Default is False.
+        @param config: Optional configuration name. See isConfigAllowed(). Default is the service configuration.
+        @return: A tuple of the HTTP status and the encoded JSON response.
+        '''
+        if type not in ['color3', 'color4']:
+            return 400, self.encode({ 'error': 'Unsupported type: %s' % type })
+        if not graph and not self.generator.getTargetLanguages([language]):
+            return 400, self.encode({ 'error': 'Unsupported language: %s' % language })
+        if not self.isConfigAllowed(config):
+            return 400, self.encode({ 'error': 'Unsupported config: %s' % config })
+        if config == self.configName:
+            config = None
+
+        key = (config, source, target, None if graph else language, type, graph, textures)
+        with self.cacheLock:
+            response = self.responses.get(key)
+            if response is not None:
+                self.responseCacheHits += 1
+                self.responses.move_to_end(key)
+                return response
+
+        with self.generateLock:
+            # Another request may have generated the transform while waiting
+            with self.cacheLock:
+                response = self.responses.get(key)
+            if response is None:
+                start = time.perf_counter()
+                responses = self.generateResponses(source, target, language, graph, textures, config)
+                response = responses[type]
+                with self.metricsLock:
+                    self.generateTimes.append(time.perf_counter() - start)
+                with self.cacheLock:
+                    self.responseCacheMisses += 1
+                    for typeName, typeResponse in responses.items():
+                        self.responses[(config, source, target, None if graph else language, typeName, graph, textures)] = typeResponse
+                    self.responses.move_to_end(key)
+                    while len(self.responses) > self.responseCacheSize:
+                        self.responses.popitem(last=False)
+        return response
+
+    def generateResponses(self, source, target, language, graph, textures, config):
+        '''
+        Generate a transform and encode the responses for each type.
+        @return: A dictionary of type to a tuple of the HTTP status and the encoded JSON response.
+        '''
+        try:
+            ocioConfig = self.generator.getConfig(config) if config else self.config
+            result = self.generator.generateTransformResult(ocioConfig, source, target, [language], graph, 'in', None, textures)
+        except Exception as err:
+            response = 400, self.encode({ 'error': str(err) })
+            return { 'color3': response, 'color4': response }
+        if not result.definition:
+            response = 404, self.encode({ 'error': 'Transform could not be generated: %s to %s' % (source, target) })
+            return { 'color3': response, 'color4': response }
+        if graph:
+            # Node graphs are only generated for color3
+            response = self.encodeResponse(result, source, target, language, 'color3')
+            return { 'color3': response, 'color4': response }
+        return { type: self.encodeResponse(result, source, target, language, type) for type in ['color3', 'color4'] }
+
+    def encodeResponse(self, result, source, target, language, typeName):
+        '''
+        Encode the response for a generated transform.
+        @param result: The TransformResult.
+        @param typeName: The type of the transform, 'color3' or 'color4'.
+        @return: A tuple of the HTTP status and the encoded JSON response.
+        '''
+        graph = result.graph
+        data = {
+            'source': source,
+            'target': target,
+            'type': typeName,
+            'graph': graph,
+            'definitionName': result.definitionName if graph else result.definitionName[:-len('color4')] + typeName,
+            'definition': result.definition,
+            'timings': dict(result.timings)
+        }
+        if not graph:
+            extension, code = result.sources[language]
+            data['language'] = language
+            data['functionName'] = self.generator.createTransformName(source, target, typeName)
+            data['implementation'] = result.implementation
+            data['extension'] = extension
+            data['code'] = code
+            data['textures'] = { name: base64.b64encode(value).decode('ascii') for name, value in result.textures.items() }
+        return 200, self.encode(data)
+
+    def encode(self, data):
+        '''
+        Encode a response as JSON bytes.
+        '''
+        return json.dumps(data, sort_keys=True).encode('utf-8')
+
+    def getColorSpaces(self, config = None):
+        '''
+        Get the color space names of a configuration.
+        @param config: Optional configuration name. Default is the service configuration.
+        @return: A tuple of the HTTP status and the encoded JSON response.
+        '''
+        try:
+            ocioConfig = self.getConfig(config)
+        except Exception as err:
+            return 400, self.encode({ 'error': str(err) })
+        return 200, self.encode({ 'config': ocioConfig.getName(), 'colorSpaces': list(ocioConfig.getColorSpaceNames()) })
+
+    def getPercentiles(self, values):
+        '''
+        Get latency statistics in milliseconds.
+        @param values: A list of durations in seconds.
+        @return: A dictionary with the count, mean, p50, p90, p99 and max values.
+        '''
+        if not values:
+            return { 'count': 0 }
+        ordered = sorted(values)
+        def percentile(p):
+            return ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000.0
+        return {
+            'count': len(ordered),
+            'mean': sum(ordered) / len(ordered) * 1000.0,
+            'p50': percentile(0.5),
+            'p90': percentile(0.9),
+            'p99': percentile(0.99),
+            'max': ordered[-1] * 1000.0
+        }
+
+    def getMetrics(self):
+        '''
+        Get the service metrics.
+        @return: A dictionary of request counts, cache statistics and latencies in milliseconds.
+        '''
+        generator = self.generator
+        with self.metricsLock:
+            latencies = list(self.latencies)
+            generateTimes = list(self.generateTimes)
+            requests = dict(self.requests)
+            errors = self.errors
+        with self.cacheLock:
+            responseCache = { 'size': len(self.responses), 'maxSize': self.responseCacheSize,
+                              'hits': self.responseCacheHits, 'misses': self.responseCacheMisses }
+        return {
+            'uptime': time.time() - self.startTime,
+            'requests': requests,
+            'errors': errors,
+            'responseCache': responseCache,
+            'processorCache': { 'size': len(generator.processorCache), 'maxSize': generator.processorCacheSize,
+                                'hits': generator.processorCacheHits, 'misses': generator.processorCacheMisses },
+            'diskCache': { 'size': len(generator.diskCache.values), 'maxSize': generator.diskCache.maxSize,
+                           'hits': generator.diskCache.hits, 'misses': generator.diskCache.misses } if generator.diskCache else None,
+            'configs': sorted(generator.configCache),
+            'counters': dict(generator.instrumentation.counters),
+            'latency': self.getPercentiles(latencies),
+            'generateLatency': self.getPercentiles(generateTimes)
+        }
+
+    def handle(self, path):
+        '''
+        Handle a request.
+        @param path: The request path including the query string.
+        @return: A tuple of the HTTP status and the encoded JSON response.
+        '''
+        start = time.perf_counter()
+        url = urlsplit(path)
+        query = { name: values[-1] for name, values in parse_qs(url.query).items() }
+        if url.path == '/transform':
+            if 'source' not in query or 'target' not in query:
+                status, response = 400, self.encode({ 'error': 'The source and target parameters are required.' })
+            else:
+                status, response = self.getTransform(query['source'], query['target'], query.get('language', 'genglsl'),
+                                                     query.get('type', 'color4'), query.get('graph') in ['1', 'true'],
+                                                     query.get('textures') in ['1', 'true'], query.get('config'))
+        elif url.path == '/colorspaces':
+            status, response = self.getColorSpaces(query.get('config'))
+        elif url.path == '/metrics':
+            status, response = 200, self.encode(self.getMetrics())
+        else:
+            status, response = 404, self.encode({ 'error': 'Unknown endpoint: %s' % url.path })
+
+        with self.metricsLock:
+            self.requests[url.path] = self.requests.get(url.path, 0) + 1
+            if status != 200:
+                self.errors += 1
+            self.latencies.append(time.perf_counter() - start)
+        return status, response
+
+    def preload(self, targetColorSpace = 'lin_rec709', languages = None, types = None):
+        '''
+        Generate the transforms from every color space of the service configuration to a target color space,
+        so that the first requests for them are served from the cache. Each transform is generated once for all types.
+        @param targetColorSpace: The target color space. Default is 'lin_rec709'.
+        @param languages: The list of MaterialX targets. Default is ['genglsl'].
+        @param types: The list of types. Default is ['color3', 'color4'].
+        @return: The number of transforms which could be generated.
+        '''
+        count = 0
+        for source in self.config.getColorSpaceNames():
+            if source == targetColorSpace:
+                continue
+            for language in languages or ['genglsl']:
+                for type in types or ['color3', 'color4']:
+                    status, response = self.getTransform(source, targetColorSpace, language, type)
+                    if status == 200:
+                        count += 1
+        return count
+
+class TransformRequestHandler(BaseHTTPRequestHandler):
+    '''
+    HTTP request handler which forwards GET requests to the TransformService of the server.
+    '''
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        status, response = self.server.service.handle(self.path)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def address_string(self):
+        # Unix domain socket clients have no address
+        return self.client_address[0] if self.client_address else 'local'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            BaseHTTPRequestHandler.log_message(self, format, *args)
+
+class TransformHTTPServer(ThreadingHTTPServer):
+    '''
+    Threaded HTTP server for a TransformService on a TCP port.
+    '''
+    daemon_threads = True
+
+    def __init__(self, address, service, verbose = False):
+        self.service = service
+        self.verbose = verbose
+        ThreadingHTTPServer.__init__(self, address, TransformRequestHandler)
+
+if hasattr(socket, 'AF_UNIX'):
+    class TransformUnixServer(socketserver.ThreadingUnixStreamServer):
+        '''
+        Threaded HTTP server for a TransformService on a Unix domain socket.
+        '''
+        daemon_threads = True
+
+        def __init__(self, path, service, verbose = False):
+            self.service = service
+            self.verbose = verbose
+            socketserver.ThreadingUnixStreamServer.__init__(self, path, TransformRequestHandler)
+
+def main():
+    '''
+    Run the transform service until interrupted.
+    '''
+    parser = argparse.ArgumentParser(description="Serve MaterialX color transforms generated using OCIO from a long running local process.")
+    parser.add_argument('--host', dest='host', default='127.0.0.1', help='Host to listen on. Default is 127.0.0.1.')
+    parser.add_argument('--port', dest='port', type=int, default=8765, help='TCP port to listen on. Default is 8765.')
+    parser.add_argument('--socket', dest='socket', help='Listen on a Unix domain socket at this path instead of a TCP port.')
+    parser.add_argument('--config', dest='config', help='Default built-in configuration name or configuration file. Default is the ACES Cg Config.')
+    parser.add_argument('--cache', dest='cache', help='Folder of an on-disk cache of extracted shader code and transform operations.')
+    parser.add_argument('--preload', dest='preload', action='store_true', help='Generate all transforms to --targetColorSpace before serving requests.')
+    parser.add_argument('--targetColorSpace', dest='targetColorSpace', default='lin_rec709', help='Target color space to preload. Default is lin_rec709.')
+    parser.add_argument('--targets', dest='targets', nargs='+', default=['genglsl'], help='MaterialX targets to preload. Default is genglsl.')
+    parser.add_argument('--verbose', dest='verbose', action='store_true', help='Log each request.')
+    opts = parser.parse_args()
+
+    generator = mxocio.OCIOMaterialaxGenerator(verbose=False, instrumentation=mxocio.Instrumentation(record=False), diskCache=opts.cache)
+    service = TransformService(generator, opts.config)
+    if opts.preload:
+        start = time.perf_counter()
+        count = service.preload(opts.targetColorSpace, opts.targets)
+        print('Preloaded %d transforms in %.2fs' % (count, time.perf_counter() - start))
+
+    if opts.socket:
+        if not hasattr(socket, 'AF_UNIX'):
+            print('Unix domain sockets are not supported on this platform.')
+            return 1
+        if os.path.exists(opts.socket):
+            os.remove(opts.socket)
+        server = TransformUnixServer(opts.socket, service, opts.verbose)
+        print('Serving on unix socket:', opts.socket)
+    else:
+        server = TransformHTTPServer((opts.host, opts.port), service, opts.verbose)
+        print('Serving on http://%s:%d/' % (opts.host, server.server_address[1]))
+    sys.stdout.flush()
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if opts.socket and os.path.exists(opts.socket):
+            os.remove(opts.socket)
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,111 @@
+'''
+Check applying transforms to pixels using the tiled OCIO CPU processor. See OCIOMaterialaxGenerator.applyTransform().
+
+Run from the repository root using:
+```
+python -m pytest tests
+```
+'''
+
+import os, sys, unittest
+
+PACKAGE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'materialxocio')
+sys.path.insert(0, PACKAGE_PATH)
+
+import core as mxocio
+from instrumentation import Instrumentation
+
+np = mxocio.np
+
+CONFIG = 'ocio://studio-config-latest'
+SOURCE_COLOR_SPACE = 'sRGB - Texture'
+TARGET_COLOR_SPACE = 'ACEScg'
+
+@unittest.skipUnless(np.isAvailable(), 'NumPy is not installed')
+class TestApplyTransform(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.generator = mxocio.OCIOMaterialaxGenerator(verbose=False, instrumentation=Instrumentation())
+        cls.config = cls.generator.getConfig(CONFIG)
+
+    def createPixels(self, shape, dtype = np.float32):
+        return np.random.default_rng(0).uniform(-0.25, 2.0, shape).astype(dtype)
+
+    def getExpected(self, pixels):
+        '''
+        Apply the transform to all pixels at once.
+        '''
+        expected = np.ascontiguousarray(pixels, dtype=np.float32).reshape(-1, pixels.shape[-1]).copy()
+        processor = self.config.getProcessor(SOURCE_COLOR_SPACE, TARGET_COLOR_SPACE).getDefaultCPUProcessor()
+        if pixels.shape[-1] == 4:
+            processor.applyRGBA(expected)
+        else:
+            processor.applyRGB(expected)
+        return expected.reshape(pixels.shape)
+
+    def applyTransform(self, pixels, **args):
+        return self.generator.applyTransform(self.config, SOURCE_COLOR_SPACE, TARGET_COLOR_SPACE, pixels, **args)
+
+    def test_tiles(self):
+        for channels in [3, 4]:
+            pixels = self.createPixels((61, 37, channels))
+            expected = self.getExpected(pixels)
+            # Tiles which do not divide the image, processed serially and on several threads
+            for tileSize, threads in [[500, 1], [500, 4], [1, 2], [1 << 20, 4]]:
+                with self.subTest(channels=channels, tileSize=tileSize, threads=threads):
+                    result = self.applyTransform(pixels, inPlace=False, tileSize=tileSize, threads=threads)
+                    # OCIO uses approximate SIMD functions on blocks of pixels, so the pixels of partial blocks
+                    # may differ slightly depending on the tiles
+                    np.testing.assert_allclose(result, expected, rtol=1e-4, atol=1e-6)
+            if channels == 4:
+                # Alpha is passed through, within the precision of the approximate functions
+                np.testing.assert_allclose(result[..., 3], pixels[..., 3], rtol=1e-4, atol=1e-6)
+
+    def test_inPlace(self):
+        pixels = self.createPixels((20, 30, 3))
+        original = pixels.copy()
+        expected = self.getExpected(pixels)
+
+        result = self.applyTransform(pixels, inPlace=False, tileSize=64)
+        np.testing.assert_array_equal(pixels, original)
+        self.assertIsNot(result, pixels)
+
+        self.assertIs(self.applyTransform(pixels, tileSize=64), pixels)
+        np.testing.assert_array_equal(pixels, expected)
+
+        # Non contiguous arrays are processed through a copy which is written back
+        image = self.createPixels((20, 30, 3))
+        view = image[:, ::2]
+        expected = self.getExpected(view)
+        untouched = image[:, 1::2].copy()
+        self.assertIs(self.applyTransform(view, tileSize=64), view)
+        np.testing.assert_array_equal(image[:, ::2], expected)
+        np.testing.assert_array_equal(image[:, 1::2], untouched)
+
+    def test_half(self):
+        pixels = self.createPixels((16, 16, 4), np.float16)
+        result = self.applyTransform(pixels, inPlace=False, tileSize=100, threads=2)
+        self.assertEqual(result.dtype, np.float16)
+        np.testing.assert_allclose(result.astype(np.float32), self.getExpected(pixels.astype(np.float32)), rtol=2e-3, atol=2e-3)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            self.applyTransform(np.zeros((4, 3), dtype=np.float64))
+        with self.assertRaises(ValueError):
+            self.applyTransform(np.zeros((4, 2), dtype=np.float32))
+        pixels = np.zeros((4, 3), dtype=np.float32)
+        pixels.flags.writeable = False
+        with self.assertRaises(ValueError):
+            self.applyTransform(pixels)
+        # Read-only pixels can be transformed to a new array
+        self.assertEqual(self.applyTransform(pixels, inPlace=False).shape, (4, 3))
+
+    def test_count(self):
+        counters = self.generator.instrumentation.counters
+        count = counters.get('pixelsTransformed', 0)
+        self.applyTransform(self.createPixels((10, 10, 3)))
+        self.assertEqual(counters['pixelsTransformed'], count + 100)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+'''
+Check the background writing of generated files. See asyncwriter.py.
+
+Run from the repository root using:
+```
+python -m pytest tests
+```
+'''
+
+import os, sys, shutil, tempfile, threading, unittest
+
+PACKAGE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'materialxocio')
+sys.path.insert(0, PACKAGE_PATH)
+
+import core as mxocio
+from asyncwriter import AsyncFileWriter
+from instrumentation import Instrumentation
+
+class TestAsyncFileWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path)
+        self.generator = mxocio.OCIOMaterialaxGenerator(verbose=False, instrumentation=Instrumentation())
+        # Record the content of each write in the order the files are written
+        self.written = []
+        self.release = threading.Event()
+        self.release.set()
+        writeFile = self.generator.writeFile
+        def recordWrite(filename, content):
+            self.release.wait()
+            self.written.append((os.path.basename(filename), content))
+            writeFile(filename, content)
+        self.generator.writeFile = recordWrite
+
+    def getFileName(self, name):
+        return os.path.join(self.path, name)
+
+    def test_ordering(self):
+        with AsyncFileWriter(self.generator, maxWorkers=4) as writer:
+            for i in range(20):
+                writer.write(self.getFileName('a.glsl'), 'a%d' % i)
+                writer.write(self.getFileName('b.glsl'), 'b%d' % i)
+        # Writes to the same file are applied in the order they are queued
+        for name in ['a', 'b']:
+            self.assertEqual([content for filename, content in self.written if filename == name + '.glsl'],
+                             ['%s%d' % (name, i) for i in range(20)])
+            with open(self.getFileName(name + '.glsl'), 'r') as f:
+                self.assertEqual(f.read(), name + '19')
+        self.assertEqual(self.generator.instrumentation.counters['asyncWrites'], 40)
+
+    def test_backpressure(self):
+        self.release.clear()
+        writer = AsyncFileWriter(self.generator, maxWorkers=1, maxPending=2)
+        writer.write(self.getFileName('a.glsl'), 'a')
+        writer.write(self.getFileName('b.glsl'), 'b')
+
+        # The queue is full so the next write waits for a queued write to complete
+        thread = threading.Thread(target=writer.write, args=(self.getFileName('c.glsl'), 'c'))
+        thread.start()
+        thread.join(0.2)
+        self.assertTrue(thread.is_alive())
+        self.assertEqual(self.written, [])
+
+        self.release.set()
+        thread.join()
+        writer.close()
+        self.assertEqual(sorted(self.written), [('a.glsl', 'a'), ('b.glsl', 'b'), ('c.glsl', 'c')])
+        self.assertEqual(self.generator.instrumentation.counters['writerQueueFull'], 1)
+
+    def test_skipUnchanged(self):
+        results = []
+        with AsyncFileWriter(self.generator) as writer:
+            writer.write(self.getFileName('a.glsl'), 'a', True, results.append)
+            writer.flush()
+            writer.write(self.getFileName('a.glsl'), 'a', True, results.append)
+            writer.flush()
+            writer.write(self.getFileName('a.glsl'), b'b', True, results.append)
+        self.assertEqual(results, [True, False, True])
+        self.assertEqual(self.generator.instrumentation.counters['unchangedFiles'], 1)
+
+    def test_error(self):
+        writer = AsyncFileWriter(self.generator)
+        writer.write(os.path.join(self.path, 'missing', 'a.glsl'), 'a')
+        with self.assertRaises(OSError):
+            writer.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+'''
+Check MaterialX shader generation using the OCIO color management system. See colormanagement.py.
+
+Run from the repository root using:
+```
+python -m pytest tests
+```
+'''
+
+import os, sys, re, unittest
+
+PACKAGE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'materialxocio')
+sys.path.insert(0, PACKAGE_PATH)
+
+import MaterialX as mx
+import MaterialX.PyMaterialXGenShader as mx_gen_shader
+import MaterialX.PyMaterialXGenGlsl as mx_gen_glsl
+
+from colormanagement import OCIOColorManagementSystem
+
+CONFIG = 'ocio://studio-config-latest'
+TARGET_COLOR_SPACE = 'lin_rec709'
+
+class TestColorManagement(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.stdlib = mx.createDocument()
+        mx.loadLibraries(mx.getDefaultDataLibraryFolders(), mx.getDefaultDataSearchPath(), cls.stdlib)
+
+    def generatePixelShader(self, sourceColorSpace, type):
+        shaderGenerator = mx_gen_glsl.GlslShaderGenerator.create()
+        cms = OCIOColorManagementSystem(config=CONFIG, target=shaderGenerator.getTarget())
+        cms.loadLibrary(self.stdlib)
+        shaderGenerator.setColorManagementSystem(cms)
+
+        doc = mx.createDocument()
+        doc.importLibrary(self.stdlib)
+        node = doc.addNode('constant', 'constant', type)
+        node.setInputValue('value', mx.Color3(0.5, 0.2, 0.1) if type == 'color3' else mx.Color4(0.5, 0.2, 0.1, 1.0))
+        node.getInput('value').setColorSpace(sourceColorSpace)
+        output = doc.addOutput('out', type)
+        output.setConnectedNode(node)
+
+        context = mx_gen_shader.GenContext(shaderGenerator)
+        context.registerSourceCodeSearchPath(mx.getDefaultDataSearchPath())
+        context.getOptions().targetColorSpaceOverride = TARGET_COLOR_SPACE
+        shader = shaderGenerator.generate('shader', output, context)
+        return shader.getSourceCode(mx_gen_shader.PIXEL_STAGE)
+
+    def test_colorSpaceNameWithSpaces(self):
+        for type in ['color3', 'color4']:
+            with self.subTest(type=type):
+                code = self.generatePixelShader('sRGB - Texture', type)
+                functionName = 'mx_sRGB_Texture_to_lin_rec709_' + type
+                self.assertRegex(code, r'\b%s\(constant_value_cm_in, constant_value_cm_out\);' % functionName)
+
+                # Each transform function which is called is defined
+                for name in set(re.findall(r'\b(mx_sRGB\w*)\(', code)):
+                    self.assertRegex(code, r'(?m)^(?:vec4|void) %s\(' % name)
+
+    def test_unknownColorSpace(self):
+        code = self.generatePixelShader('not a color space', 'color3')
+        self.assertNotIn('constant_value_cm_in', code)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+'''
+Check the color space index of the OCIO built-in configurations. See colorspaceindex.py.
+
+Run from the repository root using:
+```
+python -m pytest tests
+```
+'''
+
+import os, sys, shutil, tempfile, unittest
+
+PACKAGE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'materialxocio')
+sys.path.insert(0, PACKAGE_PATH)
+
+import core as mxocio
+import colorspaceindex
+
+TARGET_COLOR_SPACE = 'lin_rec709'
+
+class TestColorSpaceIndex(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.generator = mxocio.OCIOMaterialaxGenerator(verbose=False)
+        cls.configs, configEntry = cls.generator.getBuiltinConfigs()
+        cls.generationConfig = configEntry.getConfig()
+        cls.index = colorspaceindex.buildColorSpaceIndex(cls.generator, cls.configs, cls.generationConfig, [TARGET_COLOR_SPACE])
+
+    def test_lookup(self):
+        # Names and aliases are found without regard to case
+        for name in ['sRGB - Texture', 'srgb_texture', 'SRGB_TX', 'Utility - sRGB - Texture']:
+            with self.subTest(name=name):
+                self.assertEqual(self.index.getCanonicalName(name), 'sRGB Encoded Rec.709 (sRGB)')
+                self.assertEqual(self.index.getSourceName(name), 'srgb_tx')
+        self.assertIsNone(self.index.lookup('not a color space'))
+        self.assertIsNone(self.index.getCanonicalName('not a color space'))
+
+        # Each configuration containing the color space has a record
+        records = self.index.lookupAll('srgb_tx')
+        self.assertEqual([record['config'] for record in records], list(self.configs))
+        self.assertEqual(self.index.lookup('srgb_tx', list(self.configs)[-1]), records[-1])
+        self.assertEqual(self.index.lookupAll('srgb_tx', 'not a config'), [])
+
+    def test_transform(self):
+        transform = self.index.getTransform('srgb_texture', TARGET_COLOR_SPACE)
+        self.assertEqual(transform, {
+            'function': 'mx_srgb_tx_to_lin_rec709_color4',
+            'nodeDef': 'ND_srgb_tx_to_lin_rec709_color4',
+            'definitionFile': 'ND_srgb_tx_to_lin_rec709_color4.mtlx',
+            'implementationFile': 'IM_mx_srgb_tx_to_lin_rec709_color4.mtlx',
+            'graphFile': 'mxgraph_srgb_tx_to_lin_rec709_color3.mtlx'
+        })
+        self.assertIsNone(self.index.getTransform('srgb_texture', 'ACEScg'))
+        self.assertIsNone(self.index.getTransform('not a color space', TARGET_COLOR_SPACE))
+
+        # Each indexed color space has a source name
+        sourceNames = self.index.getSourceColorSpaces()
+        self.assertEqual(len(sourceNames), len(self.index.getData()['colorSpaces']))
+        self.assertIn('srgb_tx', sourceNames)
+
+    def test_saveLoad(self):
+        folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, folder)
+        filename = os.path.join(folder, 'index.json')
+        self.index.save(filename)
+        index = colorspaceindex.ColorSpaceIndex.load(filename)
+        self.assertEqual(index.getData(), self.index.getData())
+        self.assertEqual(index.getJSON(), self.index.getJSON())
+
+        ocioVersion = mxocio.OCIO.GetVersion()
+        materialxVersion = mxocio.mx.getVersionString()
+        self.assertTrue(index.isCurrent(ocioVersion, materialxVersion, list(self.configs), [TARGET_COLOR_SPACE]))
+        self.assertFalse(index.isCurrent('0.0.0', materialxVersion))
+        self.assertFalse(index.isCurrent(ocioVersion, materialxVersion, list(self.configs)[:1]))
+        self.assertFalse(index.isCurrent(ocioVersion, materialxVersion, None, [TARGET_COLOR_SPACE, 'ACEScg']))
+
+        # Unreadable files and other index versions are not loaded
+        self.assertIsNone(colorspaceindex.ColorSpaceIndex.load(os.path.join(folder, 'missing.json')))
+        with open(filename, 'w') as f:
+            f.write('{ "version": 0 }')
+        self.assertIsNone(colorspaceindex.ColorSpaceIndex.load(filename))
+
+    def test_markdown(self):
+        table = self.index.getMarkdownTable()
+        self.assertEqual(len(table.splitlines()), len(self.index.getData()['colorSpaces']) + 2)
+        self.assertIn('| sRGB Encoded Rec.709 (sRGB) |', table)
+
+if __name__ == '__main__':
+    unittest.main()
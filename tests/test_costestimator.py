@@ -0,0 +1,64 @@
+'''
+Check the cost estimates and implementation selection of costestimator.py.
+
+Run from the repository root using:
+```
+python -m pytest tests
+```
+'''
+
+import os, sys, shutil, subprocess, tempfile, unittest
+
+PACKAGE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'materialxocio')
+sys.path.insert(0, PACKAGE_PATH)
+
+import costestimator
+
+class TestCostEstimator(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.outputPath = tempfile.mkdtemp()
+        for options in [[], ['--graph']]:
+            subprocess.run([sys.executable, os.path.join(PACKAGE_PATH, 'genOCIODefinitions.py'),
+                            '--outputPath', cls.outputPath, '--quiet'] + options, check=True, cwd=PACKAGE_PATH)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.outputPath)
+
+    def test_graphErrors(self):
+        estimator = costestimator.CostEstimator()
+        results = estimator.estimateFolder(self.outputPath)
+        graphs = [result for result in results if result['implementation'] == 'graph']
+        self.assertTrue(graphs)
+        for result in graphs:
+            with self.subTest(transform=result['transform']):
+                self.assertIsNotNone(result['error'])
+                self.assertLessEqual(result['error'], costestimator.CostEstimator.TOLERANCE)
+
+        # Errors are not measured on request
+        results = estimator.estimateFolder(self.outputPath, measureErrors=False)
+        self.assertTrue(all(result['error'] is None for result in results if result['implementation'] == 'graph'))
+
+    def test_selectAccurate(self):
+        estimator = costestimator.CostEstimator()
+        results = estimator.estimateFolder(self.outputPath)
+        transform = next(result['transform'] for result in results if result['implementation'] == 'graph')
+        graph = next(result for result in results if result['transform'] == transform and result['implementation'] == 'graph')
+        source = next(result for result in results if result['transform'] == transform and result['implementation'] == 'source')
+        self.assertLess(graph['cost'], source['cost'])
+        self.assertIs(estimator.selectImplementations(results)[transform], graph)
+
+        # An inaccurate graph, or one whose error is unknown, is not selected
+        for error in [1.0, None]:
+            graph['error'] = error
+            self.assertIs(estimator.selectImplementations(results)[transform], source)
+        graph['error'] = 1e-3
+        self.assertIs(estimator.selectImplementations(results, tolerance=1e-2)[transform], graph)
+
+        md = estimator.getMarkdownTable(results, estimator.selectImplementations(results))
+        self.assertIn('| %s | graph | %s |' % (transform, graph['file']), md)
+
+if __name__ == '__main__':
+    unittest.main()
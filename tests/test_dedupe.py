@@ -0,0 +1,78 @@
+'''
+Check the detection of numerically identical transforms and the definitions which reference them.
+
+Run from the repository root using:
+```
+python -m pytest tests
+```
+'''
+
+import os, sys, unittest
+
+PACKAGE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'materialxocio')
+sys.path.insert(0, PACKAGE_PATH)
+
+import core as mxocio
+
+CONFIG = 'ocio://studio-config-latest'
+TARGET_COLOR_SPACE = 'lin_rec709'
+
+class TestDedupe(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.generator = mxocio.OCIOMaterialaxGenerator(verbose=False)
+        cls.config = cls.generator.getConfig(CONFIG)
+
+    def getFingerprint(self, sourceColorSpace, sample = True):
+        return self.generator.getTransformFingerprint(self.config, sourceColorSpace, TARGET_COLOR_SPACE, sample)
+
+    def test_fingerprint(self):
+        # Aliases and color spaces with the same transform have the same fingerprints
+        cacheID, probeHash = self.getFingerprint('sRGB - Texture')
+        self.assertTrue(cacheID)
+        self.assertTrue(probeHash)
+        self.assertEqual(self.getFingerprint('srgb_tx'), (cacheID, probeHash))
+        self.assertEqual(self.getFingerprint('lin_srgb'), self.getFingerprint('Linear Rec.709 (sRGB)'))
+
+        # Different transforms have different fingerprints
+        otherCacheID, otherProbeHash = self.getFingerprint('ACEScg')
+        self.assertNotEqual(otherCacheID, cacheID)
+        self.assertNotEqual(otherProbeHash, probeHash)
+
+        self.assertEqual(self.getFingerprint('ACEScg', False), (otherCacheID, None))
+        self.assertEqual(self.getFingerprint('not a color space'), (None, None))
+
+    def test_sourceAlias(self):
+        result = self.generator.generateTransformResult(self.config, 'Utility - sRGB - Texture', TARGET_COLOR_SPACE,
+                                                        sharedSourceColorSpace='sRGB - Texture')
+        self.assertEqual(result.definitionName, 'ND_Utility_sRGB_Texture_to_lin_rec709_color4')
+        # No source code is returned as the implementations call the functions of the shared transform
+        self.assertEqual(dict(result.sources), {})
+        doc = mxocio.mx.createDocument()
+        mxocio.mx.readFromXmlString(doc, result.implementation)
+        self.assertEqual(sorted(impl.getFunction() for impl in doc.getImplementations()),
+                         ['mx_sRGB_Texture_to_lin_rec709_color3', 'mx_sRGB_Texture_to_lin_rec709_color4'])
+        self.assertTrue(all(impl.getFile() in ['mx_sRGB_Texture_to_lin_rec709_color4.glsl'] for impl in doc.getImplementations()))
+
+    def test_graphAlias(self):
+        shared = self.generator.generateTransformResult(self.config, 'sRGB - Texture', TARGET_COLOR_SPACE, graph=True)
+        alias = self.generator.generateTransformResult(self.config, 'Utility - sRGB - Texture', TARGET_COLOR_SPACE, graph=True,
+                                                       sharedSourceColorSpace='sRGB - Texture')
+        self.assertEqual(alias.transformName, 'mxgraph_Utility_sRGB_Texture_to_lin_rec709_color3')
+
+        doc = mxocio.mx.createDocument()
+        mxocio.mx.loadLibraries(mxocio.mx.getDefaultDataLibraryFolders(), mxocio.mx.getDefaultDataSearchPath(), doc)
+        for result in [shared, alias]:
+            mxocio.mx.readFromXmlString(doc, result.definition)
+        self.assertEqual(doc.validate(), (True, ''))
+
+        # The alias graph instances the shared transform node and has the same result
+        nodeGraph = doc.getNodeGraph('NG_Utility_sRGB_Texture_to_lin_rec709_color3')
+        self.assertEqual([node.getCategory() for node in nodeGraph.getNodes()], ['sRGB_Texture_to_lin_rec709_color3'])
+        self.assertEqual(mxocio.findNodeGraph(doc, nodeGraph.getNodes()[0]).getName(), 'NG_sRGB_Texture_to_lin_rec709_color3')
+        self.assertLessEqual(self.generator.getGraphError(self.config, 'Utility - sRGB - Texture', TARGET_COLOR_SPACE, doc,
+                                                          nodeGraph=nodeGraph), 1e-4)
+
+if __name__ == '__main__':
+    unittest.main()
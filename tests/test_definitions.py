@@ -0,0 +1,89 @@
+'''
+Check the definition files written by genOCIODefinitions.py.
+
+Run from the repository root using:
+```
+python -m pytest tests
+```
+'''
+
+import os, sys, shutil, subprocess, tempfile, unittest
+
+PACKAGE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'materialxocio')
+sys.path.insert(0, PACKAGE_PATH)
+
+import MaterialX as mx
+
+class TestDefinitions(unittest.TestCase):
+
+    def setUp(self):
+        self.outputPath = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.outputPath)
+
+    def runGenerator(self, *args):
+        '''
+        Run genOCIODefinitions.py writing to the output folder.
+        @return: The printed output.
+        '''
+        process = subprocess.run([sys.executable, os.path.join(PACKAGE_PATH, 'genOCIODefinitions.py'),
+                                  '--outputPath', self.outputPath] + list(args),
+                                 check=True, cwd=PACKAGE_PATH, capture_output=True, text=True)
+        return process.stdout
+
+    def test_manifest(self):
+        self.runGenerator()
+        filename = os.path.join(self.outputPath, 'mx_srgb_tx_to_lin_rec709_color4.glsl')
+        with open(filename, 'r') as f:
+            code = f.read()
+
+        # Transforms recorded in the manifest are skipped while their files are unchanged
+        output = self.runGenerator()
+        self.assertIn('--- Skip up to date transform: srgb_tx to lin_rec709 ---', output)
+        self.assertNotIn('--- Generate transform:', output)
+
+        # A transform whose file was modified is generated again
+        with open(filename, 'w') as f:
+            f.write('// Modified')
+        output = self.runGenerator()
+        self.assertIn('--- Generate transform: srgb_tx to lin_rec709 ---', output)
+        self.assertIn('--- Skip up to date transform: lin_ap1_scene to lin_rec709 ---', output)
+        with open(filename, 'r') as f:
+            self.assertEqual(f.read(), code)
+
+        # Transforms are generated again if the options change, or if requested
+        for args in [['--targets', 'genglsl', 'genosl'], ['--force']]:
+            output = self.runGenerator(*args)
+            self.assertIn('--- Generate transform: srgb_tx to lin_rec709 ---', output)
+            self.assertNotIn('--- Skip up to date transform:', output)
+        self.assertTrue(os.path.exists(os.path.join(self.outputPath, 'mx_srgb_tx_to_lin_rec709_color4.osl')))
+
+    def test_composed(self):
+        args = ['--reference', 'ACEScg', '--targetColorSpaces', 'lin_rec709']
+        self.runGenerator(*args)
+
+        # The composed transform instances the transforms to and from the reference color space
+        doc = mx.createDocument()
+        mx.loadLibraries(mx.getDefaultDataLibraryFolders(), mx.getDefaultDataSearchPath(), doc)
+        for name in ['ND_srgb_tx_to_lin_rec709_color4.mtlx', 'ND_srgb_tx_to_ACEScg_color4.mtlx', 'ND_ACEScg_to_lin_rec709_color4.mtlx']:
+            mx.readFromXmlFile(doc, os.path.join(self.outputPath, name))
+        self.assertEqual(doc.validate(), (True, ''))
+        for type in ['color3', 'color4']:
+            nodeGraph = doc.getNodeGraph('NG_srgb_tx_to_lin_rec709_' + type)
+            self.assertEqual([node.getNodeDefString() for node in nodeGraph.getNodes()],
+                             ['ND_srgb_tx_to_ACEScg_' + type, 'ND_ACEScg_to_lin_rec709_' + type])
+
+        # Composed transforms which are up to date are not composed again
+        filename = os.path.join(self.outputPath, 'ND_srgb_tx_to_lin_rec709_color4.mtlx')
+        modified = os.path.getmtime(filename)
+        output = self.runGenerator(*args)
+        self.assertIn('--- Skip up to date transform: srgb_tx to lin_rec709 ---', output)
+        self.assertEqual(os.path.getmtime(filename), modified)
+
+        # Changing the reference color space composes the transform again
+        output = self.runGenerator('--reference', 'lin_srgb', '--targetColorSpaces', 'lin_rec709')
+        self.assertNotIn('--- Skip up to date transform: srgb_tx to lin_rec709 ---', output)
+        with open(filename, 'r') as f:
+            self.assertIn('ND_srgb_tx_to_lin_srgb_color4', f.read())
+
+if __name__ == '__main__':
+    unittest.main()
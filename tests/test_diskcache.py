@@ -0,0 +1,101 @@
+'''
+Check the on-disk cache used to share shader code and transform operations between runs. See diskcache.py.
+
+Run from the repository root using:
+```
+python -m pytest tests
+```
+'''
+
+import os, sys, shutil, tempfile, threading, unittest
+
+PACKAGE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'materialxocio')
+sys.path.insert(0, PACKAGE_PATH)
+
+import diskcache
+
+class TestDiskCache(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path)
+
+    def test_putGet(self):
+        cache = diskcache.DiskCache(self.path)
+        key = cache.getKey('shaderCode', 'srgb_tx', 'lin_rec709')
+        self.assertNotEqual(key, cache.getKey('shaderCode', 'lin_rec709', 'srgb_tx'))
+        self.assertIsNone(cache.get(key))
+        cache.put(key, { 'code': 'void f() {}', 'textureCount': 0 })
+
+        # Another cache on the same folder reads the value from disk
+        other = diskcache.DiskCache(self.path)
+        self.assertEqual(other.get(key), { 'code': 'void f() {}', 'textureCount': 0 })
+        self.assertEqual((other.hits, other.misses), (1, 0))
+
+        # An unreadable entry is a miss
+        with open(other.getFileName(key), 'w') as f:
+            f.write('{ "code": ')
+        self.assertIsNone(diskcache.DiskCache(self.path).get(key))
+
+    def test_lruBound(self):
+        cache = diskcache.DiskCache(self.path, maxSize=2)
+        keys = [cache.getKey('value', i) for i in range(3)]
+        cache.put(keys[0], 0)
+        cache.put(keys[1], 1)
+        # Using the first value makes the second the least recently used
+        self.assertEqual(cache.get(keys[0]), 0)
+        cache.put(keys[2], 2)
+        self.assertEqual(list(cache.values), [keys[0], keys[2]])
+
+        # Evicted values are still read from disk
+        self.assertEqual(cache.get(keys[1]), 1)
+        self.assertEqual(list(cache.values), [keys[2], keys[1]])
+
+    def test_atomicReplace(self):
+        writer = diskcache.DiskCache(self.path)
+        key = writer.getKey('value')
+        values = [list(range(size)) for size in [10000, 10]]
+        writer.put(key, values[0])
+
+        # Readers which do not keep values in memory only ever see complete values
+        errors = []
+        done = threading.Event()
+        def read():
+            reader = diskcache.DiskCache(self.path, maxSize=0)
+            while not done.is_set():
+                if reader.get(key) not in values:
+                    errors.append(reader.misses)
+        threads = [threading.Thread(target=read) for i in range(2)]
+        for thread in threads:
+            thread.start()
+        for i in range(200):
+            writer.put(key, values[i % 2])
+        done.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual([name for name in os.listdir(os.path.dirname(writer.getFileName(key))) if name.endswith('.tmp')], [])
+
+    @unittest.skipUnless(diskcache.fcntl or diskcache.msvcrt, 'File locking is not available')
+    def test_lock(self):
+        cache = diskcache.DiskCache(self.path)
+        key = cache.getKey('value')
+        events = []
+        locked = threading.Event()
+        def lockOther():
+            locked.wait()
+            with diskcache.DiskCache(self.path).lock(key):
+                events.append('other')
+        thread = threading.Thread(target=lockOther)
+        thread.start()
+        with cache.lock(key):
+            locked.set()
+            thread.join(0.2)
+            # The other writer waits until the lock is released
+            self.assertTrue(thread.is_alive())
+            events.append('first')
+        thread.join()
+        self.assertEqual(events, ['first', 'other'])
+
+if __name__ == '__main__':
+    unittest.main()
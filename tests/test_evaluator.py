@@ -0,0 +1,134 @@
+'''
+Check the NumPy evaluation of MaterialX node graphs. See evaluator.py.
+
+Run from the repository root using:
+```
+python -m pytest tests
+```
+'''
+
+import os, sys, unittest
+
+PACKAGE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'materialxocio')
+sys.path.insert(0, PACKAGE_PATH)
+
+import core as mxocio
+import evaluator
+
+mx = mxocio.mx
+np = mxocio.np
+
+CONFIG = 'ocio://studio-config-latest'
+
+@unittest.skipUnless(np.isAvailable(), 'NumPy is not installed')
+class TestGraphEvaluator(unittest.TestCase):
+
+    def setUp(self):
+        self.doc = mx.createDocument()
+        self.nodeGraph = self.doc.addNodeGraph('NG_test')
+        self.values = np.array([[0.5, -0.25, 2.0], [0.0, 1.0, 0.125]], dtype=np.float32)
+
+    def addNode(self, category, name, inputs, type = 'vector3'):
+        '''
+        Add a node whose inputs are either node names, (node name, output name) tuples, 'in' for the
+        graph interface input, or value strings.
+        '''
+        node = self.nodeGraph.addNode(category, name, type)
+        for inputName, (inputType, value) in inputs.items():
+            input = node.addInput(inputName, inputType)
+            if value == 'in':
+                input.setInterfaceName('in')
+            elif isinstance(value, tuple):
+                input.setNodeName(value[0])
+                input.setOutputString(value[1])
+            elif self.nodeGraph.getNode(value):
+                input.setNodeName(value)
+            else:
+                input.setValueString(value)
+        return node
+
+    def evaluate(self, outputNode, type = 'vector3'):
+        output = self.nodeGraph.addOutput('out', type)
+        output.setNodeName(outputNode)
+        return evaluator.GraphEvaluator(self.doc).evaluate(self.nodeGraph, self.values)
+
+    def test_arithmetic(self):
+        self.addNode('multiply', 'scale', { 'in1': ('vector3', 'in'), 'in2': ('vector3', '2, 3, 4') })
+        self.addNode('add', 'offset', { 'in1': ('vector3', 'scale'), 'in2': ('float', '0.5') })
+        self.addNode('max', 'clampLow', { 'in1': ('vector3', 'offset'), 'in2': ('float', '0.25') })
+        self.addNode('power', 'gamma', { 'in1': ('vector3', 'clampLow'), 'in2': ('float', '2.2') })
+        self.addNode('absval', 'abs', { 'in': ('vector3', 'gamma') })
+        expected = np.power(np.maximum(self.values * [2, 3, 4] + 0.5, 0.25), 2.2)
+        np.testing.assert_allclose(self.evaluate('abs'), expected, rtol=1e-6)
+
+    def test_select(self):
+        # Per channel selection as created by OCIOMaterialaxGenerator.addSelectNodes()
+        self.addNode('multiply', 'below', { 'in1': ('vector3', 'in'), 'in2': ('float', '10') })
+        self.addNode('separate3', 'value', { 'in': ('vector3', 'in') }, 'multioutput')
+        self.addNode('separate3', 'aboveValue', { 'in': ('vector3', 'in') }, 'multioutput')
+        self.addNode('separate3', 'belowValue', { 'in': ('vector3', 'below') }, 'multioutput')
+        for channel in 'xyz':
+            self.addNode('ifgreater', 'select' + channel, {
+                'value1': ('float', ('value', 'out' + channel)), 'value2': ('float', '0.1'),
+                'in1': ('float', ('aboveValue', 'out' + channel)), 'in2': ('float', ('belowValue', 'out' + channel)) }, 'float')
+        self.addNode('combine3', 'result', { 'in1': ('float', 'selectx'), 'in2': ('float', 'selecty'), 'in3': ('float', 'selectz') })
+        expected = np.where(self.values > 0.1, self.values, self.values * 10)
+        np.testing.assert_array_equal(self.evaluate('result'), expected)
+
+    def test_matrix(self):
+        self.addNode('transformmatrix', 'matrix', { 'in': ('vector3', 'in'), 'mat': ('matrix33', '1, 2, 0, 0, 1, 0, 0, 0, 3') })
+        # Vectors are row vectors, and a vector3 by a matrix44 transforms a point
+        self.addNode('transformmatrix', 'translate', { 'in': ('vector3', 'matrix'),
+                     'mat': ('matrix44', '1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0.5, 0, -1, 1') })
+        matrix = np.array([[1, 2, 0], [0, 1, 0], [0, 0, 3]], dtype=np.float32)
+        np.testing.assert_allclose(self.evaluate('translate'), self.values @ matrix + [0.5, 0, -1], rtol=1e-6)
+
+    def test_convert(self):
+        self.addNode('convert', 'asColor4', { 'in': ('color3', 'in') }, 'color4')
+        result = self.evaluate('asColor4', 'color4')
+        np.testing.assert_array_equal(result[:, :3], self.values)
+        np.testing.assert_array_equal(result[:, 3], [1, 1])
+
+    def test_subGraph(self):
+        # Nodes which are implemented by a node graph, as created by OCIOMaterialaxGenerator.generateOCIOGraphAlias()
+        nodeDef = self.doc.addNodeDef('ND_double_color3', 'color3', 'double')
+        nodeDef.addInput('in', 'color3')
+        subGraph = self.doc.addNodeGraph('NG_double_color3')
+        subGraph.setNodeDefString(nodeDef.getName())
+        node = subGraph.addNode('multiply', 'double', 'color3')
+        node.addInput('in1', 'color3').setInterfaceName('in')
+        node.addInput('in2', 'float').setValueString('2')
+        subGraph.addOutput('out', 'color3').setNodeName('double')
+
+        self.addNode('double', 'twice', { 'in': ('color3', 'in') }, 'color3')
+        self.addNode('double', 'fourTimes', { 'in': ('color3', 'twice') }, 'color3')
+        np.testing.assert_array_equal(self.evaluate('fourTimes', 'color3'), self.values * 4)
+
+    def test_errors(self):
+        graphEvaluator = evaluator.GraphEvaluator(self.doc)
+        with self.assertRaises(ValueError):
+            graphEvaluator.evaluate('NG_missing', self.values)
+        with self.assertRaises(ValueError):
+            graphEvaluator.evaluate(self.nodeGraph, self.values)
+
+        self.addNode('unknown', 'node', { 'in': ('vector3', 'in') })
+        with self.assertRaises(ValueError):
+            self.evaluate('node')
+
+        # Operators can be added for other categories
+        graphEvaluator.addOperator('unknown', lambda node, inputs, count: inputs['in'] * 3)
+        np.testing.assert_array_equal(graphEvaluator.evaluate(self.nodeGraph, self.values), self.values * 3)
+
+    def test_compareGraphWithProcessor(self):
+        generator = mxocio.OCIOMaterialaxGenerator(verbose=False)
+        config = generator.getConfig(CONFIG)
+        graphDoc = generator.generateOCIOGraph(config, 'sRGB - Texture', 'lin_rec709')
+        cpuProcessor = generator.getCPUProcessor(config, 'sRGB - Texture', 'lin_rec709')
+        values = np.random.default_rng(0).random((1000, 3), dtype=np.float32)
+        graphEvaluator = evaluator.GraphEvaluator(graphDoc)
+        self.assertLessEqual(evaluator.compareGraphWithProcessor(graphEvaluator, graphDoc.getNodeGraphs()[0], cpuProcessor, values), 1e-4)
+        # The processor is compared on a copy of the values
+        np.testing.assert_array_equal(values, np.random.default_rng(0).random((1000, 3), dtype=np.float32))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+'''
+Check the node graphs created by OCIOMaterialaxGenerator.generateOCIOGraph() against the OCIO CPU processor.
+
+Run from the repository root using:
+```
+python -m pytest tests
+```
+'''
+
+import os, sys, shutil, tempfile, unittest
+
+PACKAGE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'materialxocio')
+sys.path.insert(0, PACKAGE_PATH)
+
+import core as mxocio
+import PyOpenColorIO as OCIO
+
+CONFIG = 'ocio://studio-config-latest'
+TOLERANCE = 1e-4
+
+class TestGraph(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.generator = mxocio.OCIOMaterialaxGenerator(verbose=False)
+        cls.config = cls.generator.getConfig(CONFIG)
+
+    def checkGraph(self, sourceColorSpace, targetColorSpace, operations):
+        transformOps = self.generator.getTransformOps(self.config, sourceColorSpace, targetColorSpace)
+        self.assertEqual([[op['type'], op['direction'], op.get('negativeStyle')] for op in transformOps['ops']], operations)
+        graphDoc = self.generator.generateOCIOGraph(self.config, sourceColorSpace, targetColorSpace)
+        self.assertIsNotNone(graphDoc)
+        self.assertLessEqual(self.generator.getGraphError(self.config, sourceColorSpace, targetColorSpace, graphDoc), TOLERANCE)
+        return graphDoc
+
+    def test_monCurve(self):
+        graphDoc = self.checkGraph('sRGB - Texture', 'lin_rec709', [
+            ['TRANSFORM_TYPE_EXPONENT_WITH_LINEAR', 'TRANSFORM_DIR_FORWARD', 'NEGATIVE_LINEAR']])
+        # The linear segment is selected per channel
+        self.assertEqual(len([node for node in graphDoc.getNodeGraphs()[0].getNodes() if node.getCategory() == 'ifgreater']), 3)
+        self.checkGraph('lin_rec709', 'sRGB - Texture', [
+            ['TRANSFORM_TYPE_EXPONENT_WITH_LINEAR', 'TRANSFORM_DIR_INVERSE', 'NEGATIVE_LINEAR']])
+
+    def test_monCurveMirror(self):
+        self.checkGraph('sRGB - Display', 'lin_rec709', [
+            ['TRANSFORM_TYPE_EXPONENT_WITH_LINEAR', 'TRANSFORM_DIR_FORWARD', 'NEGATIVE_MIRROR']])
+        self.checkGraph('lin_rec709', 'sRGB - Display', [
+            ['TRANSFORM_TYPE_EXPONENT_WITH_LINEAR', 'TRANSFORM_DIR_INVERSE', 'NEGATIVE_MIRROR']])
+
+    def test_exponent(self):
+        self.checkGraph('Gamma 2.2 Encoded Rec.709', 'lin_rec709', [
+            ['TRANSFORM_TYPE_EXPONENT', 'TRANSFORM_DIR_FORWARD', 'NEGATIVE_PASS_THRU']])
+        self.checkGraph('lin_rec709', 'Gamma 2.2 Encoded Rec.709', [
+            ['TRANSFORM_TYPE_EXPONENT', 'TRANSFORM_DIR_INVERSE', 'NEGATIVE_PASS_THRU']])
+
+    def test_matrix(self):
+        graphDoc = self.checkGraph('ACEScg', 'lin_rec709', [['TRANSFORM_TYPE_MATRIX', 'TRANSFORM_DIR_FORWARD', None]])
+        # The graph is optimized to a single matrix
+        self.assertEqual([node.getCategory() for node in graphDoc.getNodeGraphs()[0].getNodes()], ['convert', 'transformmatrix', 'convert'])
+
+    def createLut1DConfig(self, values):
+        '''
+        Create a configuration with a 'lut' color space which converts to the 'linear' reference with a LUT1D file.
+        '''
+        folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, folder)
+        with open(os.path.join(folder, 'lut.spi1d'), 'w') as file:
+            file.write('Version 1\nFrom 0.0 1.0\nLength %d\nComponents 1\n{\n' % len(values))
+            file.write(''.join('%.9g\n' % value for value in values))
+            file.write('}\n')
+        config = OCIO.Config.CreateRaw()
+        config.setSearchPath(folder)
+        colorSpace = OCIO.ColorSpace(name='lut')
+        colorSpace.setTransform(OCIO.FileTransform('lut.spi1d', interpolation=OCIO.INTERP_LINEAR),
+                                OCIO.ColorSpaceDirection.COLORSPACE_DIR_TO_REFERENCE)
+        config.addColorSpace(colorSpace)
+        config.addColorSpace(OCIO.ColorSpace(name='linear'))
+        return config
+
+    def test_fitLut1D(self):
+        config = self.createLut1DConfig([(i / 1023.0) ** 2 for i in range(1024)])
+        lut = self.generator.generateTransformGraph(config, 'lut', 'linear')[0]
+        self.assertEqual(lut.getTransformType(), OCIO.TransformType.TRANSFORM_TYPE_LUT1D)
+
+        fit = self.generator.fitLut1D(lut, [0.0, 1.0], TOLERANCE)
+        self.assertEqual(fit['form'], 'polynomial')
+        self.assertEqual(fit['degree'], 2)
+        self.assertEqual(len(fit['coefficients']), 3)
+        self.assertLessEqual(fit['error'], TOLERANCE)
+
+        # A step cannot be approximated with a low degree curve
+        config = self.createLut1DConfig([0.0] * 512 + [1.0] * 512)
+        lut = self.generator.generateTransformGraph(config, 'lut', 'linear')[0]
+        self.assertIsNone(self.generator.fitLut1D(lut, [0.0, 1.0], TOLERANCE, maxDegree=3))
+
+    def test_lut1DGraph(self):
+        config = self.createLut1DConfig([(i / 1023.0) ** 2 for i in range(1024)])
+        # LUT1D transforms are only approximated if a maximum error is given
+        self.assertIsNone(self.generator.generateOCIOGraph(config, 'lut', 'linear'))
+        graphDoc = self.generator.generateOCIOGraph(config, 'lut', 'linear', maxLutError=TOLERANCE)
+        self.assertIsNotNone(graphDoc)
+        self.assertLessEqual(self.generator.getGraphError(config, 'lut', 'linear', graphDoc), TOLERANCE)
+
+    def test_inaccurateGraph(self):
+        # The graph is checked against the CPU processor even if no maximum error is given
+        config = self.createLut1DConfig([0.0] * 512 + [1.0] * 512)
+        self.assertIsNone(self.generator.generateOCIOGraph(config, 'lut', 'linear', maxLutError=TOLERANCE, maxLutDegree=3))
+        self.assertIsNone(self.generator.generateOCIOGraph(config, 'lut', 'linear'))
+        self.assertIsNotNone(self.generator.generateOCIOGraph(config, 'lut', 'linear', maxGraphError=None))
+
+if __name__ == '__main__':
+    unittest.main()
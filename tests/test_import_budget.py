@@ -0,0 +1,42 @@
+'''
+Check that importing the MaterialX OCIO modules stays within the import time budget and does not
+load PyOpenColorIO, MaterialX or NumPy. See importbudget.py.
+
+Run from the repository root using:
+```
+python -m pytest tests
+```
+'''
+
+import os, sys, unittest
+
+PACKAGE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'materialxocio')
+sys.path.insert(0, PACKAGE_PATH)
+
+import importbudget
+
+# Budget in milliseconds. This is larger than the importbudget.py default to allow for slower CI machines.
+BUDGET = 150.0
+
+class TestImportBudget(unittest.TestCase):
+
+    def test_importBudget(self):
+        results = importbudget.checkImportBudget(importbudget.MODULES, PACKAGE_PATH, BUDGET, repeat=3)
+        self.assertEqual(sorted(results), sorted(importbudget.MODULES))
+        for module, result in results.items():
+            with self.subTest(module=module):
+                self.assertEqual(result['heavyModules'], [])
+                self.assertIsNotNone(result['time'])
+                self.assertTrue(result['withinBudget'], '%s import took %.1f ms' % (module, result['time']))
+
+    def test_heavyModulesDetected(self):
+        # The color management system derives from a MaterialX class, so it must be reported
+        importTime, loaded = importbudget.measureImport('colormanagement', PACKAGE_PATH)
+        self.assertIn('MaterialX', loaded)
+
+    def test_evaluatorImportsLazily(self):
+        importTime, loaded = importbudget.measureImport('evaluator', PACKAGE_PATH)
+        self.assertEqual(loaded, [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+'''
+Check the transform service endpoints. See service.py.
+
+Run from the repository root using:
+```
+python -m pytest tests
+```
+'''
+
+import os, sys, json, threading, unittest
+from urllib.parse import quote
+from urllib.request import urlopen
+from urllib.error import HTTPError
+
+PACKAGE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'materialxocio')
+sys.path.insert(0, PACKAGE_PATH)
+
+import service
+
+CONFIG = 'ocio://studio-config-latest'
+
+class TestService(unittest.TestCase):
+
+    def getJSON(self, svc, path):
+        status, response = svc.handle(path)
+        return status, json.loads(response.decode('utf-8'))
+
+    def test_transform(self):
+        svc = service.TransformService(config=CONFIG)
+        status, data = self.getJSON(svc, '/transform?source=%s&target=lin_rec709&type=color3' % quote('sRGB - Texture'))
+        self.assertEqual(status, 200)
+        self.assertEqual(data['type'], 'color3')
+        self.assertEqual(data['functionName'], 'mx_sRGB_Texture_to_lin_rec709_color3')
+        self.assertEqual(data['definitionName'], 'ND_sRGB_Texture_to_lin_rec709_color3')
+        self.assertRegex(data['code'], r'(?m)^void %s\(' % data['functionName'])
+
+        # The color4 response is created by the same generation
+        status, data = self.getJSON(svc, '/transform?source=%s&target=lin_rec709&type=color4' % quote('sRGB - Texture'))
+        self.assertEqual(status, 200)
+        self.assertEqual(data['functionName'], 'mx_sRGB_Texture_to_lin_rec709_color4')
+        metrics = svc.getMetrics()
+        self.assertEqual(metrics['responseCache']['misses'], 1)
+        self.assertEqual(metrics['responseCache']['hits'], 1)
+        self.assertEqual(metrics['generateLatency']['count'], 1)
+
+    def test_graph(self):
+        svc = service.TransformService(config=CONFIG)
+        status, data = self.getJSON(svc, '/transform?source=%s&target=lin_rec709&graph=1' % quote('sRGB - Texture'))
+        self.assertEqual(status, 200)
+        self.assertTrue(data['graph'])
+        self.assertEqual(data['type'], 'color3')
+        self.assertEqual(data['definitionName'], 'ND_sRGB_Texture_to_lin_rec709_color3')
+        self.assertNotIn('code', data)
+
+        mx = service.mxocio.mx
+        doc = mx.createDocument()
+        mx.loadLibraries(mx.getDefaultDataLibraryFolders(), mx.getDefaultDataSearchPath(), doc)
+        mx.readFromXmlString(doc, data['definition'])
+        self.assertEqual(doc.validate(), (True, ''))
+
+    def test_errors(self):
+        svc = service.TransformService(config=CONFIG)
+        self.assertEqual(svc.handle('/transform?source=ACEScg')[0], 400)
+        self.assertEqual(svc.handle('/transform?source=ACEScg&target=lin_rec709&type=color2')[0], 400)
+        self.assertEqual(svc.handle('/transform?source=ACEScg&target=lin_rec709&language=glsl')[0], 400)
+        self.assertEqual(svc.handle('/transform?source=unknown&target=lin_rec709')[0], 404)
+        self.assertEqual(svc.handle('/unknown')[0], 404)
+        self.assertEqual(svc.getMetrics()['errors'], 5)
+
+    def test_configRestricted(self):
+        svc = service.TransformService(config=CONFIG)
+        configFile = os.path.join(PACKAGE_PATH, 'config.ocio')
+        for path in ['/transform?source=ACEScg&target=lin_rec709&config=%s' % quote(configFile),
+                     '/colorspaces?config=%s' % quote(configFile)]:
+            status, data = self.getJSON(svc, path)
+            self.assertEqual(status, 400)
+            self.assertIn('Unsupported config', data['error'])
+
+        # Built-in configurations and the service configuration can be selected
+        builtinName = sorted(svc.generator.getBuiltinConfigNames())[0]
+        for name in [builtinName, 'ocio://' + builtinName, CONFIG]:
+            status, data = self.getJSON(svc, '/colorspaces?config=%s' % quote(name))
+            self.assertEqual(status, 200)
+            self.assertTrue(data['colorSpaces'])
+
+    def test_preload(self):
+        svc = service.TransformService()
+        count = svc.preload('lin_rec709', ['genglsl'], ['color3', 'color4'])
+        self.assertGreater(count, 0)
+        # Each transform is generated once for both types
+        metrics = svc.getMetrics()
+        self.assertEqual(metrics['responseCache']['misses'] * 2, metrics['responseCache']['hits'] + metrics['responseCache']['misses'])
+        self.assertEqual(svc.handle('/transform?source=ACEScg&target=lin_rec709&type=color3')[0], 200)
+        self.assertEqual(svc.getMetrics()['responseCache']['misses'], metrics['responseCache']['misses'])
+
+    def test_httpServer(self):
+        svc = service.TransformService(config=CONFIG)
+        server = service.TransformHTTPServer(('127.0.0.1', 0), svc)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            url = 'http://127.0.0.1:%d' % server.server_address[1]
+            with urlopen(url + '/transform?source=ACEScg&target=lin_rec709&type=color3') as response:
+                self.assertEqual(response.status, 200)
+                self.assertEqual(response.headers['Content-Type'], 'application/json')
+                self.assertEqual(json.loads(response.read())['functionName'], 'mx_ACEScg_to_lin_rec709_color3')
+            with urlopen(url + '/metrics') as response:
+                self.assertEqual(json.loads(response.read())['requests']['/transform'], 1)
+            with self.assertRaises(HTTPError) as context:
+                urlopen(url + '/unknown')
+            self.assertEqual(context.exception.code, 404)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+if __name__ == '__main__':
+    unittest.main()
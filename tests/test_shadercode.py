@@ -0,0 +1,207 @@
+'''
+Check the MaterialX functions added to the shader code generated by OCIO. See
+OCIOMaterialaxGenerator.createMaterialXFunction() and createColor3Function().
+
+Run from the repository root using:
+```
+python -m pytest tests
+```
+'''
+
+import os, sys, re, shutil, subprocess, tempfile, unittest
+
+PACKAGE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'materialxocio')
+sys.path.insert(0, PACKAGE_PATH)
+
+import core as mxocio
+
+CONFIG = 'ocio://studio-config-latest'
+TARGET_COLOR_SPACE = 'lin_rec709'
+
+# Source color spaces covering the kinds of OCIO operators, and whether the transform requires texture resources
+TRANSFORMS = {
+    'ACES2065-1': False,      # Matrix
+    'ACEScct': False,         # ACES log camera curve and matrix
+    'sRGB - Texture': False,  # Gamma monCurve
+    'ACEScc': True            # Range, LUT 1D and matrix
+}
+TARGETS = ['genglsl', 'genmsl', 'genhlsl']
+
+# Just enough of GLSL, MSL and HLSL to compile the generated functions as C++. Textures return their coordinates,
+# as only the color3 and color4 functions are compared with each other.
+PRELUDE = '''
+#include <cmath>
+#include <cstdio>
+struct vec2 { union { struct { float x, y; }; struct { float r, g; }; float v[2]; };
+  vec2(double s = 0) : x(s), y(s) {} vec2(double a, double b) : x(a), y(b) {}
+  float& operator[](int i) { return v[i]; } float operator[](int i) const { return v[i]; } };
+struct vec3 { union { struct { float x, y, z; }; struct { float r, g, b; }; float v[3]; };
+  vec3(double s = 0) : x(s), y(s), z(s) {} vec3(double a, double b, double c) : x(a), y(b), z(c) {}
+  float& operator[](int i) { return v[i]; } float operator[](int i) const { return v[i]; } };
+struct vec4 { union { struct { float x, y, z, w; }; struct { float r, g, b, a; }; float v[4]; };
+  vec4(double s = 0) : x(s), y(s), z(s), w(s) {} vec4(double a, double b, double c, double d) : x(a), y(b), z(c), w(d) {}
+  vec4(vec3 c, double d) : x(c.x), y(c.y), z(c.z), w(d) {}
+  vec3 rgb() const { return vec3(x, y, z); } void setRgb(vec3 c) { x = c.x; y = c.y; z = c.z; }
+  float& operator[](int i) { return v[i]; } float operator[](int i) const { return v[i]; } };
+#define OPERATOR(T, N, op) inline T operator op(T a, T b) { T o; for (int i = 0; i < N; i++) o.v[i] = a.v[i] op b.v[i]; return o; }
+#define FUNCTION1(T, N, f) inline T f(T a) { T o; for (int i = 0; i < N; i++) o.v[i] = std::f(a.v[i]); return o; }
+#define FUNCTION2(T, N, f, g) inline T f(T a, T b) { T o; for (int i = 0; i < N; i++) o.v[i] = g(a.v[i], b.v[i]); return o; }
+#define VECTOR(T, N) OPERATOR(T, N, +) OPERATOR(T, N, -) OPERATOR(T, N, *) OPERATOR(T, N, /) \\
+  FUNCTION1(T, N, abs) FUNCTION1(T, N, log2) FUNCTION1(T, N, exp2) FUNCTION1(T, N, log) FUNCTION1(T, N, exp) FUNCTION1(T, N, floor) \\
+  FUNCTION2(T, N, pow, std::pow) FUNCTION2(T, N, max, std::fmax) FUNCTION2(T, N, min, std::fmin) \\
+  FUNCTION2(T, N, greaterThan, [](float a, float b) { return a > b ? 1.0f : 0.0f; }) \\
+  FUNCTION2(T, N, lessThan, [](float a, float b) { return a < b ? 1.0f : 0.0f; }) \\
+  inline T clamp(T a, T lo, T hi) { return min(max(a, lo), hi); } \\
+  inline float dot(T a, T b) { float d = 0; for (int i = 0; i < N; i++) d += a.v[i] * b.v[i]; return d; }
+VECTOR(vec2, 2) VECTOR(vec3, 3) VECTOR(vec4, 4)
+inline float max(float a, float b) { return std::fmax(a, b); }
+inline float min(float a, float b) { return std::fmin(a, b); }
+inline float clamp(float a, float lo, float hi) { return min(max(a, lo), hi); }
+template<typename V, int N> struct matrix { float e[N * N];
+  template<typename... A> matrix(A... a) : e{ float(a)... } {}
+  V operator*(V v) const { V o(0.0); for (int r = 0; r < N; r++) for (int c = 0; c < N; c++) o.v[r] += e[c * N + r] * v.v[c]; return o; } };
+typedef matrix<vec3, 3> mat3; typedef matrix<vec4, 4> mat4;
+template<typename V, int N> V mul(V v, matrix<V, N> m) { return m * v; }
+struct sampler2D {}; struct sampler3D {}; struct SamplerState {};
+inline vec4 texture(sampler2D, vec2 p) { return vec4(p.x, p.y, p.x * p.y, 1.0); }
+inline vec4 texture(sampler3D, vec3 p) { return vec4(p.x, p.y, p.z, 1.0); }
+struct Texture2D { vec4 Sample(SamplerState, vec2 p) const { return texture(sampler2D(), p); } };
+struct Texture3D { vec4 Sample(SamplerState, vec3 p) const { return texture(sampler3D(), p); } };
+typedef vec2 float2; typedef vec3 float3; typedef vec4 float4; typedef mat3 float3x3; typedef mat4 float4x4;
+'''
+
+def compileFunctions(code, color3Name, color4Name, values):
+    '''
+    Compile shader code as C++ and evaluate its color3 and color4 functions.
+    @return: A tuple of (N,3) arrays of the results of the color3 function, and of the color4 function with an alpha of 1.
+    '''
+    code = re.sub(r'\b(?:out|thread) (\w+)&? outColor', r'\1& outColor', code)
+    code = re.sub(r'\buniform ', 'static ', code)
+    code = re.sub(r'\.rgb\.([rgb])\b', r'.\1', code)
+    code = re.sub(r'(\w+)\.rgb = (.*);', r'\1.setRgb(\2);', code)
+    code = re.sub(r'\.rgb\b', '.rgb()', code)
+    main = ('int main() { float a, b, c; while (scanf("%%f %%f %%f", &a, &b, &c) == 3) { vec3 o3; vec4 o4; '
+            '%s(vec3(a, b, c), o3); %s(vec4(a, b, c, 1.0), o4); '
+            'printf("%%.9g %%.9g %%.9g %%.9g %%.9g %%.9g\\n", o3.x, o3.y, o3.z, o4.x, o4.y, o4.z); } }\n') % (color3Name, color4Name)
+    with tempfile.TemporaryDirectory() as tempPath:
+        sourceFile = os.path.join(tempPath, 'functions.cpp')
+        programFile = os.path.join(tempPath, 'functions')
+        with open(sourceFile, 'w') as f:
+            f.write(PRELUDE + code + main)
+        build = subprocess.run(['g++', '-std=c++14', '-w', '-o', programFile, sourceFile], capture_output=True, text=True)
+        if build.returncode:
+            raise AssertionError('Compilation failed:\n' + build.stderr[:2000])
+        run = subprocess.run([programFile], input='\n'.join('%.9g %.9g %.9g' % tuple(v) for v in values),
+                             capture_output=True, text=True, check=True)
+    results = mxocio.np.array([line.split() for line in run.stdout.split('\n') if line], dtype=float)
+    return results[:, :3], results[:, 3:]
+
+class TestShaderCode(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.generator = mxocio.OCIOMaterialaxGenerator(verbose=False)
+        cls.config = cls.generator.getConfig(CONFIG)
+
+    def generateSources(self, sourceColorSpace, targets):
+        definitionDoc = mxocio.mx.createDocument()
+        implDoc = mxocio.mx.createDocument()
+        sources = {}
+        definition = self.generator.generateOCIO(self.config, definitionDoc, implDoc, sourceColorSpace, TARGET_COLOR_SPACE,
+                                                 'color4', targets=targets, sources=sources, textures={})[0]
+        self.assertIsNotNone(definition)
+        return implDoc, sources
+
+    def test_targetLanguages(self):
+        # HLSL has no MaterialX code generator so is only returned when requested
+        targets = [language[0] for language in self.generator.getTargetLanguages()]
+        self.assertIn('genglsl', targets)
+        self.assertNotIn('genhlsl', targets)
+        self.assertEqual([language[0] for language in self.generator.getTargetLanguages(['genhlsl'])], ['genhlsl'])
+
+    def test_shaderFunctionName(self):
+        transformName = self.generator.createTransformName('sRGB - Texture', TARGET_COLOR_SPACE, 'color4')
+        self.assertEqual(transformName, 'mx_sRGB_Texture_to_lin_rec709_color4')
+        self.assertEqual(self.generator.getShaderFunctionName(transformName), transformName)
+        self.assertEqual(self.generator.getShaderFunctionName('mx_sRGB___Texture_to_lin_rec709_color4'), 'mx_sRGB__Texture_to_lin_rec709_color4')
+
+    def test_colorSpaceNameWithSpaces(self):
+        targets = ['genglsl', 'genmsl', 'genosl', 'genhlsl']
+        implDoc, sources = self.generateSources('sRGB - Texture', targets)
+        self.assertEqual(sorted(sources), sorted(targets))
+        for target, (extension, code) in sources.items():
+            with self.subTest(target=target):
+                # Each function called by the added functions is defined with a single argument
+                calls = re.findall(r'outColor = (\w+)\((?:inPixel|\w+\(inPixel, 1\.0\))\)', code)
+                self.assertTrue(calls)
+                for name in calls:
+                    self.assertRegex(code, r'(?m)^\w+ %s\(\w+ inPixel\)' % name)
+
+                # The implementations reference functions which are defined in the code
+                for impl in implDoc.getImplementations():
+                    if impl.getTarget() == target:
+                        self.assertRegex(code, r'(?m)^void %s\(' % impl.getFunction())
+
+                # The color3 function is created from the transform function instead of calling it
+                if target != 'genosl':
+                    self.assertRegex(code, r'(?m)^void mx_sRGB_Texture_to_lin_rec709_color3\(')
+                    self.assertNotIn('(inPixel, 1.0)).rgb', code)
+
+    def test_nodeCategory(self):
+        definitionDoc = mxocio.mx.createDocument()
+        for sourceColorSpace, targetColorSpace in [['sRGB - Texture', 'ACEScg'], ['ACEScg', TARGET_COLOR_SPACE]]:
+            self.generator.generateOCIO(self.config, definitionDoc, mxocio.mx.createDocument(), sourceColorSpace, targetColorSpace, 'color4')
+        self.assertEqual(definitionDoc.getNodeDef('ND_sRGB_Texture_to_ACEScg_color4').getNodeString(), 'sRGB_Texture_to_ACEScg')
+
+        # Nodes which instance the transforms can be written as XML for any color space names
+        self.generator.generateComposedDefinition(self.config, definitionDoc, 'sRGB - Texture', 'ACEScg', TARGET_COLOR_SPACE)
+        nodeGraph = definitionDoc.getNodeGraph('NG_sRGB_Texture_to_lin_rec709_color4')
+        self.assertEqual([node.getCategory() for node in nodeGraph.getNodes()], ['sRGB_Texture_to_ACEScg', 'ACEScg_to_lin_rec709'])
+        doc = mxocio.mx.createDocument()
+        mxocio.mx.loadLibraries(mxocio.mx.getDefaultDataLibraryFolders(), mxocio.mx.getDefaultDataSearchPath(), doc)
+        mxocio.mx.readFromXmlString(doc, mxocio.mx.writeToXmlString(definitionDoc))
+        self.assertEqual(doc.validate(), (True, ''))
+
+    def test_color3Rewrite(self):
+        for sourceColorSpace, hasTextures in TRANSFORMS.items():
+            for target in TARGETS:
+                with self.subTest(source=sourceColorSpace, target=target):
+                    language = self.generator.getTargetLanguages([target])[0][2]
+                    code, textureCount = self.generator.generateShaderCode(self.config, sourceColorSpace, TARGET_COLOR_SPACE, language)
+                    self.assertEqual(bool(textureCount), hasTextures)
+                    transformName = self.generator.createTransformName(sourceColorSpace, TARGET_COLOR_SPACE, 'color4')
+                    color3Name = self.generator.createTransformName(sourceColorSpace, TARGET_COLOR_SPACE, 'color3')
+                    color3Function = self.generator.createColor3Function(code, self.generator.getShaderFunctionName(transformName),
+                                                                         target, color3Name)
+
+                    # The MSL function uses textures passed to its class, so cannot be moved out of the class
+                    if target == 'genmsl' and hasTextures:
+                        self.assertIsNone(color3Function)
+                        code = self.generator.createMaterialXFunction(code, transformName, target, color3Name)
+                        self.assertIn('(float4(inPixel, 1.0)).rgb;', code)
+                        continue
+
+                    self.assertIsNotNone(color3Function)
+                    self.assertNotRegex(color3Function, r'\b(?:vec4|float4|mat4|float4x4)\b|\.a\b|\.w\b')
+                    self.assertTrue(color3Function.startswith('void %s(' % color3Name))
+
+    @unittest.skipUnless(shutil.which('g++'), 'requires g++')
+    def test_color3Compiled(self):
+        rng = mxocio.np.random.default_rng(0)
+        values = mxocio.np.concatenate([rng.uniform(-0.2, 1.5, (500, 3)), mxocio.np.linspace(-0.5, 4.0, 100)[:, None].repeat(3, 1)])
+        for sourceColorSpace, hasTextures in TRANSFORMS.items():
+            for target in TARGETS:
+                if target == 'genmsl' and hasTextures:
+                    continue
+                with self.subTest(source=sourceColorSpace, target=target):
+                    implDoc, sources = self.generateSources(sourceColorSpace, [target])
+                    code = sources[target][1]
+                    self.assertNotIn('(inPixel, 1.0)).rgb', code)
+                    color3Result, color4Result = compileFunctions(code,
+                        self.generator.createTransformName(sourceColorSpace, TARGET_COLOR_SPACE, 'color3'),
+                        self.generator.createTransformName(sourceColorSpace, TARGET_COLOR_SPACE, 'color4'), values)
+                    self.assertEqual(color3Result.shape, (len(values), 3))
+                    mxocio.np.testing.assert_allclose(color3Result, color4Result, rtol=1e-5, atol=1e-6)
+
+if __name__ == '__main__':
+    unittest.main()
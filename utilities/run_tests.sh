@@ -0,0 +1,2 @@
+echo "Run tests..."
+python -m pytest tests -q